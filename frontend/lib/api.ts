@@ -156,10 +156,20 @@ export interface DailyPlan {
   day: string;
   focus: string;
   lesson_plan: DailyLessonPlan;
+  standard_id?: string | null;
+  standard_ids?: string[];
+  /** Present on packets generated before standards moved to the top-level map. */
   standard?: { standard_id: string; description: string };
   resource_errors?: string[];
 }
 
+export interface PlanStandard {
+  standard_id: string;
+  description: string;
+  subject?: string;
+  grade_level?: number;
+}
+
 export interface WeeklyPacketDetail {
   packet_id: string;
   student_id: string;
@@ -168,6 +178,7 @@ export interface WeeklyPacketDetail {
   grade_level: number;
   status: string;
   weekly_overview?: string;
+  standards?: Record<string, PlanStandard>;
   daily_plan: DailyPlan[];
 }
 
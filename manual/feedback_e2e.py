@@ -4,13 +4,18 @@ Manual end-to-end feedback workflow test.
 Requires OPENAI_API_KEY and a running FastAPI server.
 """
 
+import asyncio
+import importlib.util
 import json
-import requests
 import sqlite3
 import sys
 
+import httpx
+
 BASE_URL = "http://localhost:8000"
 DB_PATH = "curriculum.db"
+# HTTP/2 needs the optional `h2` package (pip install "httpx[http2]").
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
 
 def check_blobs(label: str) -> None:
@@ -39,7 +44,7 @@ def check_blobs(label: str) -> None:
         print(f"  quantity_preferences: {plan_rules_blob['quantity_preferences']}")
 
 
-def main() -> bool:
+async def run_scenario(client: httpx.AsyncClient) -> bool:
     print("=== End-to-End Feedback Test ===\n")
 
     # Check initial state
@@ -47,8 +52,8 @@ def main() -> bool:
 
     # Step 1: Generate a weekly packet
     print("\n1. Generating weekly packet...")
-    response = requests.post(
-        f"{BASE_URL}/generate_weekly_plan",
+    response = await client.post(
+        "/generate_weekly_plan",
         json={"student_id": "student_01", "grade_level": 0, "subject": "Math"},
     )
 
@@ -60,20 +65,20 @@ def main() -> bool:
     packet = response.json()
     packet_id = packet["plan_id"]
     print(f"✅ Generated packet: {packet_id}")
-    print(f"   Standards used: {[d['standard']['standard_id'] for d in packet['daily_plan'][:2]]}")
+    print(f"   Standards used: {[d['standard_id'] for d in packet['daily_plan'][:2]]}")
 
     # Step 2: Submit feedback
     print(f"\n2. Submitting feedback for {packet_id}...")
-    first_standard = packet["daily_plan"][0]["standard"]["standard_id"]
-    second_standard = packet["daily_plan"][1]["standard"]["standard_id"]
+    first_standard = packet["daily_plan"][0]["standard_id"]
+    second_standard = packet["daily_plan"][1]["standard_id"]
 
     feedback_data = {
         "mastery_feedback": {first_standard: "MASTERED", second_standard: "DEVELOPING"},
         "quantity_feedback": -1,
     }
 
-    response = requests.post(
-        f"{BASE_URL}/students/student_01/weekly-packets/{packet_id}/feedback",
+    response = await client.post(
+        f"/students/student_01/weekly-packets/{packet_id}/feedback",
         json=feedback_data,
     )
 
@@ -89,7 +94,7 @@ def main() -> bool:
 
     # Step 3: Retrieve feedback via GET
     print("\n3. Retrieving feedback via GET...")
-    response = requests.get(f"{BASE_URL}/students/student_01/weekly-packets/{packet_id}/feedback")
+    response = await client.get(f"/students/student_01/weekly-packets/{packet_id}/feedback")
 
     if response.status_code != 200:
         print(f"❌ Failed to retrieve feedback: {response.status_code}")
@@ -121,9 +126,20 @@ def main() -> bool:
     return True
 
 
+async def main() -> bool:
+    # Plan generation takes 30-60 seconds, so allow a generous timeout.
+    async with httpx.AsyncClient(
+        base_url=BASE_URL,
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=50),
+        timeout=300.0,
+    ) as client:
+        return await run_scenario(client)
+
+
 if __name__ == "__main__":
     try:
-        success = main()
+        success = asyncio.run(main())
         sys.exit(0 if success else 1)
     except Exception as exc:  # pragma: no cover - manual script
         print(f"\n❌ Error: {exc}")
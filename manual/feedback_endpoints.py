@@ -4,89 +4,113 @@ Manual smoke test for feedback endpoints.
 
 Creates a weekly packet, submits feedback, and retrieves it. Designed for
 interactive usage against a running API server (not pytest).
+
+Pass one or more student IDs to sweep several students concurrently:
+
+    python manual/feedback_endpoints.py student_01 student_02
 """
 
-import requests
+import asyncio
+import importlib.util
 import sys
 
+import httpx
+
 BASE_URL = "http://localhost:8000"
+# HTTP/2 needs the optional `h2` package (pip install "httpx[http2]").
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
 
-def test_feedback_workflow() -> bool:
-    print("=== Testing Feedback Workflow ===\n")
+async def test_feedback_workflow(client: httpx.AsyncClient, student_id: str = "student_01") -> bool:
+    prefix = f"[{student_id}] "
+    print(f"{prefix}=== Testing Feedback Workflow ===\n")
 
     # Step 1: Verify student exists
-    print("1. Checking student profile...")
-    response = requests.get(f"{BASE_URL}/student/student_01")
+    print(f"{prefix}1. Checking student profile...")
+    response = await client.get(f"/student/{student_id}")
     if response.status_code != 200:
-        print(f"❌ Student not found: {response.status_code}")
+        print(f"{prefix}❌ Student not found: {response.status_code}")
         return False
-    print(f"✅ Student found: {response.json()['student_id']}\n")
+    print(f"{prefix}✅ Student found: {response.json()['student_id']}\n")
 
     # Step 2: Generate a weekly packet (requires OPENAI_API_KEY)
-    print("2. Generating weekly packet...")
+    print(f"{prefix}2. Generating weekly packet...")
     print("   (Skipping - requires OPENAI_API_KEY)")
     print("   Using mock packet_id instead\n")
 
     #  For real testing, you would do:
-    # response = requests.post(
-    #     f"{BASE_URL}/generate_weekly_plan",
-    #     json={"student_id": "student_01", "grade_level": 0, "subject": "Math"}
+    # response = await client.post(
+    #     "/generate_weekly_plan",
+    #     json={"student_id": student_id, "grade_level": 0, "subject": "Math"}
     # )
     # packet_id = response.json()["plan_id"]
 
     # Mock packet for testing (won't work until we have real packet)
-    packet_id = "plan_student_01_2025-11-29"
+    packet_id = f"plan_{student_id}_2025-11-29"
 
     # Step 3: Try to submit feedback (will fail without real packet)
-    print(f"3. Submitting feedback for packet: {packet_id}...")
+    print(f"{prefix}3. Submitting feedback for packet: {packet_id}...")
     feedback_data = {
         "mastery_feedback": {"VA.MATH.K.1a": "MASTERED", "VA.MATH.K.2a": "DEVELOPING"},
         "quantity_feedback": -1,
     }
 
-    response = requests.post(
-        f"{BASE_URL}/students/student_01/weekly-packets/{packet_id}/feedback", json=feedback_data
+    response = await client.post(
+        f"/students/{student_id}/weekly-packets/{packet_id}/feedback", json=feedback_data
     )
 
     if response.status_code == 204:
-        print("✅ Feedback submitted successfully\n")
+        print(f"{prefix}✅ Feedback submitted successfully\n")
     elif response.status_code == 400:
         error_detail = response.json().get("detail", "Unknown error")
         if "not found" in error_detail.lower():
-            print(f"⚠️  Expected error: {error_detail}")
+            print(f"{prefix}⚠️  Expected error: {error_detail}")
             print("   (This is normal - packet doesn't exist yet)\n")
             return True  # Expected failure
         else:
-            print(f"❌ Validation error: {error_detail}\n")
+            print(f"{prefix}❌ Validation error: {error_detail}\n")
             return False
     else:
-        print(f"❌ Unexpected status: {response.status_code}")
+        print(f"{prefix}❌ Unexpected status: {response.status_code}")
         print(f"   Response: {response.text}\n")
         return False
 
     # Step 4: Retrieve feedback
-    print("4. Retrieving feedback...")
-    response = requests.get(f"{BASE_URL}/students/student_01/weekly-packets/{packet_id}/feedback")
+    print(f"{prefix}4. Retrieving feedback...")
+    response = await client.get(f"/students/{student_id}/weekly-packets/{packet_id}/feedback")
 
     if response.status_code == 200:
         feedback = response.json()
-        print("✅ Feedback retrieved:")
+        print(f"{prefix}✅ Feedback retrieved:")
         print(f"   Completed: {feedback['completed_at']}")
         print(f"   Mastery: {feedback['mastery_feedback']}")
         print(f"   Quantity: {feedback['quantity_feedback']}\n")
         return True
     elif response.status_code == 404:
-        print("✅ 404 (expected - no feedback submitted yet)\n")
+        print(f"{prefix}✅ 404 (expected - no feedback submitted yet)\n")
         return True
     else:
-        print(f"❌ Unexpected status: {response.status_code}\n")
+        print(f"{prefix}❌ Unexpected status: {response.status_code}\n")
         return False
 
 
+async def run(student_ids: list[str]) -> bool:
+    async with httpx.AsyncClient(
+        base_url=BASE_URL,
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=50),
+        timeout=120.0,
+    ) as client:
+        results = await asyncio.gather(
+            *(test_feedback_workflow(client, student_id) for student_id in student_ids)
+        )
+    return all(results)
+
+
 def main() -> int:
+    student_ids = sys.argv[1:] or ["student_01"]
     try:
-        success = test_feedback_workflow()
+        success = asyncio.run(run(student_ids))
         return 0 if success else 1
     except Exception as exc:  # pragma: no cover - manual script
         print(f"❌ Error: {exc}")
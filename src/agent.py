@@ -5,27 +5,45 @@ LLM-based agent for generating lesson plans using OpenAI API.
 """
 
 from datetime import UTC, datetime, timedelta
+import asyncio
 import os
 import sys
 import json
+import logging
 import re
+import string
 import hashlib
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import importlib.util
+import mmap
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Callable, cast
-from openai import OpenAI
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, TextIO, cast
 from pydantic import ValidationError
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
 
 try:  # Prefer package-relative imports when available
+    from . import fast_json
     from .db_utils import get_student_profile
+    from .feedback_processor import is_standard_eligible
     from .logic import get_filtered_standards
     from .resource_models import ResourceRequests
     from .worksheet_requests import build_worksheets_from_requests, WorksheetArtifactPlan
     from .worksheets import Worksheet, ReadingWorksheet
     from .packet_store import save_weekly_packet
+    from .plan_cache import (
+        get_cached_lesson_plan,
+        lesson_plan_cache_key,
+        scaffold_cache_key,
+        store_cached_lesson_plan,
+    )
+    from .rate_limiter import create_chat_completion
+    from .lesson_templates import render_template_lesson
     from .worksheet_renderer import (
         render_worksheet_to_image,
         render_worksheet_to_pdf,
@@ -35,7 +53,9 @@ try:  # Prefer package-relative imports when available
     from .worksheet_html_renderer import render_worksheet_html, HTML_SUPPORTED_KINDS
 except ImportError:  # Fallback for direct script execution
     sys.path.insert(0, os.path.dirname(__file__))
+    import fast_json  # type: ignore
     from db_utils import get_student_profile  # type: ignore
+    from feedback_processor import is_standard_eligible  # type: ignore
     from logic import get_filtered_standards  # type: ignore
     from resource_models import ResourceRequests  # type: ignore
     from worksheet_requests import build_worksheets_from_requests, WorksheetArtifactPlan  # type: ignore
@@ -48,16 +68,93 @@ except ImportError:  # Fallback for direct script execution
     )
     from worksheet_html_renderer import render_worksheet_html, HTML_SUPPORTED_KINDS  # type: ignore
     from packet_store import save_weekly_packet  # type: ignore
+    from plan_cache import (  # type: ignore
+        get_cached_lesson_plan,
+        lesson_plan_cache_key,
+        scaffold_cache_key,
+        store_cached_lesson_plan,
+    )
+    from rate_limiter import create_chat_completion  # type: ignore
+    from lesson_templates import render_template_lesson  # type: ignore
 
+logger = logging.getLogger(__name__)
 
-# Maximum number of concurrent threads for generating daily lesson plans.
-# Default is 5 (one per weekday). Raising this may reduce latency but
-# increases OpenAI rate-limit pressure and local CPU usage.
+# Maximum number of daily lesson plans generated concurrently on the event loop.
+# Default is 5 (one per weekday). Lowering it eases OpenAI rate-limit pressure at
+# the cost of latency; a week only has five days, so values above 5 change nothing.
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 MAX_DAILY_PLAN_THREADS = int(os.environ.get("MAX_DAILY_PLAN_THREADS", "5"))
+_DAILY_PLAN_CONCURRENCY = max(1, min(5, MAX_DAILY_PLAN_THREADS))
+# Upper bound in seconds on one day's plan (LLM call, parsing, rendering). A day that
+# exceeds it gets the deterministic fallback so one stuck call cannot hold up the
+# week. 0 disables the limit.
+DAILY_PLAN_TIMEOUT_S = float(os.environ.get("DAILY_PLAN_TIMEOUT_S", "60"))
+# When enabled, all five daily lesson plans are requested in one chat completion
+# instead of one request per day: fewer prompt tokens and requests, at the cost
+# of a longer single response.
+BATCH_DAILY_PLANS = os.environ.get("BATCH_DAILY_PLANS", "0") == "1"
+# Replay previously generated lesson plans for identical (standards, materials, notes,
+# grade) inputs instead of calling the LLM again. Set LESSON_PLAN_CACHE=0 to disable.
+LESSON_PLAN_CACHE = os.environ.get("LESSON_PLAN_CACHE", "1") == "1"
+# Build lessons for standards with a registered deterministic template (see
+# lesson_templates.py) without calling the LLM. Set USE_TEMPLATES=0 to disable.
+USE_TEMPLATES = os.environ.get("USE_TEMPLATES", "1") == "1"
+# Issue the fallback Monday request concurrently with the scaffold call, so a failed
+# scaffold does not add a second round trip. Costs one discarded request per successful
+# scaffold, hence off by default.
+SPECULATIVE_SCAFFOLD_FALLBACK = os.environ.get("SPECULATIVE_SCAFFOLD_FALLBACK", "0") == "1"
+# Stream the scaffold response and issue each day's request as soon as its assignment
+# has arrived, overlapping the rest of the scaffold with the first days' calls.
+STREAM_SCAFFOLD = os.environ.get("STREAM_SCAFFOLD", "0") == "1"
+# Ask for the whole week (day assignments and lesson plans) in one chat completion instead
+# of a scaffold call followed by the daily calls. Falls back to the two-phase path when
+# the response does not cover Monday-Friday.
+SINGLE_CALL_WEEK = os.environ.get("SINGLE_CALL_WEEK", "0") == "1"
+# Request the scaffold as strict structured output (a JSON Schema response_format) so the
+# provider's constrained decoder guarantees its shape. Needs a model that supports
+# json_schema (gpt-4o-2024-08-06 and later); the default gpt-3.5-turbo rejects it.
+STRUCTURED_SCAFFOLD_OUTPUT = os.environ.get("STRUCTURED_SCAFFOLD_OUTPUT", "0") == "1"
+# Submit the per-day requests as one OpenAI Batch API job (half the token price, outside
+# the per-request RPM limit). Jobs take minutes to hours, so this is for scheduled runs,
+# not interactive requests. Days missing from the job's output fall back to direct calls.
+USE_OPENAI_BATCH = os.environ.get("USE_OPENAI_BATCH", "0") == "1"
+# Cancel a batch job still unfinished after this long; its days then use direct calls.
+OPENAI_BATCH_MAX_WAIT_S = float(os.environ.get("OPENAI_BATCH_MAX_WAIT_S", "86400"))
+OPENAI_BATCH_POLL_INITIAL_S = 5.0
+OPENAI_BATCH_POLL_MAX_S = 60.0
+_BATCH_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+# Write each full LLM response body to the run logs. Off by default: the parsed content
+# is logged anyway, so exchanges only record the model, finish reason and token usage.
+LOG_LLM_EXCHANGES = os.environ.get("LOG_LLM_EXCHANGES", "0") == "1"
+# Longest string kept verbatim in those logged bodies (message content, logprobs, ...);
+# longer ones are cut and annotated with their full length. 0 keeps everything.
+LOG_LLM_MAX_STRING = int(os.environ.get("LOG_LLM_MAX_STRING", "2048"))
+# Skip the scaffold call when it has nothing to decide: exactly five standards and no
+# activity-count feedback get one standard per weekday, in retrieval order. Off by
+# default, since the model would otherwise sequence the standards and write day foci.
+SKIP_SCAFFOLD_LLM = os.environ.get("SKIP_SCAFFOLD_LLM", "0") == "1"
+# Reuse PNG/PDF renders of identical worksheets: each render is kept under
+# ARTIFACTS_DIR/.render-cache and hard-linked into later days' folders. The cache is
+# never pruned; delete the directory to reclaim space. Set ARTIFACT_RENDER_CACHE=0 to
+# always render.
+ARTIFACT_RENDER_CACHE = os.environ.get("ARTIFACT_RENDER_CACHE", "1") == "1"
 LOG_DIR = PROJECT_ROOT / "logs"
 GENERATE_WEEKLY_DIR = LOG_DIR / "generate-weekly"
 ARTIFACTS_DIR = PROJECT_ROOT / "artifacts"
+# Shared pool for worksheet PNG/PDF/HTML render jobs; Pillow releases the GIL while
+# encoding, so jobs for different worksheets and formats overlap.
+_RENDER_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="worksheet-render"
+)
+# Single thread that performs GenerationLogger's file writes, in submission order, so
+# logging never waits on disk in the event loop or in render workers.
+_LOG_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="generation-log")
+# Long-lived pool for the blocking SQLite/render calls made while building a week.
+# asyncio.to_thread would use the loop's default executor, which asyncio.run() spawns
+# afresh (and tears down) for every synchronous generate_weekly_plan call.
+_BLOCKING_IO_EXECUTOR = ThreadPoolExecutor(
+    max_workers=_DAILY_PLAN_CONCURRENCY * 2, thread_name_prefix="daily-plan"
+)
 
 RESOURCE_GUIDANCE = """If a printable worksheet would measurably help the lesson, include a `resources` object.
 
@@ -143,70 +240,300 @@ RESOURCE_FEW_SHOT = {
         }
     },
 }
-RESOURCE_FEW_SHOT_JSON = json.dumps(RESOURCE_FEW_SHOT, indent=2)
+RESOURCE_FEW_SHOT_JSON = fast_json.dumps_indented(RESOURCE_FEW_SHOT).decode("utf-8")
+RESOURCE_GUIDANCE_WITH_EXAMPLE = (
+    f"{RESOURCE_GUIDANCE}\n\nExample (trim fields you do not need):\n{RESOURCE_FEW_SHOT_JSON}\n"
+)
+BATCHED_RESOURCE_GUIDANCE_WITH_EXAMPLE = (
+    f"{RESOURCE_GUIDANCE}\n\nExample for a single day (trim fields you do not need):\n"
+    f"{RESOURCE_FEW_SHOT_JSON}\n"
+)
+
+
+# HTTP/2 lets concurrent daily calls multiplex over one TLS connection; it needs the
+# optional `h2` package (pip install "httpx[http2]"), otherwise HTTP/1.1 keep-alive is used.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+OPENAI_MAX_CONNECTIONS = 32
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = 16
+# httpx drops idle connections after 5s by default, which is shorter than the gap
+# between a scaffold call and the next student's run in a server or batch job.
+OPENAI_KEEPALIVE_EXPIRY_S = 60.0
+
+# The openai SDK takes about half a second to import, so it is loaded on the first plan
+# generation rather than by every process that imports this module (API startup, cron
+# scripts that often have nothing to generate).
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+else:
+    AsyncOpenAI = None
+
+
+def _async_openai_class() -> type["AsyncOpenAI"]:
+    global AsyncOpenAI
+    if AsyncOpenAI is None:
+        from openai import AsyncOpenAI
+    return AsyncOpenAI
+
+
+# AsyncOpenAI clients (and their httpx connection pools) are bound to the event loop
+# that created them, so one client is kept per running loop and reused across requests.
+_ClientEntry = tuple[tuple[str, str | None], "AsyncOpenAI"]
+_ASYNC_CLIENTS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _ClientEntry] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_async_client(api_key: str, base_url: str | None) -> "AsyncOpenAI":
+    """Return the shared AsyncOpenAI client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    settings = (api_key, base_url)
+    cached = _ASYNC_CLIENTS.get(loop)
+    if cached is not None and cached[0] == settings:
+        return cached[1]
+    import httpx
+
+    limits = httpx.Limits(
+        max_connections=OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY_S,
+    )
+    # Retries are handled (with throttling) by rate_limiter.create_chat_completion.
+    client = _async_openai_class()(
+        api_key=api_key,
+        base_url=base_url,
+        max_retries=0,
+        # The SDK still applies its own per-request timeouts to this client.
+        http_client=httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=limits),
+    )
+    _ASYNC_CLIENTS[loop] = (settings, client)
+    return client
+
+
+async def _close_async_client() -> None:
+    """Close and forget the client owned by the running event loop, if any."""
+    cached = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if cached is not None:
+        await cached[1].close()
+
+
+@lru_cache(maxsize=1)
+def _week_of_for_hour(hour_bucket: int) -> str:
+    # UTC hour buckets never straddle a date boundary, so the bucket start has the same
+    # weekday as "now".
+    today = datetime.fromtimestamp(hour_bucket * 3600, UTC)
+    monday = today - timedelta(days=today.weekday())
+    return monday.strftime("%Y-%m-%d")
+
+
+def _current_week_of(now: datetime | None = None) -> str:
+    """Return the Monday (UTC, ``YYYY-MM-DD``) of ``now``'s week, cached per hour."""
+    timestamp = time.time() if now is None else now.timestamp()
+    return _week_of_for_hour(int(timestamp) // 3600)
+
 
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9_-]")
+_SLUG_SAFE_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+# ASCII-only translation table equivalent to _SLUG_RE; non-ASCII input uses the regex.
+_SLUG_TABLE = {code: "_" for code in range(128) if chr(code) not in _SLUG_SAFE_CHARS}
 
+
+@lru_cache(maxsize=4096)
 def _slugify(value: str) -> str:
     if not value:
         return "entry"
-    return re.sub(r"[^a-zA-Z0-9_-]", "_", value)
+    if value.isascii():
+        return value.translate(_SLUG_TABLE)
+    return _SLUG_RE.sub("_", value)
+
+
+def _truncate_for_log(value: Any, max_str: int) -> Any:
+    """Copy ``value`` with every string longer than ``max_str`` cut to that length."""
+    if isinstance(value, str):
+        if len(value) <= max_str:
+            return value
+        return f"{value[:max_str]}...[truncated, total={len(value)}]"
+    if isinstance(value, dict):
+        return {key: _truncate_for_log(item, max_str) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_truncate_for_log(item, max_str) for item in value]
+    return value
+
+
+def _loggable_response(response: Any) -> dict | str:
+    """Return what the run logs keep of an LLM response (see ``LOG_LLM_EXCHANGES``)."""
+    if LOG_LLM_EXCHANGES:
+        text = response.model_dump_json()
+        # No string inside can be longer than the whole document, so short bodies are
+        # spliced into the log as-is without being parsed.
+        if LOG_LLM_MAX_STRING <= 0 or len(text) <= LOG_LLM_MAX_STRING:
+            return text
+        return _truncate_for_log(fast_json.loads(text), LOG_LLM_MAX_STRING)
+    usage = getattr(response, "usage", None)
+    choices = getattr(response, "choices", None) or [None]
+    return {
+        "model": getattr(response, "model", None),
+        "finish_reason": getattr(choices[0], "finish_reason", None),
+        "prompt_tokens": getattr(usage, "prompt_tokens", None),
+        "cached_tokens": getattr(
+            getattr(usage, "prompt_tokens_details", None), "cached_tokens", None
+        ),
+        "completion_tokens": getattr(usage, "completion_tokens", None),
+    }
+
+
+def _log_write_failure(future: Future[None]) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning("Generation log write failed: %s", future.exception())
 
 
 class GenerationLogger:
-    """Structured logger that tracks one weekly generation run."""
+    """Structured logger that tracks one weekly generation run.
+
+    Run-level artifacts (metadata, scaffold, final plan) are separate JSON files. Every
+    per-day event is appended as one line to ``daily_plans.jsonl``, which avoids creating
+    several small files per day. Payloads are serialized by the caller (so later
+    mutations cannot leak in) and written by the single ``_LOG_WRITER`` thread in
+    submission order. Call :meth:`close` when the run ends to wait for those writes.
+    """
 
-    def __init__(self, student_id: str, grade_level: int, subject: str) -> None:
-        self.run_id = datetime.now().strftime("%Y%m%dT%H%M%S_%f")
+    def __init__(
+        self, student_id: str, grade_level: int, subject: str, now: datetime | None = None
+    ) -> None:
+        # Run IDs use local time; ``now`` lets the caller share one clock reading.
+        self.run_id = (now.astimezone() if now else datetime.now()).strftime("%Y%m%dT%H%M%S_%f")
         self.base_dir = GENERATE_WEEKLY_DIR / self.run_id
-        self.daily_dir = self.base_dir / "daily_plans"
+        # Every log file lives here, so the writers below do not re-check it.
         self.base_dir.mkdir(parents=True, exist_ok=True)
-        self.daily_dir.mkdir(parents=True, exist_ok=True)
-        self._day_slug_cache: dict[str, str] = {}
-        self._day_slug_counts: dict[str, int] = {}
-        self._write_json(
-            self.base_dir / "run_metadata.json",
-            {
-                "run_id": self.run_id,
-                "student_id": student_id,
-                "grade_level": grade_level,
-                "subject": subject,
-                "created_at": self.run_id,
-            },
+        self.daily_log_path = self.base_dir / "daily_plans.jsonl"
+        # Only touched on the writer thread.
+        self._daily_log: TextIO | None = None
+        self._pending: list[Future[None]] = []
+        # Written synchronously so a run directory always identifies its run.
+        (self.base_dir / "run_metadata.json").write_bytes(
+            fast_json.dumps_indented(
+                {
+                    "run_id": self.run_id,
+                    "student_id": student_id,
+                    "grade_level": grade_level,
+                    "subject": subject,
+                    "created_at": self.run_id,
+                }
+            )
         )
 
+    def _submit(self, write: Callable[..., Any], *args: Any) -> None:
+        self._pending.append(_LOG_WRITER.submit(write, *args))
+
     def _write_json(self, path: Path, payload: Any) -> None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("w", encoding="utf-8") as handle:
-            json.dump(payload, handle, indent=2)
-
-    def _day_slug(self, day_label: str) -> str:
-        key = (day_label or "").strip().lower() or "day"
-        if key in self._day_slug_cache:
-            return self._day_slug_cache[key]
-        base = _slugify(key) or "day"
-        count = self._day_slug_counts.get(base, 0)
-        slug = base if count == 0 else f"{base}_{count}"
-        self._day_slug_counts[base] = count + 1
-        self._day_slug_cache[key] = slug
-        return slug
-
-    def _daily_path(self, day_label: str, suffix: str = "") -> Path:
-        slug = self._day_slug(day_label)
-        filename = f"{slug}{suffix}.json"
-        return self.daily_dir / filename
+        self._submit(path.write_bytes, fast_json.dumps_indented(payload))
 
-    def log_weekly_scaffold_exchange(
+    def _write_exchange(
         self,
+        path: Path,
         request_payload: dict,
-        response_payload: dict | None = None,
-        error: str | None = None,
+        response_payload: dict | str | None,
+        error: str | None,
+    ) -> None:
+        """Log one LLM request/response pair.
+
+        ``response_payload`` may be the SDK's ``model_dump_json()`` text, which is spliced
+        into the envelope as-is instead of being materialized as a dict first.
+        """
+        payload: dict[str, Any] = {"request": request_payload}
+        if error:
+            payload["error"] = error
+        if not isinstance(response_payload, str):
+            if response_payload is not None:
+                payload["response"] = response_payload
+            self._write_json(path, payload)
+            return
+        envelope = fast_json.dumps_indented(payload)
+        # Replace the envelope's closing "\n}" with the raw response member.
+        self._submit(
+            path.write_bytes,
+            envelope[:-2] + b',\n  "response": ' + response_payload.encode("utf-8") + b"\n}",
+        )
+
+    def _append_daily(
+        self,
+        day_label: str | None,
+        kind: str,
+        payload: dict[str, Any],
+        raw_response: str | None = None,
+        fields: dict[str, Any] | None = None,
+    ) -> None:
+        """Append one ``{"day", "kind", "payload"}`` line to the daily JSONL log.
+
+        ``fields`` are extra top-level members placed before ``payload``. ``raw_response``
+        (compact ``model_dump_json()`` text) is spliced into ``payload`` under
+        ``"response"`` without being parsed.
+        """
+        line = fast_json.dumps(
+            {"day": day_label, "kind": kind, **(fields or {}), "payload": payload}
+        )
+        if raw_response is not None:
+            # ``payload`` is a non-empty dict, so the line ends with "}}".
+            line = f'{line[:-2]},"response":{raw_response}}}}}'
+        self._submit(self._write_daily_line, line + "\n")
+
+    def _write_daily_line(self, line: str) -> None:
+        if self._daily_log is None:
+            self._daily_log = self.daily_log_path.open("a", encoding="utf-8")
+        self._daily_log.write(line)
+
+    def _close_daily_log(self) -> None:
+        if self._daily_log is not None:
+            self._daily_log.close()
+            self._daily_log = None
+
+    def _append_daily_exchange(
+        self,
+        day_label: str | None,
+        kind: str,
+        request_payload: dict,
+        response_payload: dict | str | None,
+        error: str | None,
     ) -> None:
         payload: dict[str, Any] = {"request": request_payload}
-        if response_payload is not None:
-            payload["response"] = response_payload
         if error:
             payload["error"] = error
-        self._write_json(self.base_dir / "weekly_scaffold_llm_exchange.json", payload)
+        if isinstance(response_payload, str):
+            self._append_daily(day_label, kind, payload, raw_response=response_payload)
+            return
+        if response_payload is not None:
+            payload["response"] = response_payload
+        self._append_daily(day_label, kind, payload)
+
+    def close(self) -> None:
+        """Wait for every queued write, close the daily JSONL log, and raise any error."""
+        self._submit(self._close_daily_log)
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def close_in_background(self) -> None:
+        """Queue the daily JSONL log's close behind pending writes without waiting.
+
+        Used when a run fails or is cancelled: the writer thread still flushes every
+        queued write, and write errors are logged rather than masking the run's error.
+        """
+        self._submit(self._close_daily_log)
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.add_done_callback(_log_write_failure)
+
+    def log_weekly_scaffold_exchange(
+        self,
+        request_payload: dict,
+        response_payload: dict | str | None = None,
+        error: str | None = None,
+    ) -> None:
+        self._write_exchange(
+            self.base_dir / "weekly_scaffold_llm_exchange.json",
+            request_payload,
+            response_payload,
+            error,
+        )
 
     def log_weekly_scaffold_content(
         self,
@@ -229,37 +556,57 @@ class GenerationLogger:
         self,
         day_label: str,
         request_payload: dict,
-        response_payload: dict | None = None,
+        response_payload: dict | str | None = None,
         error: str | None = None,
     ) -> None:
-        payload: dict[str, Any] = {"request": request_payload}
-        if response_payload is not None:
-            payload["response"] = response_payload
-        if error:
-            payload["error"] = error
-        self._write_json(self._daily_path(day_label, "_llm_exchange"), payload)
+        self._append_daily_exchange(
+            day_label, "llm_exchange", request_payload, response_payload, error
+        )
+
+    def log_daily_batch_exchange(
+        self,
+        request_payload: dict,
+        response_payload: dict | str | None = None,
+        error: str | None = None,
+    ) -> None:
+        self._append_daily_exchange(
+            None, "batch_llm_exchange", request_payload, response_payload, error
+        )
 
     def log_daily_response(
         self,
         day_label: str,
         parsed_content: dict | None,
-        raw_content: str,
+        raw_content: str = "",
         error: str | None = None,
+        source: str = "llm",
+        source_ref: str | None = None,
     ) -> None:
+        """Log a day's lesson-plan response.
+
+        ``raw_content`` is only recorded when parsing failed. ``source`` says where the
+        response came from (``"llm"``, ``"cache"`` or ``"template"``), and ``source_ref``
+        identifies it there (the cache key or template pattern).
+        """
+        fields: dict[str, Any] = {"source": source}
+        if source_ref is not None:
+            fields["source_ref"] = source_ref
         if parsed_content is not None:
-            self._write_json(self._daily_path(day_label, "_response"), parsed_content)
+            self._append_daily(day_label, "response", parsed_content, fields=fields)
         else:
-            self._write_json(
-                self._daily_path(day_label, "_response"),
+            self._append_daily(
+                day_label,
+                "response",
                 {"error": error or "parse_error", "raw_content": raw_content},
+                fields=fields,
             )
 
     def log_daily_plan(self, day_label: str, plan_payload: dict) -> None:
-        self._write_json(self._daily_path(day_label), plan_payload)
+        self._append_daily(day_label, "plan", plan_payload)
 
     def log_daily_error(
         self,
-        day_label: str,
+        day_label: str | None,
         stage: str,
         message: str,
         request_payload: dict | None = None,
@@ -267,7 +614,147 @@ class GenerationLogger:
         payload: dict[str, Any] = {"stage": stage, "error": message}
         if request_payload is not None:
             payload["request"] = request_payload
-        self._write_json(self._daily_path(day_label, "_error"), payload)
+        self._append_daily(day_label, "error", payload)
+
+
+# Rule-independent opening of every per-day prompt. It comes first, byte-identical for
+# every student and day, so the provider's automatic prompt caching (which matches on
+# the longest shared prefix, from 1024 tokens up) can serve it across all calls.
+LESSON_PLAN_INSTRUCTIONS = f"""You are an expert K-12 educator. Create a lesson plan for the educational standard given at the end of this message.
+
+Requirements:
+1. Create a lesson_plan object with the following structure:
+   - objective: A clear learning objective based on the standard
+   - materials_needed: A list of materials (MUST only use items from the allowed materials listed below)
+    - procedure: Step-by-step instructions for teaching the lesson (include approximate minutes for each step so the full lesson fits in about 60 minutes)
+
+2. Important constraints:
+   - Materials MUST ONLY come from the allowed materials listed below
+   - Follow the parent guidance listed below
+    - Plan approximately one hour of focused work (45-60 minutes total) and keep procedure steps tightly scoped
+   - Keep the lesson age-appropriate for the grade level
+   - The objective should directly address the standard
+
+{RESOURCE_GUIDANCE_WITH_EXAMPLE}
+
+Respond ONLY with valid JSON:
+{{
+    "lesson_plan": {{
+        "objective": "Clear learning objective here",
+        "materials_needed": ["Material1", "Material2"],
+        "procedure": ["Step 1", "Step 2", "Step 3"]
+    }},
+    "resources": {{
+        "mathWorksheet": {{ ... }},
+        "readingWorksheet": {{ ... }}
+    }}
+}}
+If no worksheet is needed, omit the entire `resources` key.
+"""
+
+
+SCAFFOLD_INSTRUCTIONS = """You are an expert K-12 educator creating a weekly lesson plan scaffold.
+
+Using the grade level, subject, available standards, parent constraints, and activity guidance given at the end of this message, create a weekly plan that:
+1. Distributes standards across Monday-Friday appropriately
+2. Complex standards should span multiple days with scaffolding
+3. Simpler standards can be covered in a single day
+4. Each day should build on previous days
+5. Follows the activity guidance for the number of activities per day
+
+Respond with a JSON object in this exact format, with daily_assignments first:
+{
+  "daily_assignments": [
+    {
+      "day": "Monday",
+      "standard_ids": ["standard_id_1"],
+      "focus": "Brief description of this day's focus"
+    },
+    ...
+  ],
+  "weekly_overview": "Brief description of how the week progresses"
+}
+"""
+
+# Strict JSON Schema matching the SCAFFOLD_INSTRUCTIONS format, used when
+# STRUCTURED_SCAFFOLD_OUTPUT is on. Property order is kept so daily_assignments still
+# streams first.
+_SCAFFOLD_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "daily_assignments": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "day": {
+                        "type": "string",
+                        "enum": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
+                    },
+                    "standard_ids": {"type": "array", "items": {"type": "string"}},
+                    "focus": {"type": "string"},
+                },
+                "required": ["day", "standard_ids", "focus"],
+                "additionalProperties": False,
+            },
+        },
+        "weekly_overview": {"type": "string"},
+    },
+    "required": ["daily_assignments", "weekly_overview"],
+    "additionalProperties": False,
+}
+_SCAFFOLD_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "weekly_scaffold", "schema": _SCAFFOLD_SCHEMA, "strict": True},
+}
+
+
+@lru_cache(maxsize=128)
+def _lesson_plan_prompt_prefix(allowed_materials: str, parent_notes: str) -> str:
+    return (
+        f"{LESSON_PLAN_INSTRUCTIONS}\n"
+        f"Allowed materials: {allowed_materials}\n"
+        f"Parent guidance: {parent_notes}\n"
+    )
+
+
+def build_rules_prefix(rules: dict) -> str:
+    """
+    Build the standard-independent part of the lesson-plan prompt for a rule set.
+
+    The prefix only depends on the allowed materials and parent notes, so it is cached and
+    identical for every day of a week. It opens with the rule-independent
+    ``LESSON_PLAN_INSTRUCTIONS`` so the provider's prompt-prefix cache is shared across
+    students too; materials are sorted so their order does not split that cache.
+    """
+    allowed_materials = sorted(map(str, rules.get("allowed_materials", None) or []))
+    # Default to keeping procedures under 3 steps if parent_notes not provided
+    parent_notes = rules.get("parent_notes", "keep procedures under 3 steps")
+    return _lesson_plan_prompt_prefix(str(allowed_materials), str(parent_notes))
+
+
+@lru_cache(maxsize=512)
+def _prompt_with_standard(prefix: str, description: str, subject: str, grade_level: str) -> str:
+    return (
+        f"{prefix}\n"
+        f"Standard: {description}\n"
+        f"Subject: {subject}\n"
+        f"Grade Level: {grade_level}\n"
+    )
+
+
+def append_standard(prefix: str, standard: dict) -> str:
+    """Append the per-standard block to a prompt prefix from :func:`build_rules_prefix`.
+
+    Full prompts are memoized: the same standards recur across students and weeks, and
+    the prefix string caches its own hash, so a repeat costs a dict lookup.
+    """
+    return _prompt_with_standard(
+        prefix,
+        str(standard.get("description", "")),
+        str(standard.get("subject", "")),
+        str(standard.get("grade_level", 0)),
+    )
 
 
 def create_lesson_plan_prompt(standard: dict, rules: dict) -> str:
@@ -281,62 +768,129 @@ def create_lesson_plan_prompt(standard: dict, rules: dict) -> str:
     Returns:
         A string containing the formatted prompt for the LLM
     """
-    # Extract allowed materials and parent notes from rules
-    allowed_materials = rules.get("allowed_materials", [])
-    # Default to keeping procedures under 3 steps if parent_notes not provided
-    parent_notes = rules.get("parent_notes", "keep procedures under 3 steps")
+    return append_standard(build_rules_prefix(rules), standard)
+
 
-    # Build the prompt
-    resource_guidance = f"""{RESOURCE_GUIDANCE}
+FULL_WEEK_INSTRUCTIONS = f"""You are an expert K-12 educator. Plan a full week (Monday-Friday) of lessons using the grade level, subject, available standards, parent constraints, and activity guidance given at the end of this message.
 
-Example (trim fields you do not need):
-{RESOURCE_FEW_SHOT_JSON}
+Requirements:
+1. Distribute the standards across Monday-Friday. Complex standards can span multiple days with scaffolding, simpler standards can be covered in a single day, and each day should build on the previous days.
+2. For every day, create a lesson_plan object with the following structure:
+   - objective: A clear learning objective based on that day's standards and focus
+   - materials_needed: A list of materials (MUST only use the allowed materials)
+   - procedure: Step-by-step instructions for teaching the lesson (include approximate minutes for each step so the full lesson fits in about 60 minutes)
+3. Important constraints:
+   - Materials MUST ONLY come from the allowed materials
+   - Follow the parent guidance and the activity guidance
+   - Plan approximately one hour of focused work (45-60 minutes total) per day and keep procedure steps tightly scoped
+   - Keep each lesson age-appropriate for the grade level
+
+{BATCHED_RESOURCE_GUIDANCE_WITH_EXAMPLE}
+
+Respond ONLY with valid JSON containing one entry per weekday, in order:
+{{
+    "plans": [
+        {{
+            "day": "Monday",
+            "standard_ids": ["standard_id_1"],
+            "focus": "Brief description of this day's focus",
+            "lesson_plan": {{
+                "objective": "Clear learning objective here",
+                "materials_needed": ["Material1", "Material2"],
+                "procedure": ["Step 1", "Step 2", "Step 3"]
+            }},
+            "resources": {{ ... }}
+        }}
+    ],
+    "weekly_overview": "Brief description of how the week progresses"
+}}
+Omit a day's `resources` key when that day needs no worksheet.
 """
 
-    prompt = f"""You are an expert K-12 educator. Create a lesson plan for the following educational standard.
 
-Standard: {standard.get('description', '')}
-Subject: {standard.get('subject', '')}
-Grade Level: {standard.get('grade_level', 0)}
+def create_batched_lesson_plan_prompt(day_requests: list[dict], rules: dict) -> str:
+    """
+    Build one prompt asking the LLM for every day's lesson plan in a single response.
+
+    Args:
+        day_requests: One dict per day with `day`, `standards` (list of standard dicts),
+            and `focus` keys
+        rules: Dictionary containing parent rules (allowed_materials, parent_notes, etc.)
+
+    Returns:
+        A string containing the formatted prompt for the LLM
+    """
+    allowed_materials = rules.get("allowed_materials", [])
+    parent_notes = rules.get("parent_notes", "keep procedures under 3 steps")
+
+    days_preview = [
+        {
+            "day": request["day"],
+            "standards": [s.get("description", "") for s in request["standards"]],
+            "subject": request["standards"][0].get("subject", "") if request["standards"] else "",
+            "grade_level": (
+                request["standards"][0].get("grade_level", 0) if request["standards"] else 0
+            ),
+            "focus": request["focus"],
+        }
+        for request in day_requests
+    ]
+    days_text = fast_json.dumps_indented(days_preview).decode("utf-8")
+
+    prompt = f"""You are an expert K-12 educator. Create one lesson plan for each of the following days.
+
+Days:
+{days_text}
 
 Requirements:
-1. Create a lesson_plan object with the following structure:
-   - objective: A clear learning objective based on the standard
+1. For every day, create a lesson_plan object with the following structure:
+   - objective: A clear learning objective based on that day's standards and focus
    - materials_needed: A list of materials (MUST only use items from: {allowed_materials})
-    - procedure: Step-by-step instructions for teaching the lesson (include approximate minutes for each step so the full lesson fits in about 60 minutes)
+   - procedure: Step-by-step instructions for teaching the lesson (include approximate minutes for each step so the full lesson fits in about 60 minutes)
 
 2. Important constraints:
    - Materials MUST ONLY come from this list: {allowed_materials}
    - Follow this parent guidance: {parent_notes}
-    - Plan approximately one hour of focused work (45-60 minutes total) and keep procedure steps tightly scoped
-   - Keep the lesson age-appropriate for the grade level
-   - The objective should directly address the standard
+   - Plan approximately one hour of focused work (45-60 minutes total) per day and keep procedure steps tightly scoped
+   - Keep each lesson age-appropriate for the grade level
+   - Each objective should directly address that day's standards
 
-{resource_guidance}
+{BATCHED_RESOURCE_GUIDANCE_WITH_EXAMPLE}
 
-Respond ONLY with valid JSON:
+Respond ONLY with valid JSON containing one entry per day, in the same order:
 {{
-    "lesson_plan": {{
-        "objective": "Clear learning objective here",
-        "materials_needed": ["Material1", "Material2"],
-        "procedure": ["Step 1", "Step 2", "Step 3"]
-    }},
-    "resources": {{
-        "mathWorksheet": {{ ... }},
-        "readingWorksheet": {{ ... }}
-    }}
+    "plans": [
+        {{
+            "day": "Monday",
+            "lesson_plan": {{
+                "objective": "Clear learning objective here",
+                "materials_needed": ["Material1", "Material2"],
+                "procedure": ["Step 1", "Step 2", "Step 3"]
+            }},
+            "resources": {{ ... }}
+        }}
+    ]
 }}
-If no worksheet is needed, omit the entire `resources` key.
+Omit a day's `resources` key when that day needs no worksheet.
 """
 
     return prompt
 
 
+def _standards_by_id(standards: list) -> dict:
+    """Index standards by ID, skipping any without one.
+
+    Keying on ``s.get("standard_id")`` would fold every ID-less standard into a single
+    ``None`` entry that an assignment of ``[null]`` could then resolve to.
+    """
+    return {s["standard_id"]: s for s in standards if s.get("standard_id") is not None}
+
+
 def _resolve_day_standards(assignment: dict, standards_by_id: dict, standards: list) -> list:
     """Return the ordered list of standards referenced by an assignment."""
     standard_ids = assignment.get("standard_ids", [])
-    day_standards = [standards_by_id.get(sid) for sid in standard_ids if sid in standards_by_id]
-    day_standards = [s for s in day_standards if s is not None]
+    # One dict probe per ID instead of a membership test plus an index.
+    day_standards = [s for s in map(standards_by_id.get, standard_ids) if s is not None]
     if not day_standards:
         day_standards = [standards[0]] if standards else []
     return day_standards
@@ -365,12 +919,17 @@ def _assemble_day_plan(
     worksheet_plans: list | None = None,
     worksheet_errors: list | None = None,
 ) -> dict:
-    """Compose the day plan payload from provided components."""
+    """Compose the day plan payload from provided components.
+
+    Standards are referenced by ID; the full standard dicts live once in the weekly
+    plan's top-level ``standards`` map.
+    """
+    standard_ids = [s.get("standard_id") for s in day_standards]
     payload = {
         "day": day,
         "lesson_plan": lesson_plan,
-        "standard": day_standards[0] if day_standards else {},
-        "standards": day_standards,
+        "standard_id": standard_ids[0] if standard_ids else None,
+        "standard_ids": standard_ids,
         "focus": day_focus,
     }
     if resources:
@@ -387,49 +946,185 @@ def _artifact_day_dir(plan_id: str, day_label: str) -> Path:
     return ARTIFACTS_DIR / plan_id / day_slug
 
 
-def _relative_artifact_path(path: Path) -> str:
-    try:
-        return str(path.relative_to(PROJECT_ROOT))
-    except ValueError:
-        return str(path)
+@lru_cache(maxsize=8)
+def _root_prefix(root: Path) -> str:
+    return str(root).rstrip(os.sep) + os.sep
 
 
-def _unique_artifact_path(directory: Path, filename_hint: str, extension: str) -> Path:
+def _relative_artifact_path(path: Path) -> str:
+    # A string prefix check; artifact paths are built from ARTIFACTS_DIR, so no
+    # normalisation is needed and Path.relative_to's part-by-part walk is skipped.
+    text = str(path)
+    prefix = _root_prefix(PROJECT_ROOT)
+    return text[len(prefix) :] if text.startswith(prefix) else text
+
+
+def _unique_artifact_path(
+    directory: Path,
+    filename_hint: str,
+    extension: str,
+    taken_names: set[str] | None = None,
+) -> Path:
+    """Return a free ``{hint}[_{n}].{ext}`` path in ``directory``.
+
+    ``taken_names`` is the set of file names already used in the directory; when given,
+    it is consulted instead of listing the directory, and the chosen name is added to it.
+    """
     safe_hint = _slugify(filename_hint or "worksheet")
-    candidate = directory / f"{safe_hint}.{extension}"
+    if taken_names is None:
+        taken_names = _existing_file_names(directory)
+    name = f"{safe_hint}.{extension}"
     counter = 1
-    while candidate.exists():
-        candidate = directory / f"{safe_hint}_{counter}.{extension}"
+    while name in taken_names:
+        name = f"{safe_hint}_{counter}.{extension}"
         counter += 1
-    return candidate
+    taken_names.add(name)
+    return directory / name
+
+
+def _existing_file_names(directory: Path) -> set[str]:
+    """List ``directory`` once (one syscall batch instead of a stat per candidate)."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
 
 
 def _artifact_file_metadata(path: Path) -> tuple[int | None, str | None]:
     """Return (size_bytes, sha256) for the given artifact path."""
 
+    # Open once and stat the descriptor rather than resolving the path twice.
     try:
-        size = path.stat().st_size
+        handle = path.open("rb")
     except OSError:
         return None, None
 
-    digest = hashlib.sha256()
-    try:
-        with path.open("rb") as handle:
-            for chunk in iter(lambda: handle.read(8192), b""):
-                digest.update(chunk)
-    except OSError:
-        return size, None
+    with handle:
+        try:
+            size = os.fstat(handle.fileno()).st_size
+        except OSError:
+            return None, None
+        try:
+            if size == 0:  # mmap rejects empty files
+                digest = hashlib.sha256()
+            else:
+                # The file was just written, so map it from the page cache and hash it in
+                # one call (GIL released) instead of copying it through read buffers.
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest = hashlib.sha256(mapped)
+        except (OSError, ValueError):
+            return size, None
 
     return size, digest.hexdigest()
 
 
+def _worksheet_render_jobs(
+    plan: WorksheetArtifactPlan, day_label: str
+) -> list[tuple[str, Callable[[Path], Path]]] | None:
+    """Return ``(format, renderer)`` jobs for a plan, or ``None`` if no renderer fits."""
+
+    # ── HTML-first rendering ───────────────────────────────────────────────
+    if plan.kind in HTML_SUPPORTED_KINDS and plan.html_data is not None:
+        html_content = render_worksheet_html(plan.kind, plan.html_data, day_label)
+        if html_content is not None:
+
+            def _write_html(output_path: Path, html_content: str = html_content) -> Path:
+                output_path.write_text(html_content, encoding="utf-8")
+                return output_path
+
+            return [("html", _write_html)]
+
+    # ── Pillow fallback rendering ──────────────────────────────────────────
+    if plan.kind == "mathWorksheet":
+        worksheet = cast(Worksheet, plan.worksheet)
+        return [
+            (
+                "png",
+                lambda output_path, worksheet=worksheet: render_worksheet_to_image(
+                    worksheet, output_path
+                ),
+            ),
+            (
+                "pdf",
+                lambda output_path, worksheet=worksheet: render_worksheet_to_pdf(
+                    worksheet, output_path
+                ),
+            ),
+        ]
+    if plan.kind == "readingWorksheet" and plan.worksheet is not None:
+        reading_worksheet = cast(ReadingWorksheet, plan.worksheet)
+        return [
+            (
+                "png",
+                lambda output_path, worksheet=reading_worksheet: render_reading_worksheet_to_image(
+                    worksheet, output_path
+                ),
+            ),
+            (
+                "pdf",
+                lambda output_path, worksheet=reading_worksheet: render_reading_worksheet_to_pdf(
+                    worksheet, output_path
+                ),
+            ),
+        ]
+    return None
+
+
+def _render_cache_key(plan: WorksheetArtifactPlan) -> str | None:
+    """Content key for a Pillow-rendered worksheet, or ``None`` if it is not cacheable.
+
+    HTML artifacts embed the day label and are cheap to write, so only the PNG/PDF
+    renders (the slow part) are cached.
+    """
+    if not ARTIFACT_RENDER_CACHE or plan.worksheet is None:
+        return None
+    if plan.kind in HTML_SUPPORTED_KINDS and plan.html_data is not None:
+        return None
+    try:
+        encoded = fast_json.dumps({"kind": plan.kind, "worksheet": asdict(plan.worksheet)})
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _render_and_describe(
+    renderer: Callable[[Path], Path], output_path: Path, cache_path: Path | None = None
+) -> tuple[Path, int | None, str | None]:
+    """Run one render job and return ``(file, size_bytes, sha256)``; runs on the pool.
+
+    With a ``cache_path``, a previous render is hard-linked into place instead of
+    rendering again, and a fresh render is linked into the cache.
+    """
+    if cache_path is not None:
+        try:
+            os.link(cache_path, output_path)
+        except OSError:
+            pass  # Not cached yet (or the cache is on another filesystem).
+        else:
+            return (output_path, *_artifact_file_metadata(output_path))
+    rendered_file = Path(renderer(output_path))
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            os.link(rendered_file, cache_path)
+        except OSError:
+            pass  # Another job cached the same worksheet first; either copy is fine.
+    size_bytes, checksum = _artifact_file_metadata(rendered_file)
+    return rendered_file, size_bytes, checksum
+
+
 def _render_worksheet_artifacts(
     plan_id: str,
     day_label: str,
     plans: list[WorksheetArtifactPlan],
     generation_logger: GenerationLogger | None = None,
 ) -> tuple[dict[str, list[dict]], list[dict]]:
-    """Render worksheet artifacts and return payload + error metadata."""
+    """Render worksheet artifacts and return payload + error metadata.
+
+    Every (worksheet, format) job runs on ``_RENDER_EXECUTOR``; results are collected
+    in submission order so artifact lists keep the plan order.
+    """
 
     artifacts_by_kind: dict[str, list[dict]] = {}
     artifact_errors: list[dict] = []
@@ -440,98 +1135,49 @@ def _render_worksheet_artifacts(
     day_dir = _artifact_day_dir(plan_id, day_label)
     day_dir.mkdir(parents=True, exist_ok=True)
 
+    # Paths are picked before any job writes, so track every name handed out.
+    taken_names = _existing_file_names(day_dir)
+    pending: list[tuple[str, str, Future[tuple[Path, int | None, str | None]]]] = []
     for plan in plans:
-        # ── HTML-first rendering ───────────────────────────────────────────
-        if plan.kind in HTML_SUPPORTED_KINDS and plan.html_data is not None:
-            html_content = render_worksheet_html(plan.kind, plan.html_data, day_label)
-            if html_content is not None:
-                output_path = _unique_artifact_path(
-                    day_dir, plan.filename_hint or plan.kind, "html"
-                )
-                try:
-                    output_path.write_text(html_content, encoding="utf-8")
-                except Exception as exc:
-                    message = str(exc)
-                    artifact_errors.append(
-                        {"kind": plan.kind, "format": "html", "message": message}
-                    )
-                    if generation_logger:
-                        generation_logger.log_daily_error(day_label, "artifact_render", message)
-                    continue
-
-                size_bytes, checksum = _artifact_file_metadata(output_path)
-                artifacts_by_kind.setdefault(plan.kind, []).append(
-                    {
-                        "type": "html",
-                        "path": _relative_artifact_path(output_path),
-                        "size_bytes": size_bytes,
-                        "sha256": checksum,
-                    }
-                )
-                continue
-
-        # ── Pillow fallback rendering ──────────────────────────────────────
-        render_jobs: list[tuple[str, Callable[[Path], Path]]] = []
-        if plan.kind == "mathWorksheet":
-            worksheet = cast(Worksheet, plan.worksheet)
-            render_jobs = [
-                (
-                    "png",
-                    lambda output_path, worksheet=worksheet: render_worksheet_to_image(
-                        worksheet, output_path
-                    ),
-                ),
-                (
-                    "pdf",
-                    lambda output_path, worksheet=worksheet: render_worksheet_to_pdf(
-                        worksheet, output_path
-                    ),
-                ),
-            ]
-        elif plan.kind == "readingWorksheet" and plan.worksheet is not None:
-            worksheet = cast(ReadingWorksheet, plan.worksheet)
-            render_jobs = [
-                (
-                    "png",
-                    lambda output_path, worksheet=worksheet: render_reading_worksheet_to_image(
-                        worksheet, output_path
-                    ),
-                ),
-                (
-                    "pdf",
-                    lambda output_path, worksheet=worksheet: render_reading_worksheet_to_pdf(
-                        worksheet, output_path
-                    ),
-                ),
-            ]
-        else:
+        render_jobs = _worksheet_render_jobs(plan, day_label)
+        if render_jobs is None:
             message = f"No renderer available for worksheet kind '{plan.kind}'"
             artifact_errors.append({"kind": plan.kind, "message": message})
             if generation_logger:
                 generation_logger.log_daily_error(day_label, "artifact_render", message)
             continue
 
+        cache_key = _render_cache_key(plan)
         for fmt, renderer in render_jobs:
-            output_path = _unique_artifact_path(day_dir, plan.filename_hint or plan.kind, fmt)
-            try:
-                rendered_path = renderer(output_path)
-            except Exception as exc:  # pragma: no cover - exercised via unit tests
-                message = str(exc)
-                artifact_errors.append({"kind": plan.kind, "format": fmt, "message": message})
-                if generation_logger:
-                    generation_logger.log_daily_error(day_label, "artifact_render", message)
-                continue
-
-            rendered_file = Path(rendered_path)
-            size_bytes, checksum = _artifact_file_metadata(rendered_file)
-            artifacts_by_kind.setdefault(plan.kind, []).append(
-                {
-                    "type": fmt,
-                    "path": _relative_artifact_path(rendered_file),
-                    "size_bytes": size_bytes,
-                    "sha256": checksum,
-                }
+            output_path = _unique_artifact_path(
+                day_dir, plan.filename_hint or plan.kind, fmt, taken_names
+            )
+            cache_path = (
+                ARTIFACTS_DIR / ".render-cache" / f"{cache_key}.{fmt}" if cache_key else None
             )
+            future = _RENDER_EXECUTOR.submit(
+                _render_and_describe, renderer, output_path, cache_path
+            )
+            pending.append((plan.kind, fmt, future))
+
+    for kind, fmt, future in pending:
+        try:
+            rendered_file, size_bytes, checksum = future.result()
+        except Exception as exc:  # pragma: no cover - exercised via unit tests
+            message = str(exc)
+            artifact_errors.append({"kind": kind, "format": fmt, "message": message})
+            if generation_logger:
+                generation_logger.log_daily_error(day_label, "artifact_render", message)
+            continue
+
+        artifacts_by_kind.setdefault(kind, []).append(
+            {
+                "type": fmt,
+                "path": _relative_artifact_path(rendered_file),
+                "size_bytes": size_bytes,
+                "sha256": checksum,
+            }
+        )
 
     return artifacts_by_kind, artifact_errors
 
@@ -551,7 +1197,7 @@ def _extract_lesson_and_resources(
         try:
             resource_model = ResourceRequests.model_validate(raw_resources)
         except ValidationError as exc:
-            print(f"Warning: Invalid worksheet resources for {day_label}: {exc}")
+            logger.warning("Invalid worksheet resources for %s: %s", day_label, exc)
         else:
             if not resource_model.has_requests():
                 resource_model = None
@@ -559,35 +1205,103 @@ def _extract_lesson_and_resources(
     return lesson_plan, resource_model
 
 
-def _build_day_plan(
-    assignment: dict,
-    standards_by_id: dict,
-    standards: list,
-    rules: dict,
-    client: OpenAI,
-    model: str,
-    plan_id: str,
-    generation_logger: GenerationLogger | None = None,
-) -> dict:
-    """Generate one day's plan inside the thread pool with deterministic fallbacks.
+async def _run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking call on ``_BLOCKING_IO_EXECUTOR`` without stalling the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BLOCKING_IO_EXECUTOR, partial(func, *args, **kwargs))
 
-    Args:
-        assignment: Dict containing `day`, `standard_ids`, and optional `focus` keys.
-        standards_by_id: Lookup of standard_id -> standard metadata.
-        standards: List of candidate standards (used for fallback selection).
-        rules: Parent preference metadata (materials, notes, etc.).
-        client: Thread-safe OpenAI client instance.
-        model: OpenAI model name.
 
-    Returns:
-        Dict with `day`, `lesson_plan`, `standard`, `standards`, and `focus` keys.
+def _discard_task(task: asyncio.Future) -> None:
+    """Cancel a speculative task, marking any error it already raised as handled."""
+    task.cancel()
+    if task.done() and not task.cancelled():
+        task.exception()
+
+
+class _ScaffoldStreamParser:
+    """Pick complete ``daily_assignments`` entries out of a scaffold as it streams in.
+
+    Scans each character once, tracking string and brace state, so feeding a whole
+    response chunk by chunk stays linear in its length.
     """
-    day = assignment.get("day") or ""
-    day_focus = assignment.get("focus", "") or ""
-    day_standards = _resolve_day_standards(assignment, standards_by_id, standards)
 
+    def __init__(self) -> None:
+        self.text = ""
+        self._pos = -1  # Next character to scan; -1 until the array has been found.
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._object_start = 0
+        self._done = False
+
+    def feed(self, chunk: str) -> list[dict]:
+        """Add streamed text and return the assignments it completed."""
+        self.text += chunk
+        text = self.text
+        if self._pos < 0:
+            key = text.find('"daily_assignments"')
+            bracket = text.find("[", key) if key >= 0 else -1
+            if bracket < 0:
+                return []
+            self._pos = bracket + 1
+        found: list[dict] = []
+        while not self._done and self._pos < len(text):
+            char = text[self._pos]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._object_start = self._pos
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        item = fast_json.loads(text[self._object_start : self._pos + 1])
+                    except json.JSONDecodeError:
+                        item = None
+                    if isinstance(item, dict):
+                        found.append(item)
+            elif char == "]" and self._depth == 0:
+                self._done = True
+            self._pos += 1
+        return found
+
+
+async def _stream_scaffold(
+    client: "AsyncOpenAI", request_payload: dict, on_assignment: Callable[[dict], None]
+) -> tuple[str, Any]:
+    """Stream the scaffold completion, calling ``on_assignment`` for each finished day.
+
+    Returns the full response text and the last chunk (which carries token usage).
+    """
+    stream = await create_chat_completion(
+        client, {**request_payload, "stream": True, "stream_options": {"include_usage": True}}
+    )
+    parser = _ScaffoldStreamParser()
+    last_chunk = None
+    async for chunk in stream:
+        last_chunk = chunk
+        if chunk.choices and chunk.choices[0].delta.content:
+            for assignment in parser.feed(chunk.choices[0].delta.content):
+                on_assignment(assignment)
+    return parser.text, last_chunk
+
+
+def _day_plan_request_payload(
+    day_standards: list, day_focus: str, rules: dict, model: str
+) -> dict[str, Any]:
+    """Build the chat completion payload for one day's lesson plan."""
+    rules_prefix = build_rules_prefix(rules)
     if len(day_standards) == 1:
-        prompt = create_lesson_plan_prompt(day_standards[0], rules)
+        prompt = append_standard(rules_prefix, day_standards[0])
     else:
         combined_descriptions = " AND ".join([s.get("description", "") for s in day_standards])
         combined_standard = {
@@ -595,13 +1309,11 @@ def _build_day_plan(
             "subject": day_standards[0].get("subject") if day_standards else "",
             "grade_level": day_standards[0].get("grade_level") if day_standards else 0,
         }
-        prompt = create_lesson_plan_prompt(combined_standard, rules)
+        prompt = append_standard(rules_prefix, combined_standard)
 
     if day_focus:
         prompt += f"\n\nDay Focus: {day_focus}"
 
-    resources_model: ResourceRequests | None = None
-
     messages = [
         {
             "role": "system",
@@ -609,41 +1321,158 @@ def _build_day_plan(
         },
         {"role": "user", "content": prompt},
     ]
-    llm_request_payload = {
+    return {
         "model": model,
         "messages": messages,
         "temperature": 0.7,
         "response_format": {"type": "json_object"},
     }
 
+
+async def _build_day_plan(
+    assignment: dict,
+    standards_by_id: dict,
+    standards: list,
+    rules: dict,
+    client: "AsyncOpenAI",
+    model: str,
+    plan_id: str,
+    generation_logger: GenerationLogger | None = None,
+    day_standards: list | None = None,
+    fallback_plan: dict | None = None,
+    response_task: "asyncio.Future | None" = None,
+) -> dict:
+    """Generate one day's plan on the event loop with deterministic fallbacks.
+
+    Args:
+        assignment: Dict containing `day`, `standard_ids`, and optional `focus` keys.
+        standards_by_id: Lookup of standard_id -> standard metadata.
+        standards: List of candidate standards (used for fallback selection).
+        rules: Parent preference metadata (materials, notes, etc.).
+        client: Shared AsyncOpenAI client instance.
+        model: OpenAI model name.
+        day_standards: Pre-resolved standards for the assignment, if already known.
+        fallback_plan: Precomputed fallback lesson plan, if already known.
+        response_task: Already-issued chat completion for this day's request payload
+            (see ``SPECULATIVE_SCAFFOLD_FALLBACK``); awaited instead of a new call.
+
+    Returns:
+        Dict with `day`, `lesson_plan`, `standard_id`, `standard_ids`, and `focus` keys.
+    """
+    day = assignment.get("day") or ""
+    day_focus = assignment.get("focus", "") or ""
+    if day_standards is None:
+        day_standards = _resolve_day_standards(assignment, standards_by_id, standards)
+    if fallback_plan is None:
+        fallback_plan = _create_fallback_lesson_plan(day_standards, rules)
+
+    resources_model: ResourceRequests | None = None
+    llm_request_payload = _day_plan_request_payload(day_standards, day_focus, rules, model)
+
+    templated = render_template_lesson(day_standards, rules) if USE_TEMPLATES else None
+    if templated is not None:
+        if response_task is not None:
+            _discard_task(response_task)
+        template_pattern, lesson_plan = templated
+        if generation_logger:
+            generation_logger.log_daily_response(
+                day, {"lesson_plan": lesson_plan}, source="template", source_ref=template_pattern
+            )
+        return await _finalize_day_plan(
+            day,
+            day_standards,
+            day_focus,
+            lesson_plan,
+            None,
+            plan_id,
+            generation_logger,
+        )
+
+    cache_key = (
+        lesson_plan_cache_key(day_standards, rules, model, day_focus) if LESSON_PLAN_CACHE else None
+    )
+    cached_payload = None
+    if cache_key:
+        try:
+            cached_payload = await _run_blocking(get_cached_lesson_plan, cache_key)
+        except Exception as e:  # Cache problems must never block generation
+            logger.warning("Lesson plan cache lookup failed for %s: %s", day, e)
+
+    if cached_payload is not None:
+        if response_task is not None:
+            _discard_task(response_task)
+        lesson_plan, resources_model = _extract_lesson_and_resources(cached_payload, day)
+        if generation_logger:
+            generation_logger.log_daily_response(
+                day, cached_payload, source="cache", source_ref=cache_key
+            )
+        return await _finalize_day_plan(
+            day,
+            day_standards,
+            day_focus,
+            lesson_plan,
+            resources_model,
+            plan_id,
+            generation_logger,
+        )
+
     try:
-        response = client.chat.completions.create(**llm_request_payload)
+        if response_task is not None:
+            response = await response_task
+        else:
+            response = await create_chat_completion(client, llm_request_payload)
     except Exception as e:
         if generation_logger:
             generation_logger.log_daily_llm_exchange(day, llm_request_payload, error=str(e))
             generation_logger.log_daily_error(day, "request_failed", str(e), llm_request_payload)
-        print(f"Warning: Failed to generate lesson plan for {day}: {e}")
-        lesson_plan = _create_fallback_lesson_plan(day_standards, rules)
+        logger.warning("Failed to generate lesson plan for %s: %s", day, e)
+        lesson_plan = fallback_plan
         resources_model = None
     else:
         if generation_logger:
             generation_logger.log_daily_llm_exchange(
-                day, llm_request_payload, response.model_dump()
+                day, llm_request_payload, _loggable_response(response)
             )
         response_content = response.choices[0].message.content or "{}"
         try:
-            payload = json.loads(response_content)
+            payload = fast_json.loads(response_content)
         except json.JSONDecodeError as e:
-            print(f"Warning: Failed to parse lesson plan JSON for {day}: {e}")
+            logger.warning("Failed to parse lesson plan JSON for %s: %s", day, e)
             if generation_logger:
                 generation_logger.log_daily_response(day, None, response_content, str(e))
-            lesson_plan = _create_fallback_lesson_plan(day_standards, rules)
+            lesson_plan = fallback_plan
             resources_model = None
         else:
             lesson_plan, resources_model = _extract_lesson_and_resources(payload, day)
             if generation_logger:
                 generation_logger.log_daily_response(day, payload, response_content)
+            if cache_key and isinstance(payload, dict):
+                try:
+                    await _run_blocking(store_cached_lesson_plan, cache_key, payload)
+                except Exception as e:
+                    logger.warning("Failed to cache lesson plan for %s: %s", day, e)
 
+    return await _finalize_day_plan(
+        day,
+        day_standards,
+        day_focus,
+        lesson_plan,
+        resources_model,
+        plan_id,
+        generation_logger,
+    )
+
+
+async def _finalize_day_plan(
+    day: str,
+    day_standards: list,
+    day_focus: str,
+    lesson_plan: dict,
+    resources_model: ResourceRequests | None,
+    plan_id: str,
+    generation_logger: GenerationLogger | None = None,
+) -> dict:
+    """Render requested worksheets and assemble the final payload for one day."""
     worksheet_plans: list[dict] = []
     worksheet_errors: list[dict] = []
     resources_payload: dict | None = None
@@ -661,7 +1490,10 @@ def _build_day_plan(
         worksheet_errors = [{"kind": err.kind, "message": err.message} for err in errors]
         resources_payload = resources_model.model_dump(exclude_none=True)
 
-        artifact_map, artifact_render_errors = _render_worksheet_artifacts(
+        # Rendering is blocking Pillow/disk work; keep it off the event loop so
+        # the other days' LLM calls keep progressing.
+        artifact_map, artifact_render_errors = await _run_blocking(
+            _render_worksheet_artifacts,
             plan_id,
             day,
             plans,
@@ -690,14 +1522,397 @@ def _build_day_plan(
     return day_payload
 
 
-def generate_weekly_plan(student_id: str, grade_level: int, subject: str) -> dict:
+async def _build_week_plans_concurrently(
+    daily_assignments: list[dict],
+    standards_by_id: dict,
+    standards: list,
+    rules: dict,
+    client: "AsyncOpenAI",
+    model: str,
+    plan_id: str,
+    generation_logger: GenerationLogger | None = None,
+    on_day_plan: Callable[[dict], None] | None = None,
+    response_tasks: "list[asyncio.Future | None] | None" = None,
+) -> list[dict]:
+    """Generate each day's plan with its own LLM request, running days concurrently.
+
+    ``response_tasks`` holds already-issued requests by day index (the speculative
+    scaffold fallback, or Batch API results); a day with one reuses it instead of a
+    new call.
+    """
+    response_tasks = response_tasks or []
+    # The semaphore keeps the number of in-flight LLM requests within
+    # MAX_DAILY_PLAN_THREADS.
+    semaphore = asyncio.Semaphore(_DAILY_PLAN_CONCURRENCY)
+
+    # Resolve standards and build every fallback up front so any failure below is a
+    # plain lookup rather than more work on the error path.
+    day_standards_list = [
+        _resolve_day_standards(assignment, standards_by_id, standards)
+        for assignment in daily_assignments
+    ]
+    fallbacks = [
+        _create_fallback_lesson_plan(day_standards, rules) for day_standards in day_standards_list
+    ]
+
+    async def _bounded_day_plan(idx: int, assignment: dict) -> dict:
+        async with semaphore:
+            day_payload = await asyncio.wait_for(
+                _build_day_plan(
+                    assignment,
+                    standards_by_id,
+                    standards,
+                    rules,
+                    client,
+                    model,
+                    plan_id,
+                    generation_logger,
+                    day_standards=day_standards_list[idx],
+                    fallback_plan=fallbacks[idx],
+                    response_task=response_tasks[idx] if idx < len(response_tasks) else None,
+                ),
+                DAILY_PLAN_TIMEOUT_S if DAILY_PLAN_TIMEOUT_S > 0 else None,
+            )
+        if on_day_plan:
+            on_day_plan(day_payload)
+        return day_payload
+
+    results = await asyncio.gather(
+        *(_bounded_day_plan(idx, assignment) for idx, assignment in enumerate(daily_assignments)),
+        return_exceptions=True,
+    )
+
+    daily_plan: list[dict] = []
+    for idx, result in enumerate(results):
+        if not isinstance(result, Exception):
+            daily_plan.append(result)
+            continue
+        if isinstance(result, TimeoutError):
+            result = TimeoutError(f"timed out after {DAILY_PLAN_TIMEOUT_S:g}s")
+        logger.warning("Daily plan generation failed for index %d: %s", idx, result)
+        assignment = daily_assignments[idx]
+        day = assignment.get("day") or ""
+        day_label = day or f"day_{idx+1}"
+        fallback_payload = _assemble_day_plan(
+            day, day_standards_list[idx], assignment.get("focus") or "", fallbacks[idx]
+        )
+        daily_plan.append(fallback_payload)
+        if generation_logger:
+            generation_logger.log_daily_error(day_label, "worker_exception", str(result))
+            generation_logger.log_daily_plan(day_label, fallback_payload)
+        if on_day_plan:
+            on_day_plan(fallback_payload)
+
+    return daily_plan
+
+
+async def _build_week_plans_batched(
+    daily_assignments: list[dict],
+    standards_by_id: dict,
+    standards: list,
+    rules: dict,
+    client: "AsyncOpenAI",
+    model: str,
+    plan_id: str,
+    generation_logger: GenerationLogger | None = None,
+    on_day_plan: Callable[[dict], None] | None = None,
+    plans_by_day: dict[str, dict] | None = None,
+) -> list[dict]:
+    """Generate every day's plan from a single LLM request.
+
+    Days missing from (or malformed in) the response fall back to the deterministic
+    lesson plan, mirroring the per-day path. ``plans_by_day`` holds entries that
+    were already returned (see ``SINGLE_CALL_WEEK``), in which case no request is made.
+    """
+    day_requests = [
+        {
+            "day": assignment.get("day") or f"day_{idx+1}",
+            "standards": _resolve_day_standards(assignment, standards_by_id, standards),
+            "focus": assignment.get("focus", "") or "",
+        }
+        for idx, assignment in enumerate(daily_assignments)
+    ]
+    if plans_by_day is None:
+        plans_by_day = await _request_batched_plans(
+            day_requests, rules, client, model, generation_logger
+        )
+
+    daily_plan: list[dict] = []
+    for request in day_requests:
+        day = request["day"]
+        entry = plans_by_day.get(day.strip().lower())
+        if entry is None:
+            if generation_logger:
+                generation_logger.log_daily_error(day, "batch_missing_day", "No plan in response")
+            lesson_plan = _create_fallback_lesson_plan(request["standards"], rules)
+            resources_model = None
+        else:
+            lesson_plan, resources_model = _extract_lesson_and_resources(entry, day)
+            if generation_logger:
+                generation_logger.log_daily_response(day, entry)
+        day_payload = await _finalize_day_plan(
+            day,
+            request["standards"],
+            request["focus"],
+            lesson_plan,
+            resources_model,
+            plan_id,
+            generation_logger,
+        )
+        daily_plan.append(day_payload)
+        if on_day_plan:
+            on_day_plan(day_payload)
+    return daily_plan
+
+
+async def _request_batched_plans(
+    day_requests: list[dict],
+    rules: dict,
+    client: "AsyncOpenAI",
+    model: str,
+    generation_logger: GenerationLogger | None = None,
+) -> dict[str, dict]:
+    """Request every day's lesson plan in one call; return entries by lower-cased day."""
+    prompt = create_batched_lesson_plan_prompt(day_requests, rules)
+    llm_request_payload = {
+        "model": model,
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a helpful K-12 education assistant. Always respond with valid JSON only.",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.7,
+        "response_format": {"type": "json_object"},
+    }
+
+    plans_by_day: dict[str, dict] = {}
+    try:
+        response = await create_chat_completion(client, llm_request_payload)
+    except Exception as e:
+        logger.warning("Failed to generate batched lesson plans: %s", e)
+        if generation_logger:
+            generation_logger.log_daily_batch_exchange(llm_request_payload, error=str(e))
+    else:
+        if generation_logger:
+            generation_logger.log_daily_batch_exchange(
+                llm_request_payload, _loggable_response(response)
+            )
+        response_content = response.choices[0].message.content or "{}"
+        try:
+            payload = fast_json.loads(response_content)
+        except json.JSONDecodeError as e:
+            logger.warning("Failed to parse batched lesson plan JSON: %s", e)
+        else:
+            plans_by_day = _plans_by_day(payload)
+    return plans_by_day
+
+
+def _plans_by_day(payload: Any) -> dict[str, dict]:
+    """Index a batched response's ``plans`` entries by lower-cased day name."""
+    entries = payload.get("plans") if isinstance(payload, dict) else None
+    return {
+        entry["day"].strip().lower(): entry
+        for entry in (entries if isinstance(entries, list) else [])
+        if isinstance(entry, dict) and isinstance(entry.get("day"), str)
+    }
+
+
+async def _request_full_week(
+    client: "AsyncOpenAI",
+    request_payload: dict,
+    generation_logger: GenerationLogger | None = None,
+) -> tuple[str, list[dict], dict[str, dict]] | None:
+    """Run the ``SINGLE_CALL_WEEK`` request.
+
+    Returns ``(weekly_overview, daily_assignments, plans_by_day)``, or ``None`` when the
+    call fails or does not plan every weekday, so the caller can use the two-phase path.
+    """
+    # Logged with the per-day events, so a fallback scaffold does not overwrite it.
+    try:
+        response = await create_chat_completion(client, request_payload)
+        if generation_logger:
+            generation_logger.log_daily_batch_exchange(
+                request_payload, _loggable_response(response)
+            )
+        raw_content = response.choices[0].message.content or "{}"
+        payload = fast_json.loads(raw_content)
+    except Exception as e:
+        logger.warning("Failed to generate the week in one call: %s", e)
+        if generation_logger:
+            generation_logger.log_daily_error(None, "full_week", str(e))
+        return None
+
+    plans_by_day = _plans_by_day(payload)
+    weekdays = ["monday", "tuesday", "wednesday", "thursday", "friday"]
+    if any(day not in plans_by_day for day in weekdays):
+        logger.warning("Single-call week did not plan every weekday; using the scaffold")
+        if generation_logger:
+            generation_logger.log_daily_error(None, "full_week", "missing_days")
+        return None
+
+    daily_assignments = []
+    for day in weekdays:
+        entry = plans_by_day[day]
+        standard_ids = entry.get("standard_ids")
+        daily_assignments.append(
+            {
+                "day": day.capitalize(),
+                "standard_ids": standard_ids if isinstance(standard_ids, list) else [],
+                "focus": entry.get("focus") or "",
+            }
+        )
+    weekly_overview = str(payload.get("weekly_overview") or "")
+    if generation_logger:
+        generation_logger.log_weekly_scaffold_content(
+            {"weekly_overview": weekly_overview, "daily_assignments": daily_assignments},
+            raw_content,
+        )
+    return weekly_overview, daily_assignments, plans_by_day
+
+
+async def _run_openai_batch(client: "AsyncOpenAI", payloads: dict[str, dict]) -> dict[str, Any]:
+    """Run chat completion ``payloads`` as one Batch API job; return completions by ID.
+
+    Polls with a geometric backoff. Returns only the requests that succeeded, or an
+    empty dict if the job fails, expires, or outlasts ``OPENAI_BATCH_MAX_WAIT_S``.
+    """
+    from openai.types.chat import ChatCompletion
+
+    lines = "\n".join(
+        fast_json.dumps(
+            {"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body}
+        )
+        for custom_id, body in payloads.items()
+    )
+    try:
+        input_file = await client.files.create(
+            file=("daily_plans.jsonl", lines.encode("utf-8")), purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        deadline = time.monotonic() + OPENAI_BATCH_MAX_WAIT_S
+        interval = OPENAI_BATCH_POLL_INITIAL_S
+        while batch.status not in _BATCH_TERMINAL_STATUSES:
+            if time.monotonic() >= deadline:
+                logger.warning("OpenAI batch %s still %s; cancelling", batch.id, batch.status)
+                await client.batches.cancel(batch.id)
+                return {}
+            await asyncio.sleep(interval)
+            interval = min(interval * 1.5, OPENAI_BATCH_POLL_MAX_S)
+            batch = await client.batches.retrieve(batch.id)
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.warning("OpenAI batch %s ended as %s", batch.id, batch.status)
+            return {}
+        output = await client.files.content(batch.output_file_id)
+    except Exception as e:
+        logger.warning("OpenAI batch request failed: %s", e)
+        return {}
+
+    completions: dict[str, Any] = {}
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        # A bad line only loses its own request; the caller re-sends missing IDs directly.
+        try:
+            record = fast_json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") == 200:
+                completions[record["custom_id"]] = ChatCompletion.model_validate(response["body"])
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            logger.warning("Skipping unreadable OpenAI batch output line: %s", e)
+    return completions
+
+
+async def _uncached_day_request(
+    assignment: dict, standards_by_id: dict, standards: list, rules: dict, model: str
+) -> dict[str, Any] | None:
+    """Return a day's chat completion payload, or ``None`` if a template or cache serves it."""
+    day_standards = _resolve_day_standards(assignment, standards_by_id, standards)
+    if USE_TEMPLATES and render_template_lesson(day_standards, rules) is not None:
+        return None
+    day_focus = assignment.get("focus") or ""
+    if LESSON_PLAN_CACHE:
+        cache_key = lesson_plan_cache_key(day_standards, rules, model, day_focus)
+        try:
+            if await _run_blocking(get_cached_lesson_plan, cache_key) is not None:
+                return None
+        except Exception as e:  # Cache problems must never block generation
+            logger.warning("Lesson plan cache lookup failed for %s: %s", assignment.get("day"), e)
+    return _day_plan_request_payload(day_standards, day_focus, rules, model)
+
+
+async def _early_day_response(
+    assignment: dict,
+    standards_by_id: dict,
+    standards: list,
+    rules: dict,
+    client: "AsyncOpenAI",
+    model: str,
+) -> Any:
+    """Issue a streamed-in day's request ahead of the week fan-out (``STREAM_SCAFFOLD``)."""
+    payload = await _uncached_day_request(assignment, standards_by_id, standards, rules, model)
+    if payload is None:
+        return None  # _build_day_plan serves the day without a call and drops this task.
+    return await create_chat_completion(client, payload)
+
+
+async def _batch_api_day_responses(
+    daily_assignments: list[dict],
+    standards_by_id: dict,
+    standards: list,
+    rules: dict,
+    client: "AsyncOpenAI",
+    model: str,
+) -> list[asyncio.Future | None]:
+    """Fetch the week's day requests through one Batch API job (``USE_OPENAI_BATCH``).
+
+    Returns one resolved future per day for ``_build_week_plans_concurrently``. Days
+    served by a template or the lesson-plan cache are left out of the job, and days the
+    job did not return get ``None`` so they fall back to a direct call.
+    """
+    payloads: dict[str, dict] = {}
+    for idx, assignment in enumerate(daily_assignments):
+        payload = await _uncached_day_request(assignment, standards_by_id, standards, rules, model)
+        if payload is not None:
+            payloads[f"day_{idx}"] = payload
+
+    completions = await _run_openai_batch(client, payloads) if payloads else {}
+    loop = asyncio.get_running_loop()
+    response_tasks: list[asyncio.Future | None] = []
+    for idx in range(len(daily_assignments)):
+        completion = completions.get(f"day_{idx}")
+        if completion is None:
+            response_tasks.append(None)
+            continue
+        future = loop.create_future()
+        future.set_result(completion)
+        response_tasks.append(future)
+    return response_tasks
+
+
+async def generate_weekly_plan_async(
+    student_id: str,
+    grade_level: int,
+    subject: str,
+    on_day_plan: Callable[[dict], None] | None = None,
+) -> dict:
     """
     Generate a weekly lesson plan for a student using LLM.
 
+    The scaffold call runs first; the five daily lesson-plan calls are then issued
+    concurrently so total latency tracks the slowest day rather than the sum.
+
     Args:
         student_id: Unique identifier for the student
         grade_level: Grade level for the standards
         subject: Subject area (may be overridden by theme rules)
+        on_day_plan: Optional callback invoked with each day's payload as soon as that
+            day is assembled (completion order, not weekday order)
 
     Returns:
         A dictionary containing the complete weekly plan with daily lesson plans
@@ -714,88 +1929,110 @@ def generate_weekly_plan(student_id: str, grade_level: int, subject: str) -> dic
     base_url = os.environ.get("OPENAI_BASE_URL", None)
     model = os.environ.get("OPENAI_MODEL", "gpt-3.5-turbo")
 
-    # Initialize OpenAI client. The official SDK client is stateless and thread-safe,
-    # so we reuse a single instance across the executor workers below.
-    client = OpenAI(api_key=api_key, base_url=base_url)
+    # Reuse the event loop's OpenAI client so the scaffold call, the concurrent daily
+    # calls, and later requests all share one warm connection pool.
+    client = _get_async_client(api_key, base_url)
 
     # Get student profile and parse rules
-    student_profile = get_student_profile(student_id)
+    # SQLite helpers block, so they run in worker threads to keep the event loop free
+    # for other requests and the concurrent LLM calls.
+    student_profile = await _run_blocking(get_student_profile, student_id)
     if student_profile is None:
         raise ValueError(f"Student with id '{student_id}' not found")
 
     # Parse plan_rules_blob to get rules
-    rules = json.loads(student_profile["plan_rules_blob"] or "{}")
+    rules = fast_json.loads(student_profile["plan_rules_blob"] or "{}")
 
     # Get standards for the student. We request more than 5 to have flexibility
     # in how they're distributed across the week. Some complex standards may need
     # multiple days, while simpler ones can be covered in a single day.
-    standards = get_filtered_standards(student_id, grade_level, subject, limit=10)
+    standards = await _run_blocking(
+        get_filtered_standards,
+        student_id,
+        grade_level,
+        subject,
+        limit=10,
+        student_profile=student_profile,
+    )
 
     if len(standards) == 0:
         raise ValueError(f"No standards found for student {student_id}.")
 
+    # One clock reading for the cooldown check, the run log ID and the plan's week.
+    now = datetime.now(UTC)
+
     # Filter standards by cooldown (feedback mechanism)
     # Only include standards that have completed their cooldown period
     try:
-        from feedback_processor import is_standard_eligible
-
-        progress = json.loads(student_profile.get("progress_blob") or "{}")
+        progress = fast_json.loads(student_profile.get("progress_blob") or "{}")
         standard_metadata = progress.get("standard_metadata", {})
-        current_time = datetime.now(UTC).isoformat().replace("+00:00", "Z")
+        current_time = now.isoformat().replace("+00:00", "Z")
 
+        # Standards never seen before have no metadata and are always eligible; only
+        # call out (and parse dates) for the ones with a recorded cooldown.
         eligible_standards = [
             s
             for s in standards
-            if is_standard_eligible(standard_metadata.get(s.get("standard_id"), {}), current_time)
+            if not (metadata := standard_metadata.get(s.get("standard_id")))
+            or is_standard_eligible(metadata, current_time)
         ]
 
         # If filtering removed all standards, log warning and use all standards
         if not eligible_standards:
-            print(
-                f"Warning: All standards in cooldown for {student_id}. Using all standards anyway."
+            logger.warning(
+                "All standards in cooldown for %s. Using all standards anyway.", student_id
             )
             eligible_standards = standards
 
         standards = eligible_standards
     except Exception as e:
         # If cooldown filtering fails, continue with all standards
-        print(f"Warning: Failed to filter by cooldown: {e}. Using all standards.")
+        logger.warning("Failed to filter by cooldown: %s. Using all standards.", e)
 
-    generation_logger = GenerationLogger(student_id, grade_level, subject)
+    generation_logger = GenerationLogger(student_id, grade_level, subject, now=now)
+    # Set once the success path has closed the run log itself.
+    run_log_closed = False
+    try:
+        week_of = _current_week_of(now)
+        plan_id = f"plan_{student_id}_{week_of}"
+
+        # Read each standard's ID once; the preview, fallback assignments and padding below
+        # all index into this list instead of going back to the dicts.
+        standard_ids = [s.get("standard_id") for s in standards]
+        standards_by_id = _standards_by_id(standards)
+
+        # Precompute a pretty JSON preview of the first few standards for the prompt
+        available_standards_preview = [
+            {"id": standard_id, "description": s.get("description")}
+            for standard_id, s in zip(standard_ids[:5], standards, strict=False)
+        ]
+        available_standards_text = fast_json.dumps_indented(available_standards_preview).decode(
+            "utf-8"
+        )
 
-    today = datetime.now(UTC)
-    monday = today - timedelta(days=today.weekday())
-    week_of = monday.strftime("%Y-%m-%d")
-    plan_id = f"plan_{student_id}_{week_of}"
+        # Get activity bias from quantity feedback
+        quantity_prefs = rules.get("quantity_preferences", {})
+        activity_bias = quantity_prefs.get("activity_bias", 0.0)
 
-    # Precompute a pretty JSON preview of the first few standards for the prompt
-    available_standards_preview = [
-        {"id": s.get("standard_id"), "description": s.get("description")} for s in standards[:5]
-    ]
-    available_standards_text = json.dumps(available_standards_preview, indent=2)
-
-    # Get activity bias from quantity feedback
-    quantity_prefs = rules.get("quantity_preferences", {})
-    activity_bias = quantity_prefs.get("activity_bias", 0.0)
-
-    # Calculate suggested base activity count (default ~3 per day)
-    base_activities = 3
-    adjusted_activities = int(base_activities * (1 + activity_bias * 0.5))
-    adjusted_activities = max(1, min(adjusted_activities, 6))  # Clamp to [1, 6]
-
-    # Build activity guidance based on bias
-    if activity_bias < -0.1:
-        activity_guidance = f"Each day should have approximately {adjusted_activities} activities (parent feedback indicates lessons should be shorter)."
-    elif activity_bias > 0.1:
-        activity_guidance = f"Each day should have approximately {adjusted_activities} activities (parent feedback indicates more content is desired)."
-    else:
-        activity_guidance = f"Each day should have approximately {adjusted_activities} activities."
+        # Calculate suggested base activity count (default ~3 per day)
+        base_activities = 3
+        adjusted_activities = int(base_activities * (1 + activity_bias * 0.5))
+        adjusted_activities = max(1, min(adjusted_activities, 6))  # Clamp to [1, 6]
 
-    # First pass: Create a weekly overview/scaffold
-    # This helps ensure complex standards get multiple days if needed
-    scaffold_prompt = f"""You are an expert K-12 educator creating a weekly lesson plan scaffold.
+        # Build activity guidance based on bias
+        if activity_bias < -0.1:
+            activity_guidance = f"Each day should have approximately {adjusted_activities} activities (parent feedback indicates lessons should be shorter)."
+        elif activity_bias > 0.1:
+            activity_guidance = f"Each day should have approximately {adjusted_activities} activities (parent feedback indicates more content is desired)."
+        else:
+            activity_guidance = (
+                f"Each day should have approximately {adjusted_activities} activities."
+            )
 
-Grade Level: {grade_level}
+        # First pass: Create a weekly overview/scaffold
+        # This helps ensure complex standards get multiple days if needed
+        # Static instructions first, so every scaffold request shares one prompt prefix.
+        week_details = f"""Grade Level: {grade_level}
 Subject: {subject}
 
 Available Standards (may use 1 or more):
@@ -805,109 +2042,189 @@ Parent Constraints:
 - Allowed materials: {rules.get('allowed_materials', [])}
 - Parent guidance: {rules.get('parent_notes', 'keep procedures under 3 steps')}
 
-Create a weekly plan that:
-1. Distributes standards across Monday-Friday appropriately
-2. Complex standards should span multiple days with scaffolding
-3. Simpler standards can be covered in a single day
-4. Each day should build on previous days
-5. {activity_guidance}
-
-Respond with a JSON object in this exact format:
-{{
-  "weekly_overview": "Brief description of how the week progresses",
-  "daily_assignments": [
-    {{
-      "day": "Monday",
-      "standard_ids": ["standard_id_1"],
-      "focus": "Brief description of this day's focus"
-    }},
-    ...
-  ]
-}}"""
+Activity guidance: {activity_guidance}"""
+        scaffold_prompt = f"{SCAFFOLD_INSTRUCTIONS}\n{week_details}"
 
-    scaffold_messages = [
-        {
-            "role": "system",
-            "content": "You are a helpful K-12 education assistant. Always respond with valid JSON only.",
-        },
-        {"role": "user", "content": scaffold_prompt},
-    ]
-    scaffold_request_payload = {
-        "model": model,
-        "messages": scaffold_messages,
-        "temperature": 0.7,
-        "response_format": {"type": "json_object"},
-    }
-
-    scaffold_raw_content = ""
-    try:
-        scaffold_response = client.chat.completions.create(**scaffold_request_payload)
-        scaffold_dump = scaffold_response.model_dump()
-        scaffold_raw_content = scaffold_response.choices[0].message.content or "{}"
-        generation_logger.log_weekly_scaffold_exchange(scaffold_request_payload, scaffold_dump)
-        weekly_scaffold = json.loads(scaffold_raw_content)
-    except json.JSONDecodeError as e:
-        print(f"Warning: Failed to parse scaffold JSON: {e}")
-        generation_logger.log_weekly_scaffold_content(None, scaffold_raw_content, str(e))
-        weekly_overview = "Weekly plan using standard curriculum progression"
-        daily_assignments = [
+        scaffold_messages = [
             {
-                "day": day,
-                "standard_ids": [standards[i].get("standard_id")],
-                "focus": f"Day {i+1} focus",
-            }
-            for i, day in enumerate(["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"])
-            if i < len(standards)
+                "role": "system",
+                "content": "You are a helpful K-12 education assistant. Always respond with valid JSON only.",
+            },
+            {"role": "user", "content": scaffold_prompt},
         ]
-    except Exception as e:
-        print(f"Warning: Failed to generate scaffold: {e}")
-        generation_logger.log_weekly_scaffold_exchange(scaffold_request_payload, error=str(e))
-        generation_logger.log_weekly_scaffold_content(None, scaffold_raw_content or "", str(e))
-        weekly_overview = "Weekly plan using standard curriculum progression"
-        daily_assignments = [
+        scaffold_request_payload = {
+            "model": model,
+            "messages": scaffold_messages,
+            "temperature": 0.7,
+            "response_format": (
+                _SCAFFOLD_RESPONSE_FORMAT if STRUCTURED_SCAFFOLD_OUTPUT else {"type": "json_object"}
+            ),
+        }
+
+        # One standard per day, used if the scaffold call fails or returns invalid JSON.
+        fallback_assignments = [
             {
                 "day": day,
-                "standard_ids": [standards[i].get("standard_id")],
+                "standard_ids": [standard_id],
                 "focus": f"Day {i+1} focus",
             }
-            for i, day in enumerate(["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"])
-            if i < len(standards)
+            for i, (day, standard_id) in enumerate(
+                zip(
+                    ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
+                    standard_ids,
+                    strict=False,
+                )
+            )
         ]
-    else:
-        generation_logger.log_weekly_scaffold_content(weekly_scaffold, scaffold_raw_content)
-        daily_assignments = weekly_scaffold.get("daily_assignments", [])
-        weekly_overview = weekly_scaffold.get("weekly_overview", "")
-
-    # Ensure we have exactly 5 days
-    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-    if len(daily_assignments) != 5:
-        # Adjust to exactly 5 days
-        while len(daily_assignments) < 5:
-            daily_assignments.append(
-                {
-                    "day": days[len(daily_assignments)],
-                    "standard_ids": [
-                        standards[min(len(daily_assignments), len(standards) - 1)].get(
-                            "standard_id"
-                        )
-                    ],
-                    "focus": "Additional practice",
-                }
+        skip_scaffold = SKIP_SCAFFOLD_LLM and len(standards) == 5 and -0.1 <= activity_bias <= 0.1
+        scaffold_key = (
+            scaffold_cache_key(scaffold_request_payload)
+            if LESSON_PLAN_CACHE and not skip_scaffold
+            else None
+        )
+        cached_scaffold = None
+        if scaffold_key:
+            try:
+                cached_scaffold = await _run_blocking(get_cached_lesson_plan, scaffold_key)
+            except Exception as e:  # Cache problems must never block generation
+                logger.warning("Scaffold cache lookup failed for %s: %s", student_id, e)
+        stream_scaffold = STREAM_SCAFFOLD and not BATCH_DAILY_PLANS and not USE_OPENAI_BATCH
+        single_call = (
+            SINGLE_CALL_WEEK
+            and not skip_scaffold
+            and cached_scaffold is None
+            and not BATCH_DAILY_PLANS
+            and not USE_OPENAI_BATCH
+        )
+        # Lesson entries already returned by the single-call week request, by day.
+        single_call_plans: dict[str, dict] | None = None
+        # (assignment, task) for each day whose request was issued while the scaffold streamed.
+        early_day_tasks: list[tuple[dict, asyncio.Task]] = []
+
+        def _start_streamed_day(assignment: dict) -> None:
+            if len(early_day_tasks) < 5:
+                task = asyncio.create_task(
+                    _early_day_response(
+                        assignment, standards_by_id, standards, rules, client, model
+                    )
+                )
+                early_day_tasks.append((assignment, task))
+
+        speculative_task = None
+        if (
+            not skip_scaffold
+            and cached_scaffold is None
+            and not stream_scaffold
+            and not single_call
+            and SPECULATIVE_SCAFFOLD_FALLBACK
+            and not BATCH_DAILY_PLANS
+            and not USE_OPENAI_BATCH
+            and not (USE_TEMPLATES and render_template_lesson(standards[:1], rules))
+        ):
+            # Request the fallback Monday alongside the scaffold so a scaffold failure does
+            # not add another round trip; the request is cancelled if the scaffold succeeds.
+            speculative_task = asyncio.create_task(
+                create_chat_completion(
+                    client,
+                    _day_plan_request_payload(
+                        standards[:1], fallback_assignments[0]["focus"], rules, model
+                    ),
+                )
             )
-        daily_assignments = daily_assignments[:5]
 
-    # Create a lookup for standards by ID
-    standards_by_id = {s.get("standard_id"): s for s in standards}
+        full_week = None
+        if single_call:
+            full_week_payload = {
+                **scaffold_request_payload,
+                "messages": [
+                    scaffold_messages[0],
+                    {"role": "user", "content": f"{FULL_WEEK_INSTRUCTIONS}\n{week_details}"},
+                ],
+                # The strict scaffold schema would force a scaffold-shaped reply here.
+                "response_format": {"type": "json_object"},
+            }
+            full_week = await _request_full_week(client, full_week_payload, generation_logger)
 
-    # Build daily plan concurrently based on scaffold
-    max_workers = max(1, min(len(daily_assignments), MAX_DAILY_PLAN_THREADS))
-    daily_plan: list[dict] = [{} for _ in daily_assignments]
+        if skip_scaffold:
+            daily_assignments = fallback_assignments
+            weekly_overview = (
+                f"{subject} week of {week_of}: one standard per day "
+                f"({', '.join(str(standard_id) for standard_id in standard_ids)})"
+            )
+            generation_logger.log_weekly_scaffold_content(
+                {"weekly_overview": weekly_overview, "daily_assignments": daily_assignments}, ""
+            )
+        elif cached_scaffold is not None:
+            generation_logger.log_weekly_scaffold_content(cached_scaffold, "")
+            daily_assignments = cached_scaffold.get("daily_assignments", [])
+            weekly_overview = cached_scaffold.get("weekly_overview", "")
+        elif full_week is not None:
+            weekly_overview, daily_assignments, single_call_plans = full_week
+        else:
+            scaffold_raw_content = ""
+            try:
+                if stream_scaffold:
+                    scaffold_raw_content, scaffold_response = await _stream_scaffold(
+                        client, scaffold_request_payload, _start_streamed_day
+                    )
+                    scaffold_raw_content = scaffold_raw_content or "{}"
+                else:
+                    scaffold_response = await create_chat_completion(
+                        client, scaffold_request_payload
+                    )
+                    scaffold_raw_content = scaffold_response.choices[0].message.content or "{}"
+                generation_logger.log_weekly_scaffold_exchange(
+                    scaffold_request_payload, _loggable_response(scaffold_response)
+                )
+                weekly_scaffold = fast_json.loads(scaffold_raw_content)
+            except json.JSONDecodeError as e:
+                logger.warning("Failed to parse scaffold JSON: %s", e)
+                generation_logger.log_weekly_scaffold_content(None, scaffold_raw_content, str(e))
+                weekly_overview = "Weekly plan using standard curriculum progression"
+                daily_assignments = fallback_assignments
+            except Exception as e:
+                logger.warning("Failed to generate scaffold: %s", e)
+                generation_logger.log_weekly_scaffold_exchange(
+                    scaffold_request_payload, error=str(e)
+                )
+                generation_logger.log_weekly_scaffold_content(
+                    None, scaffold_raw_content or "", str(e)
+                )
+                weekly_overview = "Weekly plan using standard curriculum progression"
+                daily_assignments = fallback_assignments
+            else:
+                generation_logger.log_weekly_scaffold_content(weekly_scaffold, scaffold_raw_content)
+                daily_assignments = weekly_scaffold.get("daily_assignments", [])
+                weekly_overview = weekly_scaffold.get("weekly_overview", "")
+                if scaffold_key and isinstance(daily_assignments, list) and daily_assignments:
+                    try:
+                        await _run_blocking(store_cached_lesson_plan, scaffold_key, weekly_scaffold)
+                    except Exception as e:
+                        logger.warning("Failed to cache scaffold for %s: %s", student_id, e)
+
+        if speculative_task is not None and daily_assignments is not fallback_assignments:
+            _discard_task(speculative_task)
+            speculative_task = None
+
+        # Ensure we have exactly 5 days
+        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+        if len(daily_assignments) != 5:
+            # Pad missing days with the next unused standard (repeating the last one),
+            # then drop any extras.
+            last_index = len(standard_ids) - 1
+            for idx in range(len(daily_assignments), 5):
+                daily_assignments.append(
+                    {
+                        "day": days[idx],
+                        "standard_ids": [standard_ids[min(idx, last_index)]],
+                        "focus": "Additional practice",
+                    }
+                )
+            del daily_assignments[5:]
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_map = {
-            executor.submit(
-                _build_day_plan,
-                assignment,
+        if BATCH_DAILY_PLANS or single_call_plans is not None:
+            daily_plan = await _build_week_plans_batched(
+                daily_assignments,
                 standards_by_id,
                 standards,
                 rules,
@@ -915,51 +2232,172 @@ Respond with a JSON object in this exact format:
                 model,
                 plan_id,
                 generation_logger,
-            ): idx
-            for idx, assignment in enumerate(daily_assignments)
+                on_day_plan,
+                plans_by_day=single_call_plans,
+            )
+        else:
+            if USE_OPENAI_BATCH:
+                response_tasks = await _batch_api_day_responses(
+                    daily_assignments, standards_by_id, standards, rules, client, model
+                )
+            elif early_day_tasks:
+                # Use a streamed-in request only if the final scaffold kept that assignment.
+                response_tasks = []
+                for idx, (assignment, task) in enumerate(early_day_tasks):
+                    if idx < len(daily_assignments) and daily_assignments[idx] == assignment:
+                        response_tasks.append(task)
+                    else:
+                        _discard_task(task)
+                        response_tasks.append(None)
+            else:
+                response_tasks = [speculative_task] if speculative_task is not None else None
+            daily_plan = await _build_week_plans_concurrently(
+                daily_assignments,
+                standards_by_id,
+                standards,
+                rules,
+                client,
+                model,
+                plan_id,
+                generation_logger,
+                on_day_plan,
+                response_tasks=response_tasks,
+            )
+
+        # Construct the final weekly plan
+        weekly_plan = {
+            "plan_id": plan_id,
+            "student_id": student_id,
+            "grade_level": grade_level,
+            "subject": subject,
+            "week_of": week_of,
+            "weekly_overview": weekly_overview,
+            "standards": {
+                standard_id: standards_by_id[standard_id]
+                for day_payload in daily_plan
+                for standard_id in day_payload.get("standard_ids", [])
+                if standard_id in standards_by_id
+            },
+            "daily_plan": daily_plan,
         }
 
-        for future in as_completed(future_map):
-            idx = future_map[future]
+        def _finish_run_log() -> None:
             try:
-                daily_plan[idx] = future.result()
-            except Exception as e:
-                print(f"Warning: Daily plan generation failed for index {idx}: {e}")
-                assignment = daily_assignments[idx]
-                day_standards = _resolve_day_standards(assignment, standards_by_id, standards)
-                fallback_plan = _create_fallback_lesson_plan(day_standards, rules)
-                day_label = assignment.get("day") or f"day_{idx+1}"
-                fallback_payload = _assemble_day_plan(
-                    assignment.get("day") or "",
-                    day_standards,
-                    assignment.get("focus", "") or "",
-                    fallback_plan,
-                    None,
-                    None,
-                    None,
-                )
-                daily_plan[idx] = fallback_payload
-                if generation_logger:
-                    generation_logger.log_daily_error(day_label, "worker_exception", str(e))
-                    generation_logger.log_daily_plan(day_label, fallback_payload)
-
-    # Construct the final weekly plan
-    weekly_plan = {
-        "plan_id": plan_id,
-        "student_id": student_id,
-        "grade_level": grade_level,
-        "subject": subject,
-        "week_of": week_of,
-        "weekly_overview": weekly_overview,
-        "daily_plan": daily_plan,
-    }
-
-    generation_logger.log_weekly_plan(weekly_plan)
+                generation_logger.log_weekly_plan(weekly_plan)
+            finally:
+                generation_logger.close()
+
+        # The run log and the packet rows are independent writes; overlap them.
+        log_result, save_result = await asyncio.gather(
+            _run_blocking(_finish_run_log),
+            _run_blocking(save_weekly_packet, weekly_plan),
+            return_exceptions=True,
+        )
+        run_log_closed = True
+        if isinstance(save_result, Exception):  # pragma: no cover - relies on sqlite errors
+            logger.error("Failed to persist weekly packet %s", plan_id, exc_info=save_result)
+            raise save_result
+        if isinstance(log_result, Exception):
+            raise log_result
+
+        return weekly_plan
+    finally:
+        # Failed and cancelled runs (e.g. a disconnected stream client) are the ones whose
+        # logs matter most, so their queued writes must still reach disk.
+        if not run_log_closed:
+            generation_logger.close_in_background()
+
+
+async def iter_weekly_plan_events(
+    student_id: str, grade_level: int, subject: str
+) -> AsyncIterator[dict]:
+    """
+    Generate a weekly plan, yielding progress events as they become available.
 
+    Yields ``{"event": "day", "day": ..., "plan": <day payload>}`` as each daily plan
+    finishes, then a final ``{"event": "plan", "plan": <weekly plan>}``. Errors are
+    surfaced as ``{"event": "error", "status": 400|500, "detail": ...}`` because the
+    response status has already been sent by the time they occur.
+    """
+    queue: asyncio.Queue[dict] = asyncio.Queue()
+    task = asyncio.create_task(
+        generate_weekly_plan_async(
+            student_id,
+            grade_level,
+            subject,
+            on_day_plan=lambda day_payload: queue.put_nowait(day_payload),
+        )
+    )
     try:
-        save_weekly_packet(weekly_plan)
-    except Exception as exc:  # pragma: no cover - relies on sqlite errors
-        print(f"Error: Failed to persist weekly packet {plan_id}: {exc}")
-        raise
+        while True:
+            getter = asyncio.ensure_future(queue.get())
+            done, _pending = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                day_payload = getter.result()
+                yield {"event": "day", "day": day_payload.get("day"), "plan": day_payload}
+                continue
+            getter.cancel()
+            break
 
-    return weekly_plan
+        while not queue.empty():
+            day_payload = queue.get_nowait()
+            yield {"event": "day", "day": day_payload.get("day"), "plan": day_payload}
+
+        try:
+            weekly_plan = task.result()
+        except ValueError as exc:
+            yield {"event": "error", "status": 400, "detail": str(exc)}
+        except Exception as exc:
+            yield {"event": "error", "status": 500, "detail": f"Error generating plan: {exc}"}
+        else:
+            yield {"event": "plan", "plan": weekly_plan}
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+def generate_weekly_plan(student_id: str, grade_level: int, subject: str) -> dict:
+    """Synchronous wrapper around :func:`generate_weekly_plan_async`.
+
+    Kept for callers that run outside an event loop (background tasks, scripts).
+    """
+
+    async def _run() -> dict:
+        try:
+            return await generate_weekly_plan_async(student_id, grade_level, subject)
+        finally:
+            # asyncio.run() discards the loop, so release the client's connections with it.
+            await _close_async_client()
+
+    return asyncio.run(_run())
+
+
+def generate_weekly_plans(
+    requests: list[dict], return_exceptions: bool = False
+) -> list[dict | BaseException]:
+    """Generate several weekly plans concurrently on a single event loop.
+
+    Every plan shares one ``AsyncOpenAI`` client, so all of their daily calls draw from
+    the same connection pool. Each request holds ``student_id``, ``grade_level`` and
+    ``subject``. Every plan runs to completion (and is saved) even if another fails.
+    Results come back in request order. With ``return_exceptions`` a failed plan's
+    exception takes its place; otherwise the first failure is raised once all settle.
+    """
+
+    async def _run() -> list[dict | BaseException]:
+        try:
+            return list(
+                await asyncio.gather(
+                    *(generate_weekly_plan_async(**request) for request in requests),
+                    return_exceptions=True,
+                )
+            )
+        finally:
+            await _close_async_client()
+
+    results = asyncio.run(_run())
+    if not return_exceptions:
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+    return results
@@ -14,6 +14,13 @@ import sqlite3
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_FILE = os.environ.get("CURRICULUM_DB_PATH", os.path.join(PROJECT_ROOT, "curriculum.db"))
 
+# Composite index backing get_filtered_standards' WHERE grade_level = ? AND
+# LOWER(subject) = ? AND standard_id NOT IN (...) lookup.
+STANDARDS_LOOKUP_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_standards_grade_subject "
+    "ON standards(grade_level, LOWER(subject), standard_id)"
+)
+
 # Cache for column existence check to avoid repeated PRAGMA queries
 _metadata_column_cache: dict[str, bool] = {}
 
@@ -297,6 +304,10 @@ def ensure_database_initialized() -> None:
             conn.close()
             ingest_main()
             return
+
+        # Databases created before the lookup index existed get it on startup.
+        cursor.execute(STANDARDS_LOOKUP_INDEX_SQL)
+        conn.commit()
     finally:
         try:
             conn.close()
@@ -0,0 +1,43 @@
+"""JSON helpers that use orjson when it is installed and fall back to the stdlib.
+
+``loads`` raises ``json.JSONDecodeError`` in both cases (``orjson.JSONDecodeError``
+subclasses it), so callers keep their existing ``except json.JSONDecodeError`` blocks.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:  # Optional: 2-5x faster parsing/serialization
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
+
+def loads(data: str | bytes | bytearray) -> Any:
+    """Parse a JSON document."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any) -> str:
+    """Serialize ``value`` to compact JSON text, keeping non-ASCII characters as-is."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode("utf-8")
+        except TypeError:
+            # orjson rejects non-str keys and some subclasses the stdlib accepts.
+            pass
+    return json.dumps(value, ensure_ascii=False)
+
+
+def dumps_indented(value: Any) -> bytes:
+    """Serialize ``value`` to 2-space indented UTF-8 JSON (for log files and prompts)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+    return json.dumps(value, indent=2, ensure_ascii=False).encode("utf-8")
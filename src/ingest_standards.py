@@ -12,8 +12,14 @@ It also ingests JSON files from a specified directory into the standards table.
 import sqlite3
 import json
 import os
+import sys
 import glob
 
+try:  # Prefer package-relative import when available
+    from .db_utils import STANDARDS_LOOKUP_INDEX_SQL
+except ImportError:  # Fallback for direct script execution
+    from db_utils import STANDARDS_LOOKUP_INDEX_SQL  # type: ignore
+
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_FILE = os.environ.get("CURRICULUM_DB_PATH", os.path.join(PROJECT_ROOT, "curriculum.db"))
@@ -39,6 +45,9 @@ def create_database():
     """
     )
 
+    # Index the (grade, case-insensitive subject) lookup used by get_filtered_standards
+    cursor.execute(STANDARDS_LOOKUP_INDEX_SQL)
+
     # Create student_profiles table
     cursor.execute(
         """
@@ -116,9 +125,17 @@ def ingest_standards_from_json(directory):
             print(f"Error processing {json_file}: {e}")
 
     conn.commit()
+    # Refresh planner statistics after the bulk load so the lookup index is used
+    conn.execute("ANALYZE")
     conn.close()
     print(f"Ingested {total_inserted} standards into the database.")
 
+    # Drop standards queries memoized by a server running in this process.
+    for module_name in ("logic", "src.logic"):
+        logic_module = sys.modules.get(module_name)
+        if logic_module is not None and hasattr(logic_module, "clear_standards_cache"):
+            logic_module.clear_standards_cache()
+
 
 def insert_dummy_student():
     """Insert a dummy student profile into the student_profiles table."""
@@ -0,0 +1,60 @@
+"""Deterministic lesson-plan templates that can replace the LLM call for a standard.
+
+Some standards (e.g. fixed early-grade fluency skills) produce lesson plans whose shape
+is fully determined by the standard and the parent rules. Registering a template for
+them lets plan generation skip the LLM call for that day entirely.
+
+Templates are keyed by ``fnmatch`` patterns on ``standard_id``. The most specific
+pattern (the longest one) wins:
+
+    @register_template("VA.MATH.K.*")
+    def kindergarten_math(standard: dict, rules: dict) -> dict:
+        return {"objective": ..., "materials_needed": [...], "procedure": [...]}
+"""
+
+from __future__ import annotations
+
+from fnmatch import fnmatchcase
+from typing import Callable
+
+LessonTemplate = Callable[[dict, dict], dict]
+
+# No templates ship by default: LLM lessons are richer, so deployments opt standards
+# in explicitly via register_template().
+TEMPLATES: dict[str, LessonTemplate] = {}
+
+
+def register_template(pattern: str) -> Callable[[LessonTemplate], LessonTemplate]:
+    """Decorator registering ``func`` as the template for standards matching ``pattern``."""
+
+    def _decorator(func: LessonTemplate) -> LessonTemplate:
+        TEMPLATES[pattern] = func
+        return func
+
+    return _decorator
+
+
+def match_template(standard: dict) -> tuple[str, LessonTemplate] | None:
+    """Return ``(pattern, template)`` for the most specific match, or ``None``."""
+    standard_id = str(standard.get("standard_id") or "")
+    if not standard_id or not TEMPLATES:
+        return None
+    matches = [pattern for pattern in TEMPLATES if fnmatchcase(standard_id, pattern)]
+    if not matches:
+        return None
+    pattern = max(matches, key=len)
+    return pattern, TEMPLATES[pattern]
+
+
+def render_template_lesson(day_standards: list, rules: dict) -> tuple[str, dict] | None:
+    """Build a lesson plan from a template when the day covers one templated standard."""
+    if len(day_standards) != 1:
+        return None
+    matched = match_template(day_standards[0])
+    if matched is None:
+        return None
+    pattern, template = matched
+    lesson_plan = template(day_standards[0], rules)
+    if not isinstance(lesson_plan, dict):
+        return None
+    return pattern, lesson_plan
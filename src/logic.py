@@ -5,10 +5,17 @@ Rules Engine for selecting educational standards based on student progress and p
 """
 
 from db_utils import get_student_profile
+
+try:  # Prefer package-relative import when available
+    from . import fast_json
+except ImportError:  # Fallback for direct script execution
+    import fast_json  # type: ignore
 import os
 import sys
 import sqlite3
-import json
+import threading
+import time
+from functools import lru_cache
 
 # Add src directory to path for imports
 sys.path.insert(0, os.path.dirname(__file__))
@@ -18,18 +25,118 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_FILE = os.environ.get("CURRICULUM_DB_PATH", os.path.join(PROJECT_ROOT, "curriculum.db"))
 
 
+# Columns returned by get_filtered_standards. json_blob (the raw source record) is
+# left out: plan generation never reads it and it is the largest column.
+DEFAULT_STANDARD_COLUMNS = ("standard_id", "source", "subject", "grade_level", "description")
+_STANDARD_COLUMNS = frozenset(DEFAULT_STANDARD_COLUMNS + ("json_blob",))
+
+# Memoized standards queries expire after this many seconds, so rows written by another
+# process (e.g. the ingest script) eventually show up without a restart. 0 keeps them
+# until clear_standards_cache() is called.
+STANDARDS_CACHE_TTL_S = float(os.environ.get("STANDARDS_CACHE_TTL_S", "300"))
+
+# Above this many mastered standards the filter switches from NOT IN to a temp-table
+# anti-join.
+MASTERED_ANTI_JOIN_THRESHOLD = 50
+
+# One long-lived connection per thread: sqlite3 connections must not be used from
+# several threads at once, but reopening the file on every request is wasteful.
+_thread_local = threading.local()
+
+
 def _connect_db():
     """
-    Private helper function to connect to curriculum.db.
+    Private helper returning this thread's persistent connection to curriculum.db.
+
+    The connection is opened lazily in autocommit mode with WAL journaling (so readers
+    do not block the packet writer) and ``sqlite3.Row`` rows. If ``DB_FILE`` changes,
+    the old connection is closed and a new one is opened.
 
     Returns:
         sqlite3.Connection: A connection object to the database
     """
-    return sqlite3.connect(DB_FILE)
+    conn = getattr(_thread_local, "conn", None)
+    if conn is None or getattr(_thread_local, "db_file", None) != DB_FILE:
+        if conn is not None:
+            conn.close()
+        conn = sqlite3.connect(DB_FILE, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.row_factory = sqlite3.Row
+        _thread_local.conn = conn
+        _thread_local.db_file = DB_FILE
+    return conn
+
+
+@lru_cache(maxsize=512)
+def _query_standards(
+    db_file: str,
+    ttl_bucket: int,
+    grade_level: int,
+    normalized_subject: str,
+    mastered_key: tuple,
+    limit: int,
+    columns: tuple = DEFAULT_STANDARD_COLUMNS,
+) -> tuple:
+    """
+    Run the standards SELECT for one (grade, subject, mastered set, limit) combination.
+
+    Results are memoized because many students share the same grade/subject and an
+    empty or similar mastered list. ``db_file`` keys the memo to the database it was
+    read from, and ``ttl_bucket`` (see ``STANDARDS_CACHE_TTL_S``) expires it.
+    ``clear_standards_cache`` only clears this process's memo, so writers in other
+    processes are picked up when the TTL runs out.
+    """
+    conn = _connect_db()
+    mastered_standards = list(mastered_key)
+
+    # Base query
+    query = (
+        f"SELECT {', '.join(columns)} FROM standards "
+        "WHERE grade_level = ? AND LOWER(subject) = ?"
+    )
+    params = [grade_level, normalized_subject]
+
+    if len(mastered_standards) > MASTERED_ANTI_JOIN_THRESHOLD:
+        # Long NOT IN lists approach SQLite's bound-parameter limit and are scanned
+        # linearly per row; stage the IDs in a keyed temp table and anti-join instead.
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS _mastered (id TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM _mastered")
+        conn.executemany(
+            "INSERT OR IGNORE INTO _mastered (id) VALUES (?)",
+            [(standard_id,) for standard_id in mastered_standards],
+        )
+        query = (
+            f"SELECT {', '.join(columns)} FROM standards "
+            "LEFT JOIN _mastered ON standards.standard_id = _mastered.id "
+            "WHERE _mastered.id IS NULL AND grade_level = ? AND LOWER(subject) = ?"
+        )
+    elif mastered_standards:
+        # Add filter for mastered standards if any exist
+        # Create placeholders for the mastered standards
+        placeholders = ",".join("?" * len(mastered_standards))
+        query += f" AND standard_id NOT IN ({placeholders})"
+        params.extend(mastered_standards)
+
+    # Add limit
+    query += " LIMIT ?"
+    params.append(limit)
+
+    return tuple(dict(row) for row in conn.execute(query, params).fetchall())
+
+
+def clear_standards_cache() -> None:
+    """Forget this process's memoized standards queries (e.g. after re-ingesting standards)."""
+    _query_standards.cache_clear()
 
 
 def get_filtered_standards(
-    student_id: str, grade_level: int, subject: str | None, limit: int = 15
+    student_id: str,
+    grade_level: int,
+    subject: str | None,
+    limit: int = 15,
+    student_profile: dict | None = None,
+    columns: tuple = DEFAULT_STANDARD_COLUMNS,
 ) -> list:
     """
     Get filtered standards for a student based on their progress and rules.
@@ -46,24 +153,29 @@ def get_filtered_standards(
         grade_level: The grade level to filter by
         subject: The subject to filter by (may be overridden by theme rules)
         limit: Maximum number of standards to return (default: 15)
+        student_profile: Already-fetched profile row for ``student_id``; when provided
+            the profile lookup (and its extra DB connection) is skipped
+        columns: Standard columns to select; pass ``DEFAULT_STANDARD_COLUMNS +
+            ("json_blob",)`` when the raw source record is needed
 
     Returns:
         A list of dictionaries, where each dictionary represents a standard with keys:
-        'standard_id', 'source', 'subject', 'grade_level', 'description', 'json_blob'
+        'standard_id', 'source', 'subject', 'grade_level', 'description' (by default)
 
     Raises:
         ValueError: If the student is not found
     """
-    # Step a: Get student profile
-    student_profile = get_student_profile(student_id)
+    # Step a: Get student profile (unless the caller already has it)
+    if student_profile is None:
+        student_profile = get_student_profile(student_id)
 
     # Step b: Validate student exists
     if student_profile is None:
         raise ValueError(f"Student with id '{student_id}' not found")
 
     # Step c: Parse the JSON blobs
-    progress_blob = json.loads(student_profile["progress_blob"] or "{}")
-    plan_rules_blob = json.loads(student_profile["plan_rules_blob"] or "{}")
+    progress_blob = fast_json.loads(student_profile["progress_blob"] or "{}")
+    plan_rules_blob = fast_json.loads(student_profile["plan_rules_blob"] or "{}")
 
     # Step d: Extract mastered standards
     mastered_standards = progress_blob.get("mastered_standards", [])
@@ -91,41 +203,23 @@ def get_filtered_standards(
 
     normalized_subject = selected_subject.lower()
 
-    # Step g: Build SQL query
-    conn = _connect_db()
-    cursor = conn.cursor()
-
-    # Base query
-    query = "SELECT * FROM standards WHERE grade_level = ? AND LOWER(subject) = ?"
-    params = [grade_level, normalized_subject]
-
-    # Add filter for mastered standards if any exist
-    if mastered_standards:
-        # Create placeholders for the mastered standards
-        placeholders = ",".join("?" * len(mastered_standards))
-        query += f" AND standard_id NOT IN ({placeholders})"
-        params.extend(mastered_standards)
-
-    # Add limit
-    query += " LIMIT ?"
-    params.append(limit)
-
-    # Step h: Execute query and fetch results
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-
-    # Get column names from cursor description
-    column_names = [desc[0] for desc in cursor.description]
-
-    # Convert rows to list of dictionaries
-    results = []
-    for row in rows:
-        row_dict = {}
-        for i, column_name in enumerate(column_names):
-            row_dict[column_name] = row[i]
-        results.append(row_dict)
-
-    conn.close()
+    unknown_columns = set(columns) - _STANDARD_COLUMNS
+    if unknown_columns:
+        raise ValueError(f"Unknown standards columns: {sorted(unknown_columns)}")
+
+    # Step g/h: Run the standards query (or reuse a memoized result) and copy rows out
+    results = [
+        dict(row)
+        for row in _query_standards(
+            DB_FILE,
+            int(time.monotonic() // STANDARDS_CACHE_TTL_S) if STANDARDS_CACHE_TTL_S > 0 else 0,
+            grade_level,
+            normalized_subject,
+            tuple(sorted(mastered_standards)),
+            limit,
+            tuple(columns),
+        )
+    ]
 
     # Step i: Return the list of standard dictionaries
     return results
@@ -13,7 +13,7 @@ from packet_store import (
     list_weekly_packets,
     save_packet_feedback,
 )
-from agent import generate_weekly_plan
+from agent import generate_weekly_plan_async, iter_weekly_plan_events
 from trio_generator import generate_trio_for_student
 from db_utils import (
     create_student,
@@ -33,7 +33,9 @@ from feedback_processor import (
 from feedback_models import FeedbackResponse, SubmitFeedbackRequest
 from curriculum_graph import load_from_db
 from worksheet_html_renderer import build_print_packet_html
+import fast_json
 
+import asyncio
 import json
 import logging
 import os
@@ -46,7 +48,8 @@ from typing import Any
 from uuid import uuid4
 
 from fastapi import BackgroundTasks, FastAPI, HTTPException, Query, Response
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, HTMLResponse, StreamingResponse
 from pydantic import BaseModel, ConfigDict, Field
 
 # Add src directory to path for imports
@@ -58,6 +61,9 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
 
 app = FastAPI()
+# Weekly plan and packet payloads are several KB of repetitive JSON; gzip them for
+# clients that accept it.
+app.add_middleware(GZipMiddleware, minimum_size=512)
 
 
 def _project_root_path() -> Path:
@@ -85,8 +91,7 @@ def _write_weekly_plan_log(log_context: dict) -> None:
     log_id = uuid4().hex[:8]
     filename = f"weekly_plan_{safe_student_id}_{timestamp}_{log_id}.json"
     filepath = log_dir / filename
-    with open(filepath, "w", encoding="utf-8") as log_file:
-        json.dump(log_context, log_file, indent=2)
+    filepath.write_bytes(fast_json.dumps_indented(log_context))
 
 
 class PlanRequest(BaseModel):
@@ -245,7 +250,7 @@ def get_system_options():
 
 
 @app.get("/student/{student_id}")
-def read_student(student_id: str):
+async def read_student(student_id: str):
     """
     Get student profile by student_id.
 
@@ -258,7 +263,7 @@ def read_student(student_id: str):
     Raises:
         HTTPException: 404 if student not found
     """
-    profile = get_student_profile(student_id)
+    profile = await asyncio.to_thread(get_student_profile, student_id)
 
     if profile is None:
         raise HTTPException(status_code=404, detail="Student not found")
@@ -349,7 +354,7 @@ def delete_student_endpoint(student_id: str):
 
 
 @app.post("/generate_weekly_plan")
-def create_weekly_plan(request: PlanRequest):
+async def create_weekly_plan(request: PlanRequest):
     """
     Generate a weekly lesson plan for a student using LLM.
 
@@ -371,7 +376,7 @@ def create_weekly_plan(request: PlanRequest):
     }
 
     try:
-        plan = generate_weekly_plan(
+        plan = await generate_weekly_plan_async(
             student_id=request.student_id, grade_level=request.grade_level, subject=request.subject
         )
         log_context["response"] = plan
@@ -388,7 +393,59 @@ def create_weekly_plan(request: PlanRequest):
     finally:
         duration_ms = int((datetime.now(UTC) - start_time).total_seconds() * 1000)
         log_context["duration_ms"] = duration_ms
-        _write_weekly_plan_log(log_context)
+        await asyncio.to_thread(_write_weekly_plan_log, log_context)
+
+
+@app.post("/generate_weekly_plan/stream")
+async def stream_weekly_plan(request: PlanRequest):
+    """
+    Generate a weekly lesson plan, streaming progress as newline-delimited JSON.
+
+    Each line is one event: ``{"event": "day", ...}`` as every daily plan finishes,
+    then ``{"event": "plan", "plan": ...}`` with the complete weekly plan, or
+    ``{"event": "error", "status": ..., "detail": ...}`` if generation fails.
+
+    Args:
+        request: PlanRequest containing student_id, grade_level, and subject
+
+    Returns:
+        StreamingResponse with media type ``application/x-ndjson``
+    """
+    request_payload = request.model_dump()
+    start_time = datetime.now(UTC)
+
+    async def _event_lines():
+        log_context = {
+            "timestamp_utc": start_time.isoformat(timespec="microseconds") + "Z",
+            "request": request_payload,
+            "status": "pending",
+            "streamed": True,
+        }
+        try:
+            async for event in iter_weekly_plan_events(
+                request.student_id, request.grade_level, request.subject
+            ):
+                if event["event"] == "plan":
+                    log_context["response"] = event["plan"]
+                    log_context["status"] = "success"
+                elif event["event"] == "error":
+                    log_context["error"] = {"message": event["detail"]}
+                    log_context["status"] = (
+                        "client_error" if event["status"] == 400 else "server_error"
+                    )
+                yield fast_json.dumps(event) + "\n"
+        finally:
+            duration_ms = int((datetime.now(UTC) - start_time).total_seconds() * 1000)
+            log_context["duration_ms"] = duration_ms
+            await asyncio.to_thread(_write_weekly_plan_log, log_context)
+
+    # Marking the body as already encoded keeps GZipMiddleware from buffering events
+    # inside the compressor instead of delivering each line as it is produced.
+    return StreamingResponse(
+        _event_lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Encoding": "identity"},
+    )
 
 
 @app.get(
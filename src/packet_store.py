@@ -12,9 +12,11 @@ from pathlib import Path
 from typing import Any, Iterable, Mapping, Sequence
 
 try:  # Prefer package-relative import when available
+    from . import fast_json
     from .db_utils import DB_FILE  # type: ignore
 except ImportError:  # Fallback for direct script execution
     sys.path.insert(0, os.path.dirname(__file__))
+    import fast_json  # type: ignore
     from db_utils import DB_FILE  # type: ignore
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -33,9 +35,12 @@ def _utc_now() -> str:
 
 def _get_connection() -> sqlite3.Connection:
     Path(DB_FILE).parent.mkdir(parents=True, exist_ok=True)
+    # sqlite3's default 5s timeout doubles as busy_timeout for concurrent writers.
     conn = sqlite3.connect(DB_FILE)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
+    # Under WAL (set once in ensure_schema) NORMAL only syncs at checkpoints.
+    conn.execute("PRAGMA synchronous=NORMAL")
     return conn
 
 
@@ -125,6 +130,9 @@ def ensure_schema() -> None:
 
     conn = _get_connection()
     try:
+        # WAL is persisted in the database file, so readers stop blocking the packet
+        # writer for every later connection too.
+        conn.execute("PRAGMA journal_mode=WAL")
         with conn:
             for statement in statements:
                 conn.execute(statement)
@@ -134,7 +142,7 @@ def ensure_schema() -> None:
 
 
 def _json(value: Any) -> str:
-    return json.dumps(value, ensure_ascii=False)
+    return fast_json.dumps(value)
 
 
 def _build_summary(weekly_plan: Mapping[str, Any]) -> dict[str, Any]:
@@ -202,11 +210,23 @@ def _insert_weekly_packet(
     )
 
 
+def _day_standards(day: Mapping[str, Any], standards_by_id: Mapping[str, Any]) -> Any:
+    """Return the day's standard dicts, resolving ID references against the plan's map."""
+    if "standard_ids" in day:
+        return [
+            standards_by_id.get(standard_id, {"standard_id": standard_id})
+            for standard_id in day.get("standard_ids") or []
+        ]
+    return day.get("standards")  # Plans generated before standards were shared
+
+
 def _persist_daily_lessons(
     conn: sqlite3.Connection,
     packet_id: str,
     daily_plan: Iterable[Mapping[str, Any]],
+    standards_by_id: Mapping[str, Any] | None = None,
 ) -> None:
+    standards_by_id = standards_by_id or {}
     for day in daily_plan:
         day_label = day.get("day") or ""
         cursor = conn.execute(
@@ -227,7 +247,7 @@ def _persist_daily_lessons(
                 packet_id,
                 day_label,
                 day.get("focus"),
-                _json(day.get("standards")),
+                _json(_day_standards(day, standards_by_id)),
                 _json(day.get("lesson_plan")),
                 _json(day.get("resources")),
                 _json(day.get("worksheet_plans")),
@@ -251,6 +271,8 @@ def _persist_artifacts(
     if not resources:
         return
 
+    created_at = _utc_now()
+    rows = []
     for kind, payload in resources.items():
         artifacts = payload.get("artifacts") or []
         for artifact in artifacts:
@@ -259,21 +281,7 @@ def _persist_artifacts(
                 for key, value in artifact.items()
                 if key not in {"type", "path", "sha256", "size_bytes"}
             }
-            conn.execute(
-                """
-                INSERT INTO worksheet_artifacts (
-                    packet_id,
-                    daily_lesson_id,
-                    day_label,
-                    kind,
-                    file_format,
-                    file_path,
-                    checksum,
-                    file_size_bytes,
-                    metadata_json,
-                    created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+            rows.append(
                 (
                     packet_id,
                     daily_lesson_id,
@@ -284,9 +292,27 @@ def _persist_artifacts(
                     artifact.get("sha256"),
                     artifact.get("size_bytes"),
                     _json(metadata or None),
-                    _utc_now(),
-                ),
+                    created_at,
+                )
             )
+    if rows:
+        conn.executemany(
+            """
+            INSERT INTO worksheet_artifacts (
+                packet_id,
+                daily_lesson_id,
+                day_label,
+                kind,
+                file_format,
+                file_path,
+                checksum,
+                file_size_bytes,
+                metadata_json,
+                created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
 
 
 def save_weekly_packet(
@@ -300,9 +326,18 @@ def save_weekly_packet(
     if not packet_id:
         raise ValueError("weekly_plan must include plan_id")
 
-    with _get_connection() as conn:
-        _insert_weekly_packet(conn, weekly_plan, status)
-        _persist_daily_lessons(conn, packet_id, weekly_plan.get("daily_plan", []))
+    conn = _get_connection()
+    try:
+        with conn:
+            _insert_weekly_packet(conn, weekly_plan, status)
+            _persist_daily_lessons(
+                conn,
+                packet_id,
+                weekly_plan.get("daily_plan", []),
+                weekly_plan.get("standards"),
+            )
+    finally:
+        conn.close()
 
 
 def _compute_etag(packet_id: str, updated_at: str) -> str:
@@ -316,7 +351,7 @@ def _deserialize_summary(summary_json: str | None) -> dict[str, Any]:
     if not summary_json:
         return {}
     try:
-        return json.loads(summary_json)
+        return fast_json.loads(summary_json)
     except json.JSONDecodeError:  # pragma: no cover - defensive fallback
         return {}
 
@@ -404,7 +439,7 @@ def get_weekly_packet(student_id: str, packet_id: str) -> dict[str, Any] | None:
         return None
 
     try:
-        payload = json.loads(row["payload_json"])
+        payload = fast_json.loads(row["payload_json"])
     except json.JSONDecodeError as exc:  # pragma: no cover - unexpected
         raise ValueError(f"Corrupted payload for packet {packet_id}: {exc}") from exc
 
@@ -448,7 +483,7 @@ def list_packet_artifacts(student_id: str, packet_id: str) -> list[dict[str, Any
     artifacts: list[dict[str, Any]] = []
     for row in rows:
         metadata_json = row["metadata_json"]
-        metadata = json.loads(metadata_json) if metadata_json else None
+        metadata = fast_json.loads(metadata_json) if metadata_json else None
         artifacts.append(
             {
                 "artifact_id": row["id"],
@@ -492,7 +527,7 @@ def get_artifact_for_student(student_id: str, artifact_id: int) -> dict[str, Any
         return None
 
     metadata_json = row["metadata_json"]
-    metadata = json.loads(metadata_json) if metadata_json else None
+    metadata = fast_json.loads(metadata_json) if metadata_json else None
     return {
         "artifact_id": row["id"],
         "packet_id": row["packet_id"],
@@ -579,7 +614,7 @@ def get_packet_feedback(student_id: str, packet_id: str) -> dict[str, Any] | Non
         return None
 
     mastery_blob = row["mastery_feedback_blob"]
-    mastery_feedback = json.loads(mastery_blob) if mastery_blob else None
+    mastery_feedback = fast_json.loads(mastery_blob) if mastery_blob else None
 
     return {
         "packet_id": row["packet_id"],
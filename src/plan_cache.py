@@ -0,0 +1,147 @@
+"""SQLite-backed cache for LLM-generated daily lesson plans and weekly scaffolds.
+
+The same (standards, day focus, allowed materials, parent notes, grade, model) combination recurs
+across students and weeks, so a successful lesson-plan response is stored under a digest
+of those inputs and replayed instead of issuing another LLM call. Weekly scaffolds are
+stored the same way, keyed on their full request.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+try:  # Prefer package-relative import when available
+    from . import fast_json
+    from .db_utils import DB_FILE  # type: ignore
+except ImportError:  # Fallback for direct script execution
+    sys.path.insert(0, os.path.dirname(__file__))
+    import fast_json  # type: ignore
+    from db_utils import DB_FILE  # type: ignore
+
+# Part of every cache key. Bump it whenever the lesson-plan or scaffold prompt text
+# changes, so replayed entries never come from an older prompt.
+PROMPT_VERSION = "3"
+
+# Entries older than this many seconds are ignored (and overwritten on the next store),
+# so prompt or model changes eventually reach replayed plans. 0 keeps entries forever.
+LESSON_PLAN_CACHE_TTL_S = float(os.environ.get("LESSON_PLAN_CACHE_TTL_S", "0"))
+
+# Database paths whose cache table has already been created in this process.
+_SCHEMA_INITIALIZED: set[str] = set()
+
+
+def _get_connection() -> sqlite3.Connection:
+    Path(DB_FILE).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(DB_FILE)
+    if DB_FILE not in _SCHEMA_INITIALIZED:
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS lesson_plan_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    plan_json TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+                """
+            )
+        _SCHEMA_INITIALIZED.add(DB_FILE)
+    return conn
+
+
+def lesson_plan_cache_key(
+    standards: Sequence[Mapping[str, Any]],
+    rules: Mapping[str, Any],
+    model: str | None = None,
+    focus: str = "",
+) -> str:
+    """Return a stable digest of the inputs that shape a daily lesson-plan prompt.
+
+    Args:
+        standards: Standards assigned to the day (order is preserved, as in the prompt).
+        rules: Parent rules; only ``allowed_materials`` and ``parent_notes`` are keyed.
+        model: Model the plan is requested from.
+        focus: The day's focus from the scaffold, which the prompt ends with.
+    """
+    standard_ids = "+".join(
+        str(s.get("standard_id") or s.get("description", "")) for s in standards
+    )
+    canonical = json.dumps(
+        {
+            "materials": sorted(str(m) for m in rules.get("allowed_materials", []) or []),
+            "notes": rules.get("parent_notes"),
+            "grade": standards[0].get("grade_level") if standards else None,
+            "focus": focus,
+            "model": model,
+            "prompt_version": PROMPT_VERSION,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(f"{standard_ids}|{canonical}".encode("utf-8")).hexdigest()
+
+
+def scaffold_cache_key(request_payload: Mapping[str, Any]) -> str:
+    """Return a stable digest of a weekly-scaffold chat completion request.
+
+    The scaffold prompt already spells out the standards, rules, grade, subject and
+    activity guidance, so the whole request (including the model) is the key.
+    """
+    canonical = json.dumps(
+        {"request": request_payload, "prompt_version": PROMPT_VERSION},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(f"scaffold|{canonical}".encode("utf-8")).hexdigest()
+
+
+def _stamp(moment: datetime) -> str:
+    return moment.isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def get_cached_lesson_plan(cache_key: str) -> dict | None:
+    """Return the cached payload (lesson plan or scaffold) for ``cache_key``, if fresh."""
+    # Stamps share one fixed-width UTC format, so text comparison orders them by time.
+    not_before = (
+        _stamp(datetime.now(UTC) - timedelta(seconds=LESSON_PLAN_CACHE_TTL_S))
+        if LESSON_PLAN_CACHE_TTL_S > 0
+        else ""
+    )
+    conn = _get_connection()
+    try:
+        row = conn.execute(
+            "SELECT plan_json FROM lesson_plan_cache WHERE cache_key = ? AND created_at >= ?",
+            (cache_key, not_before),
+        ).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return None
+    try:
+        payload = fast_json.loads(row[0])
+    except json.JSONDecodeError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def store_cached_lesson_plan(cache_key: str, payload: Mapping[str, Any]) -> None:
+    """Insert or replace the payload (lesson plan or scaffold) stored under ``cache_key``."""
+    stamp = _stamp(datetime.now(UTC))
+    conn = _get_connection()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO lesson_plan_cache (cache_key, plan_json, created_at) "
+                "VALUES (?, ?, ?)",
+                (cache_key, fast_json.dumps(payload), stamp),
+            )
+    finally:
+        conn.close()
@@ -0,0 +1,256 @@
+"""Client-side request/token throttling and retries for OpenAI chat completions.
+
+Concurrent daily-plan calls (and several students generating at once) can burst past
+the account's requests-per-minute (RPM) and tokens-per-minute (TPM) limits. Each call
+first reserves capacity from two token buckets shared by the whole process. Rate-limit
+and transient errors are then retried with jittered exponential backoff (or after the
+server's ``Retry-After`` hint when one is sent), so a burst slows down instead of
+dropping days to the fallback plan. When the client exposes raw responses, the
+``x-ratelimit-remaining-*`` headers on every reply pull the local buckets down to what
+the server says is actually left, so other processes sharing the key are accounted for.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import re
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable
+
+try:  # Optional: exact prompt token counts
+    import tiktoken  # type: ignore
+except ImportError:  # pragma: no cover - exercised when tiktoken is absent
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+MAX_REQUESTS_PER_MINUTE = float(os.environ.get("OPENAI_MAX_REQUESTS_PER_MINUTE", "500"))
+MAX_TOKENS_PER_MINUTE = float(os.environ.get("OPENAI_MAX_TOKENS_PER_MINUTE", "200000"))
+MAX_ATTEMPTS = int(os.environ.get("OPENAI_MAX_ATTEMPTS", "5"))
+# Cap on calls awaiting a response at once on one event loop (e.g. the three trio plans
+# of 5 days each); defaults to a sixth of a minute's request budget.
+MAX_IN_FLIGHT = int(
+    os.environ.get("OPENAI_MAX_IN_FLIGHT", str(max(1, int(MAX_REQUESTS_PER_MINUTE) // 6)))
+)
+# Responses are not length-capped, so reserve a typical lesson-plan completion size.
+COMPLETION_TOKEN_ESTIMATE = 1000
+RETRY_BASE_DELAY_S = 1.0
+RETRY_MAX_DELAY_S = 30.0
+
+
+@lru_cache(maxsize=1)
+def retryable_errors() -> tuple[type[Exception], ...]:
+    """OpenAI errors worth retrying; imports the (slow to load) SDK on first use."""
+    import openai
+
+    return (
+        openai.RateLimitError,
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.InternalServerError,
+    )
+
+
+class TokenBucket:
+    """Capacity that refills continuously at ``per_minute`` units per minute.
+
+    State is guarded by a thread lock rather than an asyncio primitive so a single bucket
+    can be shared by every event loop in the process (e.g. the trio generator threads).
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.capacity = max(float(per_minute), 1.0)
+        self._rate = self.capacity / 60.0
+        self._clock = clock
+        self._available = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` if available and return 0, else return seconds to wait."""
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            now = self._clock()
+            self._available = min(
+                self.capacity, self._available + (now - self._updated) * self._rate
+            )
+            self._updated = now
+            if self._available >= amount:
+                self._available -= amount
+                return 0.0
+            return (amount - self._available) / self._rate
+
+    def refund(self, amount: float) -> None:
+        with self._lock:
+            self._available = min(self.capacity, self._available + amount)
+
+    def sync(self, remaining: float, reset_s: float | None = None) -> None:
+        """Clamp to the server's ``remaining`` count; when exhausted, hold for ``reset_s``."""
+        with self._lock:
+            floor = float(remaining)
+            if floor < 1 and reset_s:
+                # Go into debt so the next reserve() waits out the server's reset window
+                # even if the configured rate would refill sooner.
+                floor -= reset_s * self._rate
+            self._available = min(self._available, floor)
+
+
+class RateLimiter:
+    """Pair of RPM and TPM buckets consulted before every chat completion.
+
+    In-flight calls are additionally capped per event loop, since asyncio semaphores
+    cannot be shared between loops.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_in_flight: int = MAX_IN_FLIGHT,
+    ) -> None:
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_in_flight = max(1, max_in_flight)
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+
+    @asynccontextmanager
+    async def in_flight(self) -> AsyncIterator[None]:
+        """Hold one of the current loop's in-flight slots for the duration of a call."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_in_flight)
+        async with semaphore:
+            yield
+
+    async def acquire(self, token_estimate: int) -> None:
+        while True:
+            wait = self.requests.reserve(1)
+            if wait == 0.0:
+                wait = self.tokens.reserve(token_estimate)
+                if wait == 0.0:
+                    return
+                self.requests.refund(1)
+            await asyncio.sleep(wait)
+
+    def observe(self, headers: Any) -> None:
+        """Sync both buckets from a response's ``x-ratelimit-*`` headers, if present."""
+        if not headers:
+            return
+        for kind, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+            try:
+                remaining = float(headers.get(f"x-ratelimit-remaining-{kind}", ""))
+            except ValueError:
+                continue
+            bucket.sync(remaining, _parse_reset(headers.get(f"x-ratelimit-reset-{kind}")))
+
+
+DEFAULT_RATE_LIMITER = RateLimiter(MAX_REQUESTS_PER_MINUTE, MAX_TOKENS_PER_MINUTE)
+
+
+def estimate_request_tokens(payload: dict[str, Any]) -> int:
+    """Estimate prompt + completion tokens for a chat completion request payload."""
+    text = "".join(str(message.get("content") or "") for message in payload.get("messages", []))
+    prompt_tokens: int | None = None
+    if tiktoken is not None:
+        try:
+            encoding = tiktoken.encoding_for_model(payload.get("model") or "gpt-3.5-turbo")
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+        prompt_tokens = len(encoding.encode(text))
+    if prompt_tokens is None:
+        # ~4 characters per token for English prose.
+        prompt_tokens = len(text) // 4 + 1
+    return prompt_tokens + COMPLETION_TOKEN_ESTIMATE
+
+
+_RESET_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_RESET_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _parse_reset(value: str | None) -> float | None:
+    """Parse an ``x-ratelimit-reset-*`` duration such as ``"6m0s"`` or ``"120ms"``."""
+    if not value:
+        return None
+    parts = _RESET_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _RESET_UNITS[unit] for amount, unit in parts)
+
+
+def _server_retry_after(exc: Exception) -> float | None:
+    """Seconds the server asked us to wait (``retry-after-ms``/``retry-after``), if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        try:
+            value = float(headers.get(name, ""))
+        except ValueError:
+            continue  # Missing, or an HTTP-date we do not bother to parse.
+        if value >= 0:
+            return value * scale
+    return None
+
+
+def _retry_delay(attempt: int, exc: Exception | None = None) -> float:
+    # A server hint replaces the geometric guess: short hints retry sooner than the
+    # backoff would, long ones avoid burning attempts on requests that will fail again.
+    hinted = _server_retry_after(exc) if exc is not None else None
+    if hinted is not None:
+        return min(hinted, RETRY_MAX_DELAY_S)
+    delay = min(RETRY_BASE_DELAY_S * (2**attempt), RETRY_MAX_DELAY_S)
+    return delay * random.uniform(0.5, 1.0)
+
+
+async def create_chat_completion(
+    client: Any,
+    payload: dict[str, Any],
+    limiter: RateLimiter | None = None,
+    max_attempts: int | None = None,
+) -> Any:
+    """Throttle, send, and retry a ``client.chat.completions.create`` call.
+
+    Args:
+        client: AsyncOpenAI-compatible client.
+        payload: Keyword arguments for ``chat.completions.create``.
+        limiter: Buckets to draw from (defaults to the process-wide limiter).
+        max_attempts: Total attempts before the last retryable error is raised.
+    """
+    limiter = limiter or DEFAULT_RATE_LIMITER
+    attempts = max(1, max_attempts if max_attempts is not None else MAX_ATTEMPTS)
+    token_estimate = estimate_request_tokens(payload)
+    for attempt in range(attempts):
+        await limiter.acquire(token_estimate)
+        try:
+            async with limiter.in_flight():
+                raw_api = getattr(client.chat.completions, "with_raw_response", None)
+                if raw_api is None:
+                    return await client.chat.completions.create(**payload)
+                raw = await raw_api.create(**payload)
+                limiter.observe(raw.headers)
+                # LegacyAPIResponse.parse() is synchronous, including for stream=True.
+                return raw.parse()
+        except retryable_errors() as exc:
+            limiter.observe(getattr(getattr(exc, "response", None), "headers", None))
+            if attempt == attempts - 1:
+                raise
+            delay = _retry_delay(attempt, exc)
+            logger.warning(
+                "OpenAI request failed (%s); retrying in %.1fs (attempt %d/%d)",
+                type(exc).__name__,
+                delay,
+                attempt + 2,
+                attempts,
+            )
+            await asyncio.sleep(delay)
+    raise RuntimeError("unreachable")  # pragma: no cover
@@ -336,7 +336,8 @@ class ResourceRequests(BaseModel):
 
     def has_requests(self) -> bool:
         """True when at least one worksheet request is present."""
-        return any(v is not None for v in self.model_dump().values())
+        # Check the fields directly; model_dump() would serialize every nested request.
+        return any(getattr(self, name) is not None for name in type(self).model_fields)
 
 
 __all__ = [
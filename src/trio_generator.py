@@ -2,11 +2,10 @@ import json
 import logging
 import os
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 sys.path.insert(0, os.path.dirname(__file__))
 
-from agent import generate_weekly_plan
+from agent import generate_weekly_plans
 from db_utils import get_student_profile
 from ntfy import notify
 from packet_store import list_weekly_packets
@@ -38,22 +37,25 @@ def generate_trio_for_student(student_id: str) -> None:
         grade_level = _get_grade_level(student_id, metadata_fallback=metadata)
         subjects = pick_subjects(student_id)
 
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            futures = {
-                executor.submit(
-                    generate_weekly_plan,
-                    student_id=student_id,
-                    grade_level=grade_level,
-                    subject=subject,
-                ): subject
+        # One event loop for all three plans: their daily calls share a connection pool.
+        results = generate_weekly_plans(
+            [
+                {"student_id": student_id, "grade_level": grade_level, "subject": subject}
                 for subject in subjects
-            }
-            for future in as_completed(futures):
-                subject = futures[future]
-                exc = future.exception()
-                if exc:
-                    raise exc
+            ],
+            return_exceptions=True,
+        )
+        failures = []
+        for subject, result in zip(subjects, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "trio_generator: plan failed for %s / %s: %s", student_id, subject, result
+                )
+                failures.append(result)
+            else:
                 logger.info("trio_generator: plan generated for %s / %s", student_id, subject)
+        if failures:
+            raise failures[0]
 
         notify(f"Plans ready for {name}!", "Math, Reading & more packets are in the queue.")
     except Exception as exc:
@@ -1,3 +1,5 @@
+import logging
+
 import pytest
 
 import src.agent as agent
@@ -47,7 +49,7 @@ def test_extract_with_math_resources():
     assert resources.mathWorksheet.problems[0].operator == "+"
 
 
-def test_extract_invalid_resources_logs_and_drops(capsys):
+def test_extract_invalid_resources_logs_and_drops(caplog):
     payload = {
         "lesson_plan": {"objective": "Practice"},
         "resources": {
@@ -58,9 +60,9 @@ def test_extract_invalid_resources_logs_and_drops(capsys):
             }
         },
     }
-    _, resources = _extract_lesson_and_resources(payload, "Wednesday")
-    captured = capsys.readouterr()
-    assert "Invalid worksheet resources" in captured.out
+    with caplog.at_level(logging.WARNING):
+        _, resources = _extract_lesson_and_resources(payload, "Wednesday")
+    assert any("Invalid worksheet resources" in r.getMessage() for r in caplog.records)
     assert resources is None
 
 
@@ -79,3 +81,35 @@ def test_extract_with_reading_resources():
     assert resources is not None
     assert resources.readingWorksheet is not None
     assert resources.readingWorksheet.passage_title == "Garden Morning"
+
+
+def test_prompt_prefix_is_shared_across_standards(sample_standard, sample_rules):
+    other = {**sample_standard, "description": "Skip count by fives"}
+    prefix = agent.build_rules_prefix(sample_rules)
+
+    first = agent.create_lesson_plan_prompt(sample_standard, sample_rules)
+    second = agent.create_lesson_plan_prompt(other, sample_rules)
+
+    assert first.startswith(prefix) and second.startswith(prefix)
+    assert agent.build_rules_prefix(dict(sample_rules)) is prefix
+    assert "Standard: Skip count by fives" in second
+
+
+def test_prompts_for_different_rules_share_the_static_prefix(sample_standard, sample_rules):
+    other_rules = {"allowed_materials": ["Counters", "Paper"], "parent_notes": "outdoors"}
+
+    first = agent.create_lesson_plan_prompt(sample_standard, sample_rules)
+    second = agent.create_lesson_plan_prompt(sample_standard, other_rules)
+
+    assert first.startswith(agent.LESSON_PLAN_INSTRUCTIONS)
+    assert second.startswith(agent.LESSON_PLAN_INSTRUCTIONS)
+    # Materials are listed in sorted order, so only the parent notes differ here.
+    assert "Allowed materials: ['Counters', 'Paper']" in first
+    assert "Allowed materials: ['Counters', 'Paper']" in second
+
+
+def test_full_prompt_is_reused_for_repeat_standards(sample_standard, sample_rules):
+    first = agent.create_lesson_plan_prompt(sample_standard, sample_rules)
+    again = agent.create_lesson_plan_prompt(dict(sample_standard), dict(sample_rules))
+
+    assert again is first
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 import src.agent as agent
 from src.worksheet_requests import WorksheetArtifactPlan
 from src.worksheets import generate_two_operand_math_worksheet
@@ -55,3 +57,88 @@ def test_render_artifacts_records_errors(tmp_path, monkeypatch):
     assert errors and any(err["kind"] == "mathWorksheet" for err in errors)
     for entry in pdf_entries:
         assert (tmp_path / entry["path"]).exists()
+
+
+def test_artifact_metadata_hashes_file_contents(tmp_path):
+    import hashlib
+
+    data = b"worksheet" * 300_000
+    path = tmp_path / "sheet.pdf"
+    path.write_bytes(data)
+    empty = tmp_path / "empty.html"
+    empty.write_bytes(b"")
+
+    assert agent._artifact_file_metadata(path) == (len(data), hashlib.sha256(data).hexdigest())
+    assert agent._artifact_file_metadata(empty) == (0, hashlib.sha256(b"").hexdigest())
+    assert agent._artifact_file_metadata(tmp_path / "missing.pdf") == (None, None)
+
+
+def test_render_artifacts_keep_plan_order_with_shared_hints(tmp_path, monkeypatch):
+    monkeypatch.setattr(agent, "ARTIFACTS_DIR", tmp_path / "artifacts")
+    monkeypatch.setattr(agent, "PROJECT_ROOT", tmp_path)
+
+    artifact_map, errors = agent._render_worksheet_artifacts(
+        "plan_demo", "Monday", [_make_math_plan(), _make_math_plan()], generation_logger=None
+    )
+
+    assert errors == []
+    paths = [entry["path"] for entry in artifact_map["mathWorksheet"]]
+    assert [path.rsplit("/", 1)[-1] for path in paths] == [
+        "warmup.png",
+        "warmup.pdf",
+        "warmup_1.png",
+        "warmup_1.pdf",
+    ]
+    assert all((tmp_path / path).exists() for path in paths)
+
+
+def test_slugify_matches_regex_for_ascii_and_unicode():
+    import re
+
+    for value in ["Monday", "warm up!", "tab\there", "a/b\\c", "Café día", "ok_-9"]:
+        assert agent._slugify(value) == re.sub(r"[^a-zA-Z0-9_-]", "_", value)
+    assert agent._slugify("") == "entry"
+
+
+def test_unique_artifact_path_skips_existing_files(tmp_path):
+    (tmp_path / "warmup.png").write_bytes(b"")
+    (tmp_path / "warmup_1.png").write_bytes(b"")
+
+    assert agent._unique_artifact_path(tmp_path, "warmup", "png").name == "warmup_2.png"
+    assert agent._unique_artifact_path(tmp_path / "missing", "warmup", "png").name == "warmup.png"
+
+
+def test_relative_artifact_path_strips_only_the_project_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(agent, "PROJECT_ROOT", tmp_path)
+
+    inside = tmp_path / "artifacts" / "plan" / "monday" / "sheet.pdf"
+    assert agent._relative_artifact_path(inside) == str(Path("artifacts/plan/monday/sheet.pdf"))
+    sibling = Path(str(tmp_path) + "_other") / "sheet.pdf"
+    assert agent._relative_artifact_path(sibling) == str(sibling)
+
+
+def test_identical_worksheets_reuse_cached_renders(tmp_path, monkeypatch):
+    monkeypatch.setattr(agent, "ARTIFACTS_DIR", tmp_path / "artifacts")
+    monkeypatch.setattr(agent, "PROJECT_ROOT", tmp_path)
+
+    first, errors = agent._render_worksheet_artifacts(
+        "plan_demo", "Monday", [_make_math_plan()], generation_logger=None
+    )
+    assert errors == []
+
+    def fail_render(_worksheet, _path):
+        raise AssertionError("cached worksheet was rendered again")
+
+    monkeypatch.setattr(agent, "render_worksheet_to_image", fail_render)
+    monkeypatch.setattr(agent, "render_worksheet_to_pdf", fail_render)
+    second, errors = agent._render_worksheet_artifacts(
+        "plan_demo", "Tuesday", [_make_math_plan()], generation_logger=None
+    )
+
+    assert errors == []
+    checksums = [
+        [(entry["type"], entry["sha256"]) for entry in artifacts["mathWorksheet"]]
+        for artifacts in (first, second)
+    ]
+    assert checksums[0] == checksums[1]
+    assert all("/tuesday/" in entry["path"] for entry in second["mathWorksheet"])
@@ -0,0 +1,29 @@
+"""Tests for the orjson-backed JSON helpers."""
+
+import json
+
+import pytest
+
+import src.fast_json as fast_json
+
+
+def test_loads_errors_are_stdlib_decode_errors():
+    with pytest.raises(json.JSONDecodeError):
+        fast_json.loads("{not json")
+
+
+def test_dumps_keeps_unicode_and_round_trips():
+    payload = {"title": "Café math", "items": [1, 2.5, None, True]}
+    text = fast_json.dumps(payload)
+    assert "Café" in text
+    assert json.loads(text) == payload
+
+
+def test_dumps_falls_back_for_non_string_keys():
+    assert json.loads(fast_json.dumps({1: "one"})) == {"1": "one"}
+
+
+def test_dumps_indented_matches_stdlib_layout():
+    payload = {"day": "Monday", "procedure": ["Count", "Sort"], "nested": {"n": 1}}
+    assert fast_json.dumps_indented(payload) == json.dumps(payload, indent=2).encode()
+    assert json.loads(fast_json.dumps_indented({1: "one"})) == {"1": "one"}
@@ -20,3 +20,15 @@ def test_worksheet_requests_executes_as_script():
     """Running worksheet_requests.py directly should succeed without import errors."""
     module_globals = runpy.run_path(str(SRC_DIR / "worksheet_requests.py"))
     assert "build_worksheets_from_requests" in module_globals
+
+
+def test_agent_import_defers_the_openai_sdk():
+    """Importing agent (e.g. from cron scripts) should not pay for loading openai."""
+    import subprocess
+    import sys
+
+    code = "import sys, agent; print('openai' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=SRC_DIR, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
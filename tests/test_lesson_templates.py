@@ -0,0 +1,45 @@
+"""Tests for deterministic lesson-plan templates."""
+
+import pytest
+
+import src.lesson_templates as lesson_templates
+
+
+@pytest.fixture(autouse=True)
+def _empty_registry(monkeypatch):
+    monkeypatch.setattr(lesson_templates, "TEMPLATES", {})
+
+
+def _template(label):
+    def _build(standard, rules):
+        return {
+            "objective": f"{label}: {standard['description']}",
+            "materials_needed": rules.get("allowed_materials", [])[:1],
+            "procedure": ["Model", "Practice", "Check"],
+        }
+
+    return _build
+
+
+def test_most_specific_pattern_wins():
+    lesson_templates.register_template("VA.MATH.*")(_template("broad"))
+    lesson_templates.register_template("VA.MATH.K.*")(_template("kindergarten"))
+
+    result = lesson_templates.render_template_lesson(
+        [{"standard_id": "VA.MATH.K.K.1", "description": "Count to 10"}],
+        {"allowed_materials": ["Blocks", "Paper"]},
+    )
+
+    assert result is not None
+    pattern, lesson_plan = result
+    assert pattern == "VA.MATH.K.*"
+    assert lesson_plan["objective"] == "kindergarten: Count to 10"
+    assert lesson_plan["materials_needed"] == ["Blocks"]
+
+
+def test_unmatched_or_multi_standard_days_use_the_llm():
+    lesson_templates.register_template("VA.MATH.K.*")(_template("kindergarten"))
+    k_standard = {"standard_id": "VA.MATH.K.K.1", "description": "Count"}
+
+    assert lesson_templates.render_template_lesson([{"standard_id": "VA.SCI.1.1"}], {}) is None
+    assert lesson_templates.render_template_lesson([k_standard, k_standard], {}) is None
@@ -4,6 +4,9 @@ import os
 import sqlite3
 import sys
 from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
 
 
 MODULE_NAMES = [
@@ -83,3 +86,167 @@ def test_get_filtered_standards_handles_subject_case(tmp_path):
 
     assert standards, "Expected history standards despite lowercase subject"
     assert all(s["subject"] == "History" for s in standards)
+
+
+def test_get_filtered_standards_reuses_provided_profile(tmp_path, monkeypatch):
+    db_path = tmp_path / "logic.db"
+    _bootstrap_db(db_path)
+    logic_module = _reload_logic(db_path)
+
+    def _unexpected_lookup(_student_id):
+        raise AssertionError("profile should not be fetched again")
+
+    monkeypatch.setattr(logic_module, "get_student_profile", _unexpected_lookup)
+    profile = {
+        "student_id": "student_01",
+        "progress_blob": json.dumps({"mastered_standards": []}),
+        "plan_rules_blob": json.dumps({}),
+    }
+
+    standards = logic_module.get_filtered_standards(
+        "student_01", grade_level=2, subject="History", limit=5, student_profile=profile
+    )
+
+    assert [s["standard_id"] for s in standards] == ["VA.HISTORY.2.test"]
+
+
+def test_standards_connection_is_reused_per_thread(tmp_path):
+    db_path = tmp_path / "logic.db"
+    _bootstrap_db(db_path)
+    logic_module = _reload_logic(db_path)
+
+    first = logic_module._connect_db()
+    logic_module.get_filtered_standards("student_01", grade_level=2, subject="History")
+
+    assert logic_module._connect_db() is first
+    assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_standards_query_is_memoized_until_cleared(tmp_path, monkeypatch):
+    db_path = tmp_path / "logic.db"
+    _bootstrap_db(db_path)
+    logic_module = _reload_logic(db_path)
+
+    first = logic_module.get_filtered_standards("student_01", grade_level=2, subject="History")
+
+    def _no_db():
+        raise AssertionError("standards query should be served from the cache")
+
+    monkeypatch.setattr(logic_module, "_connect_db", _no_db)
+    second = logic_module.get_filtered_standards("student_01", grade_level=2, subject="history")
+    assert second == first
+    second[0]["description"] = "mutated"
+    assert logic_module.get_filtered_standards("student_01", 2, "History") == first
+
+    logic_module.clear_standards_cache()
+    monkeypatch.undo()
+    conn = sqlite3.connect(db_path)
+    conn.execute("DELETE FROM standards")
+    conn.commit()
+    conn.close()
+    assert logic_module.get_filtered_standards("student_01", 2, "History") == []
+
+
+def test_standards_cache_is_keyed_by_database_and_expires(tmp_path, monkeypatch):
+    first_db, second_db = tmp_path / "first.db", tmp_path / "second.db"
+    _bootstrap_db(first_db)
+    _bootstrap_db(second_db)
+    conn = sqlite3.connect(second_db)
+    conn.execute("DELETE FROM standards")
+    conn.commit()
+    conn.close()
+    logic_module = _reload_logic(first_db)
+    clock = SimpleNamespace(monotonic=lambda: 1000.0)
+    monkeypatch.setattr(logic_module, "time", clock)
+    monkeypatch.setattr(logic_module, "STANDARDS_CACHE_TTL_S", 60.0)
+
+    from_first = logic_module.get_filtered_standards("student_01", 2, "History")
+    assert from_first
+    monkeypatch.setattr(logic_module, "DB_FILE", str(second_db))
+    assert logic_module.get_filtered_standards("student_01", 2, "History") == []
+
+    # Another process empties the first database; the memo holds until the TTL passes.
+    monkeypatch.setattr(logic_module, "DB_FILE", str(first_db))
+    conn = sqlite3.connect(first_db)
+    conn.execute("DELETE FROM standards")
+    conn.commit()
+    conn.close()
+    assert logic_module.get_filtered_standards("student_01", 2, "History") == from_first
+    clock.monotonic = lambda: 1061.0
+    assert logic_module.get_filtered_standards("student_01", 2, "History") == []
+
+
+def test_switching_db_file_closes_the_old_connection(tmp_path, monkeypatch):
+    first_db, second_db = tmp_path / "first.db", tmp_path / "second.db"
+    _bootstrap_db(first_db)
+    _bootstrap_db(second_db)
+    logic_module = _reload_logic(first_db)
+
+    old_conn = logic_module._connect_db()
+    monkeypatch.setattr(logic_module, "DB_FILE", str(second_db))
+    new_conn = logic_module._connect_db()
+
+    assert new_conn is not old_conn
+    with pytest.raises(sqlite3.ProgrammingError):
+        old_conn.execute("SELECT 1")
+    assert logic_module._connect_db() is new_conn
+
+
+def test_standards_lookup_uses_grade_subject_index(tmp_path):
+    db_path = tmp_path / "logic.db"
+    _bootstrap_db(db_path)
+    logic_module = _reload_logic(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute(sys.modules["db_utils"].STANDARDS_LOOKUP_INDEX_SQL)
+
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM standards WHERE grade_level = ? "
+        "AND LOWER(subject) = ? AND standard_id NOT IN (?) LIMIT ?",
+        (2, "history", "VA.HISTORY.2.other", 5),
+    ).fetchall()
+    conn.close()
+
+    assert any("idx_standards_grade_subject" in row[-1] for row in plan)
+    assert logic_module.get_filtered_standards("student_01", 2, "History")
+
+
+def test_standards_lookup_omits_json_blob_unless_requested(tmp_path):
+    db_path = tmp_path / "logic.db"
+    _bootstrap_db(db_path)
+    logic_module = _reload_logic(db_path)
+
+    default = logic_module.get_filtered_standards("student_01", 2, "History")
+    assert set(default[0]) == set(logic_module.DEFAULT_STANDARD_COLUMNS)
+
+    with_blob = logic_module.get_filtered_standards(
+        "student_01", 2, "History", columns=logic_module.DEFAULT_STANDARD_COLUMNS + ("json_blob",)
+    )
+    assert with_blob[0]["json_blob"] == "{}"
+
+
+def test_large_mastered_lists_are_filtered_with_an_anti_join(tmp_path):
+    db_path = tmp_path / "logic.db"
+    _bootstrap_db(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO standards (standard_id, source, subject, grade_level, description, json_blob) "
+        "VALUES (?, 'VA', 'History', 2, ?, '{}')",
+        [(f"VA.HISTORY.2.{idx}", f"History skill {idx}") for idx in range(1200)],
+    )
+    conn.commit()
+    conn.close()
+    logic_module = _reload_logic(db_path)
+
+    # More IDs than SQLite's default 999 bound-parameter limit.
+    mastered = ["VA.HISTORY.2.test"] + [f"VA.HISTORY.2.{idx}" for idx in range(1199)]
+    profile = {
+        "student_id": "student_01",
+        "progress_blob": json.dumps({"mastered_standards": mastered}),
+        "plan_rules_blob": json.dumps({}),
+    }
+
+    standards = logic_module.get_filtered_standards(
+        "student_01", 2, "History", limit=5, student_profile=profile
+    )
+
+    assert [s["standard_id"] for s in standards] == ["VA.HISTORY.2.1199"]
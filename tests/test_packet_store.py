@@ -52,10 +52,31 @@ def test_save_weekly_packet_persists_rows(tmp_path):
     assert artifact_rows[0]["file_format"] == "pdf"  # type: ignore[index]
     assert artifact_rows[0]["file_size_bytes"] == 1024  # type: ignore[index]
     assert artifact_rows[1]["checksum"] == "def456"  # type: ignore[index]
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
 
     conn.close()
 
 
+def test_save_weekly_packet_resolves_shared_standards(tmp_path):
+    db_path = tmp_path / "packets.db"
+    packet_store = _reload_modules(db_path)
+
+    weekly_plan = build_weekly_plan()
+    standard = {"standard_id": "STD-1", "description": "Count to 100"}
+    weekly_plan["standards"] = {"STD-1": standard}
+    for day in weekly_plan["daily_plan"]:
+        day.pop("standards", None)
+        day["standard_id"] = "STD-1"
+        day["standard_ids"] = ["STD-1"]
+    packet_store.save_weekly_packet(weekly_plan)
+
+    conn = sqlite3.connect(str(db_path))
+    rows = conn.execute("SELECT standards_json FROM daily_lessons").fetchall()
+    conn.close()
+    assert rows
+    assert all(json.loads(row[0]) == [standard] for row in rows)
+
+
 def test_save_weekly_packet_rolls_back_on_error(tmp_path):
     db_path = tmp_path / "packets.db"
     packet_store = _reload_modules(db_path)
@@ -0,0 +1,71 @@
+"""Tests for the SQLite-backed lesson plan cache."""
+
+import pytest
+
+import src.plan_cache as plan_cache
+
+STANDARD = {"standard_id": "MATH.2.1", "grade_level": 2, "description": "Add within 20"}
+
+
+@pytest.fixture(autouse=True)
+def _isolated_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(plan_cache, "DB_FILE", str(tmp_path / "cache.db"))
+
+
+def test_cache_key_ignores_material_order():
+    first = plan_cache.lesson_plan_cache_key(
+        [STANDARD], {"allowed_materials": ["Paper", "Blocks"], "parent_notes": "short"}
+    )
+    second = plan_cache.lesson_plan_cache_key(
+        [STANDARD], {"allowed_materials": ["Blocks", "Paper"], "parent_notes": "short"}
+    )
+    assert first == second
+
+
+def test_cache_key_changes_with_inputs():
+    base = plan_cache.lesson_plan_cache_key([STANDARD], {"allowed_materials": ["Paper"]})
+    other_notes = plan_cache.lesson_plan_cache_key(
+        [STANDARD], {"allowed_materials": ["Paper"], "parent_notes": "outdoors"}
+    )
+    other_grade = plan_cache.lesson_plan_cache_key(
+        [{**STANDARD, "grade_level": 3}], {"allowed_materials": ["Paper"]}
+    )
+    other_focus = plan_cache.lesson_plan_cache_key(
+        [STANDARD], {"allowed_materials": ["Paper"]}, focus="Review and extend"
+    )
+    assert len({base, other_notes, other_grade, other_focus}) == 4
+
+
+def test_cache_key_includes_model_and_prompt_version(monkeypatch):
+    rules = {"allowed_materials": ["Paper"]}
+    small = plan_cache.lesson_plan_cache_key([STANDARD], rules, "gpt-4o-mini")
+    large = plan_cache.lesson_plan_cache_key([STANDARD], rules, "gpt-4o")
+    scaffold = plan_cache.scaffold_cache_key({"model": "gpt-4o", "messages": []})
+    assert small != large
+
+    monkeypatch.setattr(plan_cache, "PROMPT_VERSION", "next")
+    assert plan_cache.lesson_plan_cache_key([STANDARD], rules, "gpt-4o") != large
+    assert plan_cache.scaffold_cache_key({"model": "gpt-4o", "messages": []}) != scaffold
+
+
+def test_store_and_fetch_round_trip():
+    key = plan_cache.lesson_plan_cache_key([STANDARD], {})
+    assert plan_cache.get_cached_lesson_plan(key) is None
+
+    payload = {"lesson_plan": {"objective": "Add", "procedure": ["Count"]}}
+    plan_cache.store_cached_lesson_plan(key, payload)
+
+    assert plan_cache.get_cached_lesson_plan(key) == payload
+
+
+def test_expired_entries_are_ignored(monkeypatch):
+    key = plan_cache.lesson_plan_cache_key([STANDARD], {})
+    plan_cache.store_cached_lesson_plan(key, {"lesson_plan": {"objective": "Add"}})
+    conn = plan_cache._get_connection()
+    with conn:
+        conn.execute("UPDATE lesson_plan_cache SET created_at = '2020-01-01T00:00:00Z'")
+    conn.close()
+
+    assert plan_cache.get_cached_lesson_plan(key) is not None  # No TTL by default
+    monkeypatch.setattr(plan_cache, "LESSON_PLAN_CACHE_TTL_S", 86400.0)
+    assert plan_cache.get_cached_lesson_plan(key) is None
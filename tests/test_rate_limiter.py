@@ -0,0 +1,200 @@
+"""Tests for OpenAI request throttling and retries."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+import src.rate_limiter as rate_limiter
+
+
+def _rate_limit_error() -> openai.RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.test/v1/chat/completions")
+    return openai.RateLimitError(
+        "slow down", response=httpx.Response(429, request=request), body=None
+    )
+
+
+class FlakyCompletions:
+    def __init__(self, failures: int, error_factory=_rate_limit_error):
+        self.failures = failures
+        self.error_factory = error_factory
+        self.calls = 0
+
+    async def create(self, **_payload):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error_factory()
+        return "ok"
+
+
+def _client(completions):
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+PAYLOAD = {"model": "gpt-3.5-turbo", "messages": [{"role": "user", "content": "hi"}]}
+
+
+def test_token_bucket_reports_wait_until_refilled():
+    now = [0.0]
+    bucket = rate_limiter.TokenBucket(60, clock=lambda: now[0])  # 1 unit per second
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(2) == 2.0
+    now[0] = 2.0
+    assert bucket.reserve(2) == 0.0
+
+
+def test_rate_limit_errors_are_retried(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "RETRY_BASE_DELAY_S", 0.0)
+    completions = FlakyCompletions(failures=2)
+
+    result = asyncio.run(
+        rate_limiter.create_chat_completion(_client(completions), PAYLOAD, max_attempts=3)
+    )
+
+    assert result == "ok"
+    assert completions.calls == 3
+
+
+def test_retry_after_header_overrides_backoff(monkeypatch):
+    request = httpx.Request("POST", "https://api.openai.test/v1/chat/completions")
+    hinted = openai.RateLimitError(
+        "slow down",
+        response=httpx.Response(429, request=request, headers={"retry-after-ms": "20"}),
+        body=None,
+    )
+
+    assert rate_limiter._retry_delay(4, hinted) == pytest.approx(0.02)
+    assert rate_limiter._retry_delay(0, _rate_limit_error()) <= rate_limiter.RETRY_BASE_DELAY_S
+
+
+def test_retries_give_up_after_max_attempts(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "RETRY_BASE_DELAY_S", 0.0)
+    completions = FlakyCompletions(failures=5)
+
+    with pytest.raises(openai.RateLimitError):
+        asyncio.run(
+            rate_limiter.create_chat_completion(_client(completions), PAYLOAD, max_attempts=2)
+        )
+    assert completions.calls == 2
+
+
+def test_non_retryable_errors_propagate_immediately():
+    completions = FlakyCompletions(failures=1, error_factory=lambda: ValueError("bad"))
+
+    with pytest.raises(ValueError):
+        asyncio.run(rate_limiter.create_chat_completion(_client(completions), PAYLOAD))
+    assert completions.calls == 1
+
+
+def test_estimate_includes_completion_budget():
+    estimate = rate_limiter.estimate_request_tokens(PAYLOAD)
+    assert estimate > rate_limiter.COMPLETION_TOKEN_ESTIMATE
+
+
+def test_in_flight_calls_are_capped_per_loop():
+    limiter = rate_limiter.RateLimiter(6000, 10_000_000, max_in_flight=2)
+    state = {"current": 0, "peak": 0}
+
+    class SlowCompletions:
+        async def create(self, **_payload):
+            state["current"] += 1
+            state["peak"] = max(state["peak"], state["current"])
+            await asyncio.sleep(0.01)
+            state["current"] -= 1
+            return "ok"
+
+    async def _run():
+        client = _client(SlowCompletions())
+        return await asyncio.gather(
+            *(rate_limiter.create_chat_completion(client, PAYLOAD, limiter) for _ in range(6))
+        )
+
+    assert asyncio.run(_run()) == ["ok"] * 6
+    assert state["peak"] == 2
+
+
+def test_parse_reset_handles_openai_durations():
+    assert rate_limiter._parse_reset("6m0s") == pytest.approx(360.0)
+    assert rate_limiter._parse_reset("120ms") == pytest.approx(0.12)
+    assert rate_limiter._parse_reset("1.5s") == pytest.approx(1.5)
+    assert rate_limiter._parse_reset("soon") is None
+
+
+def test_remaining_headers_sync_buckets_from_raw_responses():
+    now = [0.0]
+    limiter = rate_limiter.RateLimiter(60, 100_000)
+    limiter.requests = rate_limiter.TokenBucket(60, clock=lambda: now[0])
+    limiter.tokens = rate_limiter.TokenBucket(100_000, clock=lambda: now[0])
+    headers = {
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "5s",
+        "x-ratelimit-remaining-tokens": "4000",
+    }
+
+    class RawResponse:
+        def __init__(self):
+            self.headers = headers
+
+        def parse(self):
+            return "ok"
+
+    class RawCompletions:
+        async def create(self, **_payload):
+            return RawResponse()
+
+    client = _client(SimpleNamespace(with_raw_response=RawCompletions()))
+    assert asyncio.run(rate_limiter.create_chat_completion(client, PAYLOAD, limiter)) == "ok"
+
+    # Server says no requests are left for 5s, even though our own budget was untouched.
+    assert limiter.requests.reserve(1) == pytest.approx(6.0)
+    assert limiter.tokens.reserve(4000) == 0.0
+    assert limiter.tokens.reserve(1000) > 0.0
+
+
+def test_real_client_raw_responses_sync_headers_and_parse():
+    headers = {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "5s"}
+    completion = {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-test",
+        "choices": [
+            {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "hi"}}
+        ],
+    }
+    chunk = {**completion, "object": "chat.completion.chunk"}
+    chunk["choices"] = [{"index": 0, "finish_reason": None, "delta": {"content": "hi"}}]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if b'"stream":true' in request.content.replace(b" ", b""):
+            body = f"data: {json.dumps(chunk)}\n\ndata: [DONE]\n\n"
+            return httpx.Response(
+                200, headers={**headers, "content-type": "text/event-stream"}, text=body
+            )
+        return httpx.Response(200, headers=headers, json=completion)
+
+    async def _run():
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = openai.AsyncOpenAI(
+            api_key="test", base_url="https://api.openai.test/v1", http_client=http_client
+        )
+        limiter = rate_limiter.RateLimiter(60, 100_000)
+        response = await rate_limiter.create_chat_completion(client, PAYLOAD, limiter)
+        exhausted = limiter.requests.reserve(1) > 0.0
+        stream = await rate_limiter.create_chat_completion(
+            client, {**PAYLOAD, "stream": True}, rate_limiter.RateLimiter(60, 100_000)
+        )
+        deltas = [c.choices[0].delta.content async for c in stream]
+        await client.close()
+        return response, exhausted, deltas
+
+    response, exhausted, deltas = asyncio.run(_run())
+
+    assert response.choices[0].message.content == "hi"
+    assert exhausted
+    assert deltas == ["hi"]
@@ -292,3 +292,27 @@ class TestDeleteStudentEndpoint:
         """DELETE /student/{id} returns 404 for non-existent student."""
         response = test_client.delete("/student/nonexistent")
         assert response.status_code == 404
+
+
+class TestStreamWeeklyPlanEndpoint:
+    """Tests for POST /generate_weekly_plan/stream."""
+
+    def test_stream_reports_unknown_student_as_error_event(
+        self, test_client, tmp_path, monkeypatch
+    ):
+        """Failures surface as a final NDJSON error event."""
+        main_module = sys.modules["src.main"]
+        monkeypatch.setattr(main_module, "_log_dir", lambda: tmp_path / "logs")
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+        response = test_client.post(
+            "/generate_weekly_plan/stream",
+            json={"student_id": "nonexistent", "grade_level": 1, "subject": "Math"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines() if line]
+        assert events == [
+            {"event": "error", "status": 400, "detail": "Student with id 'nonexistent' not found"}
+        ]
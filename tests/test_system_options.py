@@ -90,3 +90,10 @@ def test_system_options_statuses_contains_expected_values():
     assert "DEVELOPING" in statuses
     assert "MASTERED" in statuses
     assert "BENCHED" in statuses
+
+
+def test_system_options_are_gzipped_when_accepted():
+    """Large JSON responses are compressed for gzip-capable clients."""
+    response = client.get("/system/options", headers={"Accept-Encoding": "gzip"})
+    assert response.headers.get("content-encoding") == "gzip"
+    assert "subjects" in response.json()
@@ -22,14 +22,15 @@ def test_generates_three_plans_and_notifies():
         patch("trio_generator.get_student_profile", return_value=_make_profile("Alice")),
         patch("trio_generator._get_grade_level", return_value=2),
         patch("trio_generator.pick_subjects", return_value=["Math", "English", "Science"]),
-        patch("trio_generator.generate_weekly_plan", return_value={"ok": True}) as mock_gen,
+        patch("trio_generator.generate_weekly_plans", return_value=[{"ok": True}] * 3) as mock_gen,
         patch("trio_generator.notify") as mock_notify,
     ):
         trio_generator.generate_trio_for_student("s1")
 
-    assert mock_gen.call_count == 3
-    subjects_called = {c.kwargs["subject"] for c in mock_gen.call_args_list}
-    assert subjects_called == {"Math", "English", "Science"}
+    mock_gen.assert_called_once()
+    requests = mock_gen.call_args[0][0]
+    assert [r["subject"] for r in requests] == ["Math", "English", "Science"]
+    assert {(r["student_id"], r["grade_level"]) for r in requests} == {("s1", 2)}
     mock_notify.assert_called_once()
     assert "Alice" in mock_notify.call_args[0][0]
 
@@ -39,7 +40,7 @@ def test_notifies_failure_on_exception():
         patch("trio_generator.get_student_profile", return_value=_make_profile("Bob")),
         patch("trio_generator._get_grade_level", return_value=0),
         patch("trio_generator.pick_subjects", return_value=["Math", "English", "Science"]),
-        patch("trio_generator.generate_weekly_plan", side_effect=RuntimeError("openai down")),
+        patch("trio_generator.generate_weekly_plans", side_effect=RuntimeError("openai down")),
         patch("trio_generator.notify") as mock_notify,
     ):
         import pytest
@@ -54,6 +55,29 @@ def test_notifies_failure_on_exception():
     assert priority == "high"
 
 
+def test_logs_each_subject_and_raises_the_first_failure(caplog):
+    results = [{"ok": True}, RuntimeError("english failed"), {"ok": True}]
+    with (
+        patch("trio_generator.get_student_profile", return_value=_make_profile("Cy")),
+        patch("trio_generator._get_grade_level", return_value=1),
+        patch("trio_generator.pick_subjects", return_value=["Math", "English", "Science"]),
+        patch("trio_generator.generate_weekly_plans", return_value=results) as mock_gen,
+        patch("trio_generator.notify") as mock_notify,
+        caplog.at_level("INFO", logger="trio_generator"),
+    ):
+        import pytest
+
+        with pytest.raises(RuntimeError, match="english failed"):
+            trio_generator.generate_trio_for_student("s1")
+
+    assert mock_gen.call_args[1] == {"return_exceptions": True}
+    messages = [record.getMessage() for record in caplog.records]
+    assert "trio_generator: plan generated for s1 / Math" in messages
+    assert "trio_generator: plan failed for s1 / English: english failed" in messages
+    assert "trio_generator: plan generated for s1 / Science" in messages
+    assert "FAILED" in mock_notify.call_args[0][0]
+
+
 def test_get_grade_level_from_most_recent_packet():
     packets = [{"grade_level": 3}, {"grade_level": 1}]
     with patch("trio_generator.list_weekly_packets", return_value=(packets, False)):
@@ -0,0 +1,802 @@
+"""Tests for the async weekly plan pipeline in agent.py (OpenAI client is faked)."""
+
+import asyncio
+import json
+import sys
+import threading
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import src.agent as agent
+
+
+STANDARDS = [
+    {
+        "standard_id": f"MATH.2.{idx}",
+        "subject": "Math",
+        "grade_level": 2,
+        "description": f"Math skill {idx}",
+    }
+    for idx in range(1, 6)
+]
+
+
+def _completion(content: str):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        model_dump_json=lambda: json.dumps({"content": content}),
+    )
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.calls: list[dict] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, **payload):
+        self.calls.append(payload)
+        prompt = payload["messages"][-1]["content"]
+        if "weekly lesson plan scaffold" in prompt:
+            return _completion(
+                json.dumps(
+                    {
+                        "weekly_overview": "A week of math",
+                        "daily_assignments": [
+                            {"day": day, "standard_ids": [s["standard_id"]], "focus": f"{day}"}
+                            for day, s in zip(
+                                ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
+                                STANDARDS,
+                                strict=True,
+                            )
+                        ],
+                    }
+                )
+            )
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if "Day Focus: Wednesday" in prompt:
+            raise RuntimeError("upstream timeout")
+        return _completion(json.dumps({"lesson_plan": {"objective": "Learn", "procedure": []}}))
+
+
+class FakeAsyncOpenAI:
+    instances: list["FakeAsyncOpenAI"] = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.chat = SimpleNamespace(completions=FakeCompletions())
+        self.closed = False
+        FakeAsyncOpenAI.instances.append(self)
+
+    async def close(self):
+        if self.kwargs.get("http_client") is not None:
+            await self.kwargs["http_client"].aclose()
+        self.closed = True
+
+
+@pytest.fixture
+def fake_env(tmp_path, monkeypatch):
+    FakeAsyncOpenAI.instances = []
+    saved: list[dict] = []
+    profile = {
+        "student_id": "s1",
+        "progress_blob": json.dumps({"mastered_standards": []}),
+        "plan_rules_blob": json.dumps({"allowed_materials": ["Paper"]}),
+        "metadata_blob": None,
+    }
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(agent, "AsyncOpenAI", FakeAsyncOpenAI)
+    monkeypatch.setattr(agent, "get_student_profile", lambda _sid: profile)
+    monkeypatch.setattr(agent, "get_filtered_standards", lambda *_a, **_k: list(STANDARDS))
+    monkeypatch.setattr(agent, "save_weekly_packet", saved.append)
+    monkeypatch.setattr(agent, "GENERATE_WEEKLY_DIR", tmp_path / "logs")
+    plan_cache = sys.modules[agent.lesson_plan_cache_key.__module__]
+    monkeypatch.setattr(plan_cache, "DB_FILE", str(tmp_path / "cache.db"))
+    # A fresh limiter per test so earlier tests cannot drain the shared TPM budget.
+    rate_limiter = sys.modules[agent.create_chat_completion.__module__]
+    monkeypatch.setattr(
+        rate_limiter, "DEFAULT_RATE_LIMITER", rate_limiter.RateLimiter(6000, 10_000_000)
+    )
+    return saved
+
+
+def test_daily_calls_run_concurrently_and_fall_back_per_day(fake_env):
+    plan = agent.generate_weekly_plan("s1", 2, "Math")
+
+    completions = FakeAsyncOpenAI.instances[0].chat.completions
+    assert len(completions.calls) == 6  # scaffold + five days
+    assert completions.max_in_flight > 1
+
+    days = [day["day"] for day in plan["daily_plan"]]
+    assert days == ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+    wednesday = plan["daily_plan"][2]
+    assert wednesday["lesson_plan"]["objective"] == "Learn about: Math skill 3"
+    assert plan["daily_plan"][0]["lesson_plan"]["objective"] == "Learn"
+    assert fake_env == [plan]
+
+
+def test_standards_are_shared_by_id_across_days(fake_env):
+    plan = agent.generate_weekly_plan("s1", 2, "Math")
+
+    for day in plan["daily_plan"]:
+        assert "standard" not in day
+        assert day["standard_id"] == day["standard_ids"][0]
+        assert all(sid in plan["standards"] for sid in day["standard_ids"])
+    wednesday_id = plan["daily_plan"][2]["standard_id"]
+    assert plan["standards"][wednesday_id]["description"] == "Math skill 3"
+
+
+def test_cooldown_filter_only_checks_standards_with_metadata(fake_env, monkeypatch):
+    progress = {
+        "standard_metadata": {
+            "MATH.2.1": {"last_seen": "2999-01-01T00:00:00Z", "cooldown_weeks": 2},
+        }
+    }
+    profile = {
+        "student_id": "s1",
+        "progress_blob": json.dumps(progress),
+        "plan_rules_blob": json.dumps({"allowed_materials": ["Paper"]}),
+        "metadata_blob": None,
+    }
+    checked: list[dict] = []
+
+    def _spy_eligible(metadata, reference_date=None):
+        checked.append(metadata)
+        return False
+
+    monkeypatch.setattr(agent, "get_student_profile", lambda _sid: profile)
+    monkeypatch.setattr(agent, "is_standard_eligible", _spy_eligible)
+
+    agent.generate_weekly_plan("s1", 2, "Math")
+
+    assert checked == [progress["standard_metadata"]["MATH.2.1"]]
+    scaffold_prompt = FakeAsyncOpenAI.instances[0].chat.completions.calls[0]["messages"][-1]
+    assert '"MATH.2.1"' not in scaffold_prompt["content"]
+    assert '"MATH.2.2"' in scaffold_prompt["content"]
+
+
+def test_standards_without_ids_are_not_indexed():
+    standards = [{"description": "no id"}, STANDARDS[0]]
+    by_id = agent._standards_by_id(standards)
+
+    assert list(by_id) == ["MATH.2.1"]
+    # An assignment naming a null ID falls back to the first standard, not the ID-less one.
+    resolved = agent._resolve_day_standards({"standard_ids": [None]}, by_id, [STANDARDS[0]])
+    assert resolved == [STANDARDS[0]]
+
+
+def test_llm_exchange_logs_record_usage_only_by_default(fake_env, tmp_path):
+    agent.generate_weekly_plan("s1", 2, "Math")
+
+    (run_dir,) = (tmp_path / "logs").iterdir()
+    scaffold = json.loads((run_dir / "weekly_scaffold_llm_exchange.json").read_text())
+    assert scaffold["request"]["model"]
+    assert set(scaffold["response"]) == {
+        "model",
+        "finish_reason",
+        "prompt_tokens",
+        "cached_tokens",
+        "completion_tokens",
+    }
+
+
+def test_llm_exchange_logs_embed_the_raw_response(fake_env, tmp_path, monkeypatch):
+    monkeypatch.setattr(agent, "LOG_LLM_EXCHANGES", True)
+    agent.generate_weekly_plan("s1", 2, "Math")
+
+    (run_dir,) = (tmp_path / "logs").iterdir()
+    scaffold = json.loads((run_dir / "weekly_scaffold_llm_exchange.json").read_text())
+    events = [json.loads(line) for line in (run_dir / "daily_plans.jsonl").read_text().splitlines()]
+    (monday,) = [e for e in events if e["day"] == "Monday" and e["kind"] == "llm_exchange"]
+    assert scaffold["request"]["model"]
+    assert "weekly_overview" in scaffold["response"]["content"]
+    assert json.loads(monday["payload"]["response"]["content"])["lesson_plan"]
+    assert {e["kind"] for e in events if e["day"] == "Wednesday"} >= {"llm_exchange", "plan"}
+    assert not (run_dir / "daily_plans").exists()
+
+
+def test_logged_response_bodies_truncate_long_strings(monkeypatch):
+    monkeypatch.setattr(agent, "LOG_LLM_EXCHANGES", True)
+    monkeypatch.setattr(agent, "LOG_LLM_MAX_STRING", 20)
+
+    short = agent._loggable_response(_completion("tiny"))
+    assert short == json.dumps({"content": "tiny"})
+    logged = agent._loggable_response(_completion("x" * 25))
+    assert logged == {"content": "x" * 20 + "...[truncated, total=25]"}
+
+
+def test_log_writes_are_snapshotted_and_flushed_on_close(tmp_path, monkeypatch):
+    monkeypatch.setattr(agent, "GENERATE_WEEKLY_DIR", tmp_path)
+    logger = agent.GenerationLogger("s1", 2, "Math")
+    plan = {"day": "Monday", "focus": "Counting"}
+
+    logger.log_daily_plan("Monday", plan)
+    plan["focus"] = "changed after logging"
+    logger.close()
+
+    (line,) = logger.daily_log_path.read_text().splitlines()
+    assert json.loads(line)["payload"]["focus"] == "Counting"
+
+
+def test_cancelled_run_still_flushes_and_closes_its_log(fake_env, monkeypatch):
+    loggers: list[agent.GenerationLogger] = []
+
+    class RecordingLogger(agent.GenerationLogger):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            loggers.append(self)
+
+    monkeypatch.setattr(agent, "GenerationLogger", RecordingLogger)
+
+    async def disconnect_after_first_day():
+        events = agent.iter_weekly_plan_events("s1", 2, "Math")
+        first = await anext(events)
+        await events.aclose()  # What a dropped stream client does; cancels the run.
+        await asyncio.sleep(0.05)
+        await agent._close_async_client()
+        return first
+
+    assert asyncio.run(disconnect_after_first_day())["event"] == "day"
+
+    (run_log,) = loggers
+    agent._LOG_WRITER.submit(lambda: None).result()  # Drain the writer thread.
+    assert run_log._daily_log is None
+    lines = run_log.daily_log_path.read_text().splitlines()
+    assert any(json.loads(line)["kind"] == "llm_exchange" for line in lines)
+    assert not (run_log.base_dir / "weekly_plan.json").exists()
+
+
+def test_repeat_generation_replays_cached_lesson_plans(fake_env):
+    agent.generate_weekly_plan("s1", 2, "Math")
+    plan = agent.generate_weekly_plan("s1", 2, "Math")
+
+    # The scaffold and four days come from the cache; only the previously failed
+    # Wednesday (never cached) is retried, and it falls back again.
+    completions = FakeAsyncOpenAI.instances[1].chat.completions
+    assert len(completions.calls) == 1
+    assert "Day Focus: Wednesday" in completions.calls[0]["messages"][-1]["content"]
+    assert plan["weekly_overview"] == "A week of math"
+    assert plan["daily_plan"][0]["lesson_plan"]["objective"] == "Learn"
+
+
+def test_cached_lesson_plans_are_keyed_by_day_focus(fake_env, monkeypatch):
+    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+    async def shared_standard_create(self, **payload):
+        self.calls.append(payload)
+        prompt = payload["messages"][-1]["content"]
+        if "weekly lesson plan scaffold" in prompt:
+            assignments = [
+                {"day": day, "standard_ids": ["MATH.2.1"], "focus": f"focus {day}"} for day in days
+            ]
+            return _completion(
+                json.dumps({"weekly_overview": "One skill", "daily_assignments": assignments})
+            )
+        focus = prompt.rsplit("Day Focus: ", 1)[-1]
+        return _completion(json.dumps({"lesson_plan": {"objective": f"obj for {focus}"}}))
+
+    monkeypatch.setattr(FakeCompletions, "create", shared_standard_create)
+    agent.generate_weekly_plan("s1", 2, "Math")
+    plan = agent.generate_weekly_plan("s1", 2, "Math")
+
+    assert FakeAsyncOpenAI.instances[1].chat.completions.calls == []
+    assert [day["lesson_plan"]["objective"] for day in plan["daily_plan"]] == [
+        f"obj for focus {day}" for day in days
+    ]
+
+
+def _daily_responses(run_dir) -> dict[str, dict]:
+    lines = (run_dir / "daily_plans.jsonl").read_text().splitlines()
+    return {e["day"]: e for e in map(json.loads, lines) if e["kind"] == "response"}
+
+
+def test_daily_response_logs_record_their_source(fake_env, tmp_path):
+    agent.generate_weekly_plan("s1", 2, "Math")
+    agent.generate_weekly_plan("s1", 2, "Math")
+
+    first_run, second_run = sorted((tmp_path / "logs").iterdir())
+    assert _daily_responses(first_run)["Monday"]["source"] == "llm"
+    cached = _daily_responses(second_run)["Monday"]
+    assert cached["source"] == "cache"
+    assert len(cached["source_ref"]) == 64
+    assert cached["payload"]["lesson_plan"]["objective"] == "Learn"
+
+
+def test_lesson_plan_cache_can_be_disabled(fake_env, monkeypatch):
+    monkeypatch.setattr(agent, "LESSON_PLAN_CACHE", False)
+    agent.generate_weekly_plan("s1", 2, "Math")
+    agent.generate_weekly_plan("s1", 2, "Math")
+
+    assert len(FakeAsyncOpenAI.instances[1].chat.completions.calls) == 6
+
+
+def test_templated_standards_skip_the_llm(fake_env, monkeypatch, tmp_path):
+    lesson_templates = sys.modules[agent.render_template_lesson.__module__]
+    monkeypatch.setattr(lesson_templates, "TEMPLATES", {})
+    lesson_templates.register_template("MATH.2.1")(
+        lambda standard, _rules: {"objective": f"Template: {standard['description']}"}
+    )
+
+    plan = agent.generate_weekly_plan("s1", 2, "Math")
+
+    assert len(FakeAsyncOpenAI.instances[0].chat.completions.calls) == 5  # scaffold + 4 days
+    assert plan["daily_plan"][0]["lesson_plan"]["objective"] == "Template: Math skill 1"
+    (run_dir,) = (tmp_path / "logs").iterdir()
+    monday = _daily_responses(run_dir)["Monday"]
+    assert (monday["source"], monday["source_ref"]) == ("template", "MATH.2.1")
+
+
+def test_short_scaffold_is_padded_to_five_days(fake_env, monkeypatch):
+    original_create = FakeCompletions.create
+
+    async def two_day_scaffold(self, **payload):
+        if "weekly lesson plan scaffold" in payload["messages"][-1]["content"]:
+            self.calls.append(payload)
+            assignments = [
+                {"day": day, "standard_ids": ["MATH.2.1"], "focus": day}
+                for day in ["Monday", "Tuesday"]
+            ]
+            return _completion(json.dumps({"daily_assignments": assignments}))
+        return await original_create(self, **payload)
+
+    monkeypatch.setattr(FakeCompletions, "create", two_day_scaffold)
+    plan = agent.generate_weekly_plan("s1", 2, "Math")
+
+    padded = plan["daily_plan"][2:]
+    assert [day["day"] for day in padded] == ["Wednesday", "Thursday", "Friday"]
+    assert [day["standard_id"] for day in padded] == ["MATH.2.3", "MATH.2.4", "MATH.2.5"]
+    assert {day["focus"] for day in padded} == {"Additional practice"}
+
+
+def test_stuck_day_times_out_to_its_fallback(fake_env, monkeypatch, tmp_path):
+    monkeypatch.setattr(agent, "DAILY_PLAN_TIMEOUT_S", 0.2)
+    original_create = FakeCompletions.create
+
+    async def stuck_thursday(self, **payload):
+        if "Day Focus: Thursday" in payload["messages"][-1]["content"]:
+            await asyncio.sleep(5)
+        return await original_create(self, **payload)
+
+    monkeypatch.setattr(FakeCompletions, "create", stuck_thursday)
+    plan = agent.generate_weekly_plan("s1", 2, "Math")
+
+    assert plan["daily_plan"][3]["lesson_plan"]["objective"] == "Learn about: Math skill 4"
+    assert plan["daily_plan"][4]["lesson_plan"]["objective"] == "Learn"
+    (run_dir,) = (tmp_path / "logs").iterdir()
+    events = [json.loads(line) for line in (run_dir / "daily_plans.jsonl").read_text().splitlines()]
+    errors = [e["payload"]["error"] for e in events if e["kind"] == "error"]
+    assert "timed out after 0.2s" in errors
+
+
+def test_speculative_fallback_day_is_reused_when_scaffold_fails(fake_env, monkeypatch):
+    monkeypatch.setattr(agent, "SPECULATIVE_SCAFFOLD_FALLBACK", True)
+    original_create = FakeCompletions.create
+
+    async def broken_scaffold(self, **payload):
+        if "weekly lesson plan scaffold" in payload["messages"][-1]["content"]:
+            self.calls.append(payload)
+            return _completion("not json")
+        return await original_create(self, **payload)
+
+    monkeypatch.setattr(FakeCompletions, "create", broken_scaffold)
+    plan = agent.generate_weekly_plan("s1", 2, "Math")
+
+    calls = FakeAsyncOpenAI.instances[0].chat.completions.calls
+    prompts = [call["messages"][-1]["content"] for call in calls]
+    assert len(calls) == 6  # scaffold + five days; Monday was not requested twice
+    assert sum("Day Focus: Day 1 focus" in prompt for prompt in prompts) == 1
+    assert plan["daily_plan"][0]["lesson_plan"]["objective"] == "Learn"
+
+
+def test_speculative_fallback_day_is_dropped_when_scaffold_succeeds(fake_env, monkeypatch):
+    monkeypatch.setattr(agent, "SPECULATIVE_SCAFFOLD_FALLBACK", True)
+    plan = agent.generate_weekly_plan("s1", 2, "Math")
+
+    assert [day["focus"] for day in plan["daily_plan"]][0] == "Monday"
+    assert len(plan["daily_plan"]) == 5
+
+
+def test_async_entrypoint_can_be_awaited(fake_env):
+    plan = asyncio.run(agent.generate_weekly_plan_async("s1", 2, "Math"))
+    assert plan["plan_id"].startswith("plan_s1_")
+    assert len(plan["daily_plan"]) == 5
+
+
+class FakeBatchedCompletions(FakeCompletions):
+    async def create(self, **payload):
+        prompt = payload["messages"][-1]["content"]
+        if "weekly lesson plan scaffold" in prompt:
+            return await super().create(**payload)
+        self.calls.append(payload)
+        if payload["response_format"]["type"] == "json_schema":
+            # A constrained decoder can only return the schema's shape.
+            return _completion(json.dumps({"daily_assignments": [], "weekly_overview": ""}))
+        plans = [
+            {"day": day, "lesson_plan": {"objective": f"Batched {day}", "procedure": []}}
+            for day in ["Monday", "Tuesday", "Thursday", "Friday"]
+        ]
+        return _completion(json.dumps({"plans": plans}))
+
+
+class FakeBatchAPIClient(FakeAsyncOpenAI):
+    """Adds the files/batches endpoints; Tuesday is missing from the job's output."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.uploaded: list[dict] = []
+        self.polls = 0
+        self.files = SimpleNamespace(create=self._upload, content=self._content)
+        self.batches = SimpleNamespace(create=self._create, retrieve=self._retrieve)
+
+    async def _upload(self, file, purpose):
+        assert purpose == "batch"
+        self.uploaded = [json.loads(line) for line in file[1].decode().splitlines()]
+        return SimpleNamespace(id="file-in")
+
+    async def _create(self, **_kwargs):
+        return SimpleNamespace(id="batch-1", status="in_progress", output_file_id=None)
+
+    async def _retrieve(self, batch_id):
+        self.polls += 1
+        return SimpleNamespace(id=batch_id, status="completed", output_file_id="file-out")
+
+    async def _content(self, file_id):
+        lines = []
+        for request in self.uploaded:
+            if request["custom_id"] == "day_1":
+                continue
+            lesson = {"lesson_plan": {"objective": f"Batched {request['custom_id']}"}}
+            body = {
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-test",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": json.dumps(lesson)},
+                    }
+                ],
+            }
+            record = {
+                "custom_id": request["custom_id"],
+                "response": {"status_code": 200, "body": body},
+            }
+            lines.append(json.dumps(record))
+        return SimpleNamespace(text="\n".join(lines))
+
+
+def test_openai_batch_serves_days_and_missing_days_call_directly(fake_env, monkeypatch):
+    monkeypatch.setattr(agent, "AsyncOpenAI", FakeBatchAPIClient)
+    monkeypatch.setattr(agent, "USE_OPENAI_BATCH", True)
+    monkeypatch.setattr(agent, "OPENAI_BATCH_POLL_INITIAL_S", 0.0)
+
+    plan = agent.generate_weekly_plan("s1", 2, "Math")
+
+    client = FakeAsyncOpenAI.instances[0]
+    assert client.polls == 1
+    assert [r["custom_id"] for r in client.uploaded] == [f"day_{i}" for i in range(5)]
+    assert len(client.chat.completions.calls) == 2  # scaffold + Tuesday, sent directly
+    objectives = [day["lesson_plan"]["objective"] for day in plan["daily_plan"]]
+    assert objectives[0] == "Batched day_0"
+    assert objectives[1] == "Learn"
+    assert objectives[2] == "Batched day_2"
+
+
+def test_openai_batch_skips_unreadable_output_lines(fake_env, monkeypatch):
+    class MalformedOutputClient(FakeBatchAPIClient):
+        async def _content(self, file_id):
+            output = await super()._content(file_id)
+            lines = [
+                line.replace('"choices"', '"error"') if '"day_3"' in line else line
+                for line in output.text.splitlines()
+            ]
+            lines += ['{"custom_id": "day_9", "response"', '["not", "a", "record"]']
+            return SimpleNamespace(text="\n".join(lines))
+
+    monkeypatch.setattr(agent, "AsyncOpenAI", MalformedOutputClient)
+    monkeypatch.setattr(agent, "USE_OPENAI_BATCH", True)
+    monkeypatch.setattr(agent, "OPENAI_BATCH_POLL_INITIAL_S", 0.0)
+
+    plan = agent.generate_weekly_plan("s1", 2, "Math")
+
+    client = FakeAsyncOpenAI.instances[0]
+    assert len(client.chat.completions.calls) == 3  # scaffold + Tuesday + Thursday
+    objectives = [day["lesson_plan"]["objective"] for day in plan["daily_plan"]]
+    assert objectives[0] == "Batched day_0"
+    assert objectives[3] == "Learn"
+    assert objectives[4] == "Batched day_4"
+
+
+def test_async_client_is_reused_within_an_event_loop(fake_env):
+    async def _two_plans():
+        await agent.generate_weekly_plan_async("s1", 2, "Math")
+        await agent.generate_weekly_plan_async("s1", 2, "Math")
+
+    asyncio.run(_two_plans())
+    assert len(FakeAsyncOpenAI.instances) == 1
+    assert isinstance(FakeAsyncOpenAI.instances[0].kwargs["http_client"], httpx.AsyncClient)
+
+
+def test_blocking_calls_run_on_the_persistent_pool(fake_env, monkeypatch):
+    threads: list[str] = []
+    profile = agent.get_student_profile("s1")
+
+    def _profile(_sid):
+        threads.append(threading.current_thread().name)
+        return profile
+
+    monkeypatch.setattr(agent, "get_student_profile", _profile)
+    agent.generate_weekly_plan("s1", 2, "Math")
+    agent.generate_weekly_plan("s1", 2, "Math")
+
+    assert all(name.startswith("daily-plan") for name in threads)
+    assert len(threads) == 2
+
+
+def test_sync_wrapper_closes_its_client(fake_env):
+    agent.generate_weekly_plan("s1", 2, "Math")
+    assert FakeAsyncOpenAI.instances[0].closed
+
+
+def test_several_plans_share_one_client(fake_env):
+    plans = agent.generate_weekly_plans(
+        [
+            {"student_id": "s1", "grade_level": 2, "subject": "Math"},
+            {"student_id": "s1", "grade_level": 2, "subject": "Math"},
+        ]
+    )
+
+    assert len(plans) == 2
+    assert len(FakeAsyncOpenAI.instances) == 1
+    assert FakeAsyncOpenAI.instances[0].closed
+
+
+def test_one_failed_plan_does_not_cancel_its_siblings(fake_env, monkeypatch):
+    requests = [
+        {"student_id": "s1", "grade_level": 3, "subject": "Math"},
+        {"student_id": "s1", "grade_level": 2, "subject": "Math"},
+    ]
+    monkeypatch.setattr(
+        agent,
+        "get_filtered_standards",
+        lambda _sid, grade, *_a, **_k: list(STANDARDS) if grade == 2 else [],
+    )
+
+    results = agent.generate_weekly_plans(requests, return_exceptions=True)
+
+    assert isinstance(results[0], ValueError)
+    assert results[1]["grade_level"] == 2
+    assert [plan["grade_level"] for plan in fake_env] == [2]  # The sibling was saved.
+    with pytest.raises(ValueError):
+        agent.generate_weekly_plans(requests)
+    assert len(fake_env) == 2
+
+
+def test_plan_events_stream_each_day_before_the_full_plan(fake_env):
+    async def _collect():
+        return [event async for event in agent.iter_weekly_plan_events("s1", 2, "Math")]
+
+    events = asyncio.run(_collect())
+
+    assert [event["event"] for event in events] == ["day"] * 5 + ["plan"]
+    assert {event["day"] for event in events[:5]} == {
+        "Monday",
+        "Tuesday",
+        "Wednesday",
+        "Thursday",
+        "Friday",
+    }
+    assert events[-1]["plan"]["daily_plan"][0]["day"] == "Monday"
+
+
+def test_batched_mode_issues_single_daily_request(fake_env, monkeypatch):
+    class BatchedClient(FakeAsyncOpenAI):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.chat = SimpleNamespace(completions=FakeBatchedCompletions())
+
+    monkeypatch.setattr(agent, "AsyncOpenAI", BatchedClient)
+    monkeypatch.setattr(agent, "BATCH_DAILY_PLANS", True)
+
+    plan = agent.generate_weekly_plan("s1", 2, "Math")
+
+    completions = FakeAsyncOpenAI.instances[0].chat.completions
+    assert len(completions.calls) == 2  # scaffold + one batched request
+    objectives = [day["lesson_plan"]["objective"] for day in plan["daily_plan"]]
+    assert objectives[0] == "Batched Monday"
+    # Wednesday was missing from the response, so it falls back deterministically.
+    assert objectives[2] == "Learn about: Math skill 3"
+
+
+def test_week_of_is_the_utc_monday_of_the_current_week(monkeypatch):
+    # 2026-10-15 23:30 UTC is a Thursday.
+    monkeypatch.setattr(agent.time, "time", lambda: 1792107000.0)
+    assert agent._current_week_of() == "2026-10-12"
+    assert agent._current_week_of(agent.datetime(2026, 10, 19, tzinfo=agent.UTC)) == "2026-10-19"
+
+
+def test_scaffold_call_is_skipped_for_five_standards_with_neutral_feedback(fake_env, monkeypatch):
+    monkeypatch.setattr(agent, "SKIP_SCAFFOLD_LLM", True)
+
+    plan = agent.generate_weekly_plan("s1", 2, "Math")
+
+    calls = FakeAsyncOpenAI.instances[0].chat.completions.calls
+    assert len(calls) == 5
+    assert not any("weekly lesson plan scaffold" in c["messages"][-1]["content"] for c in calls)
+    assert [day["standard_id"] for day in plan["daily_plan"]] == [
+        s["standard_id"] for s in STANDARDS
+    ]
+    assert "MATH.2.5" in plan["weekly_overview"]
+
+
+def test_scaffold_prompt_opens_with_the_static_instructions(fake_env):
+    agent.generate_weekly_plan("s1", 2, "Math")
+
+    scaffold = FakeAsyncOpenAI.instances[0].chat.completions.calls[0]["messages"][-1]["content"]
+    assert scaffold.startswith(agent.SCAFFOLD_INSTRUCTIONS)
+    assert "MATH.2.1" not in agent.SCAFFOLD_INSTRUCTIONS
+    assert scaffold.endswith("Activity guidance: Each day should have approximately 3 activities.")
+
+
+def test_structured_scaffold_output_sends_the_json_schema(fake_env, monkeypatch):
+    monkeypatch.setattr(agent, "STRUCTURED_SCAFFOLD_OUTPUT", True)
+
+    plan = agent.generate_weekly_plan("s1", 2, "Math")
+
+    calls = FakeAsyncOpenAI.instances[0].chat.completions.calls
+    response_format = calls[0]["response_format"]
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["strict"] is True
+    schema = response_format["json_schema"]["schema"]
+    assert list(schema["properties"]) == ["daily_assignments", "weekly_overview"]
+    assert all(c["response_format"] == {"type": "json_object"} for c in calls[1:])
+    assert plan["weekly_overview"] == "A week of math"
+
+
+def test_scaffold_stream_parser_yields_each_finished_assignment():
+    parser = agent._ScaffoldStreamParser()
+    text = (
+        '{"daily_assignments": [{"day": "Monday", "standard_ids": ["A"], "focus": "a } \\" ["}'
+        ', {"day": "Tuesday", "standard_ids": ["B"], "focus": "b"}], "weekly_overview": "w"}'
+    )
+
+    found = [parser.feed(text[i : i + 7]) for i in range(0, len(text), 7)]
+
+    days = [item["day"] for batch in found for item in batch]
+    assert days == ["Monday", "Tuesday"]
+    assert parser.text == text
+    assert json.loads(parser.text)["daily_assignments"][0]["focus"] == 'a } " ['
+
+
+class FakeStreamingCompletions(FakeCompletions):
+    def __init__(self):
+        super().__init__()
+        self.scaffold_open = False
+        self.days_issued_while_streaming: list[str] = []
+
+    async def create(self, **payload):
+        if not payload.get("stream"):
+            if self.scaffold_open:
+                self.days_issued_while_streaming.append(payload["messages"][-1]["content"])
+            return await super().create(**payload)
+        self.calls.append(payload)
+        content = json.dumps(
+            {
+                "daily_assignments": [
+                    {"day": day, "standard_ids": [s["standard_id"]], "focus": day}
+                    for day, s in zip(
+                        ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
+                        STANDARDS,
+                        strict=True,
+                    )
+                ],
+                "weekly_overview": "A streamed week",
+            }
+        )
+
+        async def _chunks():
+            self.scaffold_open = True
+            for start in range(0, len(content), 40):
+                delta = SimpleNamespace(content=content[start : start + 40])
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+                await asyncio.sleep(0.005)
+            self.scaffold_open = False
+            yield SimpleNamespace(choices=[], model="gpt-test", usage=None)
+
+        return _chunks()
+
+
+def test_streamed_scaffold_starts_days_before_it_finishes(fake_env, monkeypatch):
+    class StreamingClient(FakeAsyncOpenAI):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.chat = SimpleNamespace(completions=FakeStreamingCompletions())
+
+    monkeypatch.setattr(agent, "AsyncOpenAI", StreamingClient)
+    monkeypatch.setattr(agent, "STREAM_SCAFFOLD", True)
+
+    plan = agent.generate_weekly_plan("s1", 2, "Math")
+
+    completions = FakeAsyncOpenAI.instances[0].chat.completions
+    assert len(completions.calls) == 6  # No day was requested twice.
+    assert any("Day Focus: Monday" in p for p in completions.days_issued_while_streaming)
+    assert plan["weekly_overview"] == "A streamed week"
+    objectives = [day["lesson_plan"]["objective"] for day in plan["daily_plan"]]
+    assert objectives[0] == "Learn"
+    assert objectives[2] == "Learn about: Math skill 3"
+
+
+class FakeFullWeekCompletions(FakeCompletions):
+    async def create(self, **payload):
+        prompt = payload["messages"][-1]["content"]
+        if not prompt.startswith(agent.FULL_WEEK_INSTRUCTIONS):
+            return await super().create(**payload)
+        self.calls.append(payload)
+        plans = [
+            {
+                "day": day,
+                "standard_ids": [s["standard_id"]],
+                "focus": f"{day} focus",
+                "lesson_plan": {"objective": f"Whole-week {day}", "procedure": []},
+            }
+            for day, s in zip(
+                ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"], STANDARDS, strict=True
+            )
+        ]
+        return _completion(json.dumps({"plans": plans, "weekly_overview": "One-call week"}))
+
+
+def test_single_call_week_replaces_scaffold_and_daily_calls(fake_env, monkeypatch):
+    class FullWeekClient(FakeAsyncOpenAI):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.chat = SimpleNamespace(completions=FakeFullWeekCompletions())
+
+    monkeypatch.setattr(agent, "AsyncOpenAI", FullWeekClient)
+    monkeypatch.setattr(agent, "SINGLE_CALL_WEEK", True)
+
+    plan = agent.generate_weekly_plan("s1", 2, "Math")
+
+    assert len(FakeAsyncOpenAI.instances[0].chat.completions.calls) == 1
+    assert plan["weekly_overview"] == "One-call week"
+    assert [day["lesson_plan"]["objective"] for day in plan["daily_plan"]][
+        2
+    ] == "Whole-week Wednesday"
+    assert plan["daily_plan"][2]["focus"] == "Wednesday focus"
+    assert plan["daily_plan"][4]["standard_id"] == "MATH.2.5"
+
+
+def test_single_call_week_ignores_the_structured_scaffold_schema(fake_env, monkeypatch):
+    class FullWeekClient(FakeAsyncOpenAI):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.chat = SimpleNamespace(completions=FakeFullWeekCompletions())
+
+    monkeypatch.setattr(agent, "AsyncOpenAI", FullWeekClient)
+    monkeypatch.setattr(agent, "SINGLE_CALL_WEEK", True)
+    monkeypatch.setattr(agent, "STRUCTURED_SCAFFOLD_OUTPUT", True)
+
+    plan = agent.generate_weekly_plan("s1", 2, "Math")
+
+    calls = FakeAsyncOpenAI.instances[0].chat.completions.calls
+    assert len(calls) == 1
+    assert calls[0]["response_format"] == {"type": "json_object"}
+    assert plan["weekly_overview"] == "One-call week"
+
+
+def test_single_call_week_falls_back_to_the_scaffold(fake_env, monkeypatch):
+    monkeypatch.setattr(agent, "SINGLE_CALL_WEEK", True)
+
+    plan = agent.generate_weekly_plan("s1", 2, "Math")
+
+    # The one-call response had no "plans", so the scaffold and five days followed.
+    assert len(FakeAsyncOpenAI.instances[0].chat.completions.calls) == 7
+    assert plan["weekly_overview"] == "A week of math"
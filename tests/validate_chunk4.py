@@ -63,7 +63,7 @@ try:
                 day_one = daily_plan[0]
                 check(day_one.get("day") == "Monday", "First day is not 'Monday'.")
                 check("lesson_plan" in day_one, "Daily plan item is missing 'lesson_plan'.")
-                check("standard" in day_one, "Daily plan item is missing 'standard'.")
+                check("standard_id" in day_one, "Daily plan item is missing 'standard_id'.")
 
                 # Test 4: Validate lesson_plan sub-structure
                 lesson_plan = day_one.get("lesson_plan", {})